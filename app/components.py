@@ -1,51 +1,145 @@
+import hashlib
+import json
 import streamlit as st
-import streamlit.components.v1 as components
 from typing import Dict, List
-from . import state  # Importa callbacks
+from core.index import nome_item
+from core.search import normalizar
+from . import state, profiler  # Importa callbacks
 
-def custom_copy_button(text_to_copy: str):
-    """Botão de cópia customizado usando HTML/JS."""
-    button_style = """
-    <style>
-        body { margin: 0 !important; padding: 0 !important; overflow: hidden; }
-        .custom-btn {
-            border: 1px solid #3a3f4b; background-color: #F0F2F6; color: #3a3f4b;
-            border-radius: 6px; cursor: pointer; width: 100%; height: 38px;
-            font-family: "Source Sans Pro", sans-serif; font-weight: 500; font-size: 1rem;
-            display: flex; align-items: center; justify-content: center; box-sizing: border-box; transition: 0.2s;
-        }
-        .custom-btn:hover { border-color: #46c45e; color: #46c45e; background-color: #ffffff; }
-    </style>
-    """
-    
-    clean_text = text_to_copy.replace('`', '\\`').replace('$', '\\$')
-    copy_script = f"""
-    <script>
-        function copyToClipboard() {{
-            const text = `{clean_text}`;
+# Linhas por página nas grades de catálogo: limita os botões por rerun a colunas × linhas
+GRADE_LINHAS = 8
+
+# Área de transferência compartilhada: cada texto vai ao navegador uma única vez
+# por sessão, guardado no sessionStorage da página pelo hash do conteúdo; os
+# botões de cópia carregam só o hash e buscam o texto lá.
+CLIPBOARD_PREFIXO = "suno_clip_"
+
+CLIPBOARD_STYLE = """
+<style>
+    body { margin: 0 !important; padding: 0 !important; overflow: hidden; }
+    .custom-btn {
+        border: 1px solid #3a3f4b; background-color: #F0F2F6; color: #3a3f4b;
+        border-radius: 6px; cursor: pointer; width: 100%; height: 38px;
+        font-family: "Source Sans Pro", sans-serif; font-weight: 500; font-size: 1rem;
+        display: flex; align-items: center; justify-content: center; box-sizing: border-box; transition: 0.2s;
+    }
+    .custom-btn:hover { border-color: #46c45e; color: #46c45e; background-color: #ffffff; }
+</style>
+"""
+
+# Igual para todos os botões (só o hash muda): o navegador reaproveita o iframe entre reruns
+CLIPBOARD_SCRIPT = """
+<script>
+    function lerTexto(hash, tentativas, pronto) {
+        const texto = window.parent.sessionStorage.getItem("%(prefixo)s" + hash);
+        if (texto !== null || tentativas <= 0) { pronto(texto); return; }
+        // O script que registra o texto pode ainda não ter rodado na página
+        setTimeout(() => lerTexto(hash, tentativas - 1, pronto), 100);
+    }
+    function feedback(btn, rotulo, cor) {
+        btn.innerText = rotulo; btn.style.borderColor = cor; btn.style.color = cor;
+        setTimeout(() => {
+            btn.innerText = "📋 Copiar";
+            btn.style.borderColor = "#3a3f4b"; btn.style.color = "#3a3f4b";
+        }, 2000);
+    }
+    function copyToClipboard(btn) {
+        lerTexto(btn.dataset.hash, 20, (text) => {
+            if (text === null) { feedback(btn, "⚠️ Indisponível", "#d9534f"); return; }
             const textArea = document.createElement("textarea");
             textArea.value = text;
             document.body.appendChild(textArea);
             textArea.select();
-            try {{
+            try {
                 document.execCommand('copy');
-                const btn = document.getElementById("copyBtn");
-                btn.innerText = "✅ Copiado!";
-                btn.style.borderColor = "#46c45e"; btn.style.color = "#46c45e";
-                setTimeout(() => {{ 
-                    btn.innerText = "📋 Copiar"; 
-                    btn.style.borderColor = "#3a3f4b"; btn.style.color = "#3a3f4b";
-                }}, 2000);
-            }} catch (err) {{ console.error('Falha ao copiar', err); }}
+                feedback(btn, "✅ Copiado!", "#46c45e");
+            } catch (err) { console.error('Falha ao copiar', err); }
             document.body.removeChild(textArea);
-        }}
-    </script>
+        });
+    }
+</script>
+""" % {"prefixo": CLIPBOARD_PREFIXO}
+
+def registrar_texto_clipboard(texto: str) -> str:
+    """
+    Garante que `texto` esteja no sessionStorage do navegador e retorna o hash.
+    Só o primeiro registro de cada conteúdo na sessão envia o texto (script
+    executado na própria página); os seguintes não enviam nada.
+    """
+    hash_texto = hashlib.sha256(texto.encode("utf-8")).hexdigest()[:20]
+    enviados = st.session_state.setdefault("_clipboard_enviados", set())
+    if hash_texto not in enviados:
+        # "</" escapado para o JSON não fechar a tag <script>
+        payload = json.dumps(texto, ensure_ascii=False).replace("</", "<\\/")
+        st.html(f"<script>window.sessionStorage.setItem('{CLIPBOARD_PREFIXO}{hash_texto}', {payload});</script>",
+                unsafe_allow_javascript=True)
+        enviados.add(hash_texto)
+    return hash_texto
+
+def gravar_cookie(nome: str, valor: str, max_idade: int):
+    """Grava um cookie na página do app (script executado nela); o servidor o lê em st.context.cookies."""
+    st.html(f"<script>document.cookie = '{nome}={valor}; path=/; max-age={max_idade}; SameSite=Strict'"
+            f" + (location.protocol === 'https:' ? '; Secure' : '');</script>", unsafe_allow_javascript=True)
+
+def custom_copy_button(text_to_copy: str):
+    """Botão de cópia customizado usando HTML/JS; o texto é buscado pelo hash (registrar_texto_clipboard)."""
+    hash_texto = registrar_texto_clipboard(text_to_copy)
+    html_content = (f"{CLIPBOARD_STYLE}{CLIPBOARD_SCRIPT}<button class='custom-btn' data-hash='{hash_texto}' "
+                    f"onclick='copyToClipboard(this)'>📋 Copiar</button>")
+    st.iframe(html_content, height=40)
+
+def catalog_grid(chave: str, itens: list, on_click, args: tuple = (), colunas: int = 3, linhas: int = GRADE_LINHAS):
+    """
+    Grade paginada de botões sobre `itens` ([nome, descrição] ou nome).
+    Renderiza no máximo `colunas * linhas` botões, mais o filtro e a
+    paginação, qualquer que seja o tamanho do catálogo. Todos os botões
+    usam o mesmo callback: `on_click(*args, nome)`.
+    As chaves dos botões são `{chave}_{posição na página}`.
     """
-    html_content = f"{button_style}{copy_script}<button id='copyBtn' class='custom-btn' onclick='copyToClipboard()'>📋 Copiar</button>"
-    components.html(html_content, height=40)
+    por_pagina = colunas * linhas
+    filtro_key, pagina_key = f"{chave}_filtro", f"{chave}_pagina"
+
+    if len(itens) > por_pagina or st.session_state.get(filtro_key):
+        st.text_input(f"Filtrar {chave}", key=filtro_key, placeholder="🔍 Filtrar...", label_visibility="collapsed",
+                      on_change=state.resetar_pagina_grade, args=(chave,))
+        termo = normalizar(st.session_state.get(filtro_key, "")).strip()
+        if termo:
+            itens = [i for i in itens if termo in normalizar(nome_item(i))]
+
+    total_paginas = max(1, -(-len(itens) // por_pagina))
+    pagina = min(max(st.session_state.get(pagina_key, 0), 0), total_paginas - 1)
+    st.session_state[pagina_key] = pagina
+
+    if not itens:
+        st.caption("Nenhum item encontrado.")
+        return
+
+    cols = st.columns(colunas)
+    inicio = pagina * por_pagina
+    for idx, item in enumerate(itens[inicio:inicio + por_pagina]):
+        nome = nome_item(item)
+        desc = item[1] if isinstance(item, (list, tuple)) and len(item) > 1 else None
+        with cols[idx % colunas]:
+            st.button(nome, key=f"{chave}_{idx}", help=desc or None,
+                      on_click=on_click, args=(*args, nome), use_container_width=True)
 
-def hierarchical_field(title: str, key: str, data: Dict[str, List[str]], help_msg: str = None):
-    """Componente reutilizável para campos hierárquicos (Categoria -> Seleção)."""
+    if total_paginas > 1:
+        p1, p2, p3 = st.columns([0.2, 0.6, 0.2], vertical_alignment="center")
+        with p1:
+            st.button("◀", key=f"{chave}_ant", use_container_width=True, disabled=pagina == 0,
+                      on_click=state.mudar_pagina_grade, args=(chave, -1))
+        with p2:
+            st.caption(f"Página {pagina + 1} de {total_paginas} · {len(itens)} itens")
+        with p3:
+            st.button("▶", key=f"{chave}_prox", use_container_width=True, disabled=pagina >= total_paginas - 1,
+                      on_click=state.mudar_pagina_grade, args=(chave, 1))
+
+@profiler.secao
+def hierarchical_field(title: str, key: str, data: Dict[str, List[str]], help_msg: str = None, categorias: List[str] = None):
+    """
+    Componente reutilizável para campos hierárquicos (Categoria -> Seleção).
+    `categorias` recebe a lista já ordenada do core.indice para evitar reordenar a cada rerun.
+    """
     
     if help_msg:
         st.markdown(f"**{title}**", help=help_msg)
@@ -58,7 +152,7 @@ def hierarchical_field(title: str, key: str, data: Dict[str, List[str]], help_ms
     c1, c2, c3, c4 = st.columns([0.3, 0.3, 0.10, 0.10], gap="small", vertical_alignment="bottom")
     
     with c1:
-        opts_cat = [""] + sorted(data.keys())
+        opts_cat = [""] + (categorias if categorias is not None else sorted(data.keys()))
         curr_cat = st.session_state.get(cat_key, "")
         idx_cat = opts_cat.index(curr_cat) if curr_cat in opts_cat else 0
         st.selectbox(f"C_{key}", opts_cat, index=idx_cat, key=cat_key, label_visibility="collapsed")
@@ -85,9 +179,13 @@ def hierarchical_field(title: str, key: str, data: Dict[str, List[str]], help_ms
 
     st.markdown("<div style='margin-bottom: 10px;'></div>", unsafe_allow_html=True)
 
-def render_tag_system(title: str, key: str, data: dict, descritivos: dict, help_msg: str = None):
+@st.fragment
+@profiler.secao
+def render_tag_system(title: str, key: str, data: dict, descritivos: dict, itens_categoria: dict,
+                      help_msg: str = None):
     """
     Sistema de Tags com Seletor de Categoria e Descritivos Dinâmicos.
+    `itens_categoria` é o mapa {categoria: frozenset de nomes} de core.indice.itens_categoria.
     """
     st.markdown(f"**{title}**", help=help_msg)
     
@@ -102,17 +200,22 @@ def render_tag_system(title: str, key: str, data: dict, descritivos: dict, help_
                   on_click=state.randomize_tags_callback, args=(key, data))
     with sc4:
         st.button("🧹", key=f"btn_clr_{key}", use_container_width=True, 
-                  on_click=lambda: st.session_state.update({key: ""}))
+                  on_click=state.limpar_campos, args=(key,))
 
     # 2. Catálogo com Seletor de Categoria Interno
+    # (expander preguiçoso: fechado, o conteúdo não é renderizado)
     if data:
-        with st.expander("🏷️ Catálogo", expanded=False):
+        catalogo = st.expander("🏷️ Catálogo", key=f"exp_cat_{key}", on_change="rerun")
+        with catalogo:
+            if not catalogo.open:
+                return
             categorias = list(data.keys())
             
             col_sel, col_info = st.columns([0.45, 0.55], vertical_alignment="center")
             with col_sel:
                 cat_selecionada = st.selectbox(
-                    f"Categoria {title}", categorias, key=f"sel_cat_{key}", label_visibility="collapsed"
+                    f"Categoria {title}", categorias, key=f"sel_cat_{key}", label_visibility="collapsed",
+                    on_change=state.resetar_pagina_grade, args=(f"btn_{key}",)
                 )
             
             with col_info:
@@ -126,24 +229,9 @@ def render_tag_system(title: str, key: str, data: dict, descritivos: dict, help_
 
             st.divider()
 
-            # Grid de Tags (Mantido)
-            itens = data[cat_selecionada]
-            cols = st.columns(3)
-            for idx, item_pair in enumerate(itens):
-                tag_nome = item_pair[0]
-                tag_desc = item_pair[1]
-                
-                def handle_tag_click(nome_novo=tag_nome, categoria=cat_selecionada):
-                    texto_atual = st.session_state.get(key, "")
-                    tags_atuais = [t.strip() for t in texto_atual.split(",") if t.strip()]
-                    itens_da_categoria = [i[0] for i in data[categoria]]
-                    nova_lista_tags = [t for t in tags_atuais if t not in itens_da_categoria]
-                    nova_lista_tags.append(nome_novo)
-                    st.session_state[key] = ", ".join(nova_lista_tags)
-
-                with cols[idx % 3]:
-                    st.button(tag_nome, key=f"btn_{key}_{cat_selecionada}_{idx}", help=tag_desc, 
-                              on_click=handle_tag_click, use_container_width=True)
+            # Grid de Tags: paginada, com o mesmo callback para todos os botões
+            catalog_grid(f"btn_{key}", data[cat_selecionada], state.aplicar_tag_categoria,
+                         args=(key, itens_categoria[cat_selecionada]))
             
             # Legenda de ajuda
             st.markdown(
@@ -153,9 +241,13 @@ def render_tag_system(title: str, key: str, data: dict, descritivos: dict, help_
                 unsafe_allow_html=True
             )
 
-def render_vocal_section(title: str, key: str, data: dict, descritivos: dict, help_msg: str = None):
+@st.fragment
+@profiler.secao
+def render_vocal_section(title: str, key: str, data: dict, descritivos: dict, itens_categoria: dict,
+                         help_msg: str = None):
     """
     Renderiza a seção de Vocais com descritivos do catálogo de tipos de vocais.
+    `itens_categoria` vem de core.indice.itens_categoria, como em render_tag_system.
     """
     st.subheader(f"**{title}**", help=help_msg)
 
@@ -167,16 +259,20 @@ def render_vocal_section(title: str, key: str, data: dict, descritivos: dict, he
         c1, c2, c3 = st.columns([0.76, 0.12, 0.12], gap="small", vertical_alignment="bottom")
         with c1: st.text_input(label, key=k, placeholder=f"Características do {label}...")
         with c2: st.button("🎲", key=f"rnd_{k}", use_container_width=True, on_click=state.randomize_tags_callback, args=(k, data))
-        with c3: st.button("🧹", key=f"clr_{k}", use_container_width=True, on_click=lambda k_to_clear=k: st.session_state.update({k_to_clear: ""}))
+        with c3: st.button("🧹", key=f"clr_{k}", use_container_width=True, on_click=state.limpar_campos, args=(k,))
 
-    # 3. Catálogo Único com Descritivo
+    # 3. Catálogo Único com Descritivo (expander preguiçoso)
     if data:
-        with st.expander(f"🏷️ Catálogo (Enviando para: {vocal_alvo})", expanded=False):
+        catalogo = st.expander(f"🏷️ Catálogo (Enviando para: {vocal_alvo})", key="exp_cat_vocal", on_change="rerun")
+        with catalogo:
+            if not catalogo.open:
+                return
             categorias = list(data.keys())
 
             col_sel, col_info = st.columns([0.45, 0.55], vertical_alignment="center")
             with col_sel:
-                cat_sel = st.selectbox("Categoria Vocal", categorias, key="sel_cat_vocal", label_visibility="collapsed")
+                cat_sel = st.selectbox("Categoria Vocal", categorias, key="sel_cat_vocal", label_visibility="collapsed",
+                                       on_change=state.resetar_pagina_grade, args=("vbtn",))
             
             with col_info:
                 # Busca a explicação técnica da categoria vocal
@@ -186,26 +282,9 @@ def render_vocal_section(title: str, key: str, data: dict, descritivos: dict, he
         
             st.divider()
             
-            itens = data[cat_sel]
-            cols = st.columns(3)
-            
-            for idx, item_pair in enumerate(itens):
-                v_nome, v_desc = item_pair[0], item_pair[1]
-                
-                # Função de clique que respeita o RADIO e a substituição por categoria
-                def handle_vocal_click(nome=v_nome, categoria=cat_sel, key=target_key):
-                    atual = st.session_state.get(key, "")
-                    tags_atuais = [t.strip() for t in atual.split(",") if t.strip()]
-                    itens_da_cat = [i[0] for i in data[categoria]]
-                    
-                    # Remove tags da mesma categoria e adiciona a nova
-                    nova_lista = [t for t in tags_atuais if t not in itens_da_cat]
-                    nova_lista.append(nome)
-                    st.session_state[key] = ", ".join(nova_lista)
-
-                with cols[idx % 3]:
-                    st.button(v_nome, key=f"vbtn_{vocal_alvo}_{idx}", help=v_desc, 
-                              on_click=handle_vocal_click, use_container_width=True)
+            # O clique respeita o RADIO (campo alvo) e a substituição por categoria
+            catalog_grid("vbtn", data[cat_sel], state.aplicar_tag_categoria,
+                         args=(target_key, itens_categoria[cat_sel]))
 
             # Legenda de ajuda
             st.markdown(
@@ -1,23 +1,38 @@
 import streamlit as st
+import asyncio
 import sys
 import os
-import io
-import zipfile
+import re
+import uuid
 from datetime import datetime
-from state import clear_all
 
 # Configuração de Paths para Importação
 # Adiciona o diretório pai (raiz) ao path para importar core
 ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.append(ROOT)
 
-from core.generator import SunoMaestroCore
-from app import state, components as ui
+from core.generator import SunoMaestroCore, CAMPOS_PROMPT
+from core.spec import PromptSpec
+from core.export import CacheExportacao, FORMATOS
+from core.history import HistoricoSQLite, novo_item, titulo
+from core.index import nome_item
+from core.llm import ClienteLLM, ErroLLM
+from core.search import CATALOGOS_BUSCA
+from app import state, components as ui, profiler
 
 # Configuração da Página
 st.set_page_config(page_title="Suno Maestro", page_icon="🎛️", layout="wide")
 
 # --- SINGLETONS E CACHE ---
+CATALOGO_RECHECK_SEG = 2.0  # Intervalo mínimo entre verificações dos JSONs do dataset
+HIST_POR_PAGINA = (10, 25, 50)  # Opções de entradas por página na barra lateral
+HISTORICO_DB = os.environ.get("SUNO_MAESTRO_HISTORICO", os.path.join(ROOT, "data", "historico.sqlite3"))
+# Endpoint compatível com a OpenAI (opcional): habilita o envio do prompt direto para a IA
+LLM_URL = os.environ.get("SUNO_MAESTRO_LLM_URL")
+# Cookie com o identificador do histórico (fora da URL, que pode ser compartilhada)
+COOKIE_USUARIO = "suno_maestro_u"
+COOKIE_MAX_IDADE = 365 * 24 * 3600
+
 @st.cache_data
 def load_css() -> str:
     """Carrega o CSS uma única vez."""
@@ -27,16 +42,72 @@ def load_css() -> str:
 
 @st.cache_resource
 def get_core_instance(root_path: str) -> SunoMaestroCore:
-    """Instancia o motor do projeto uma única vez."""
-    return SunoMaestroCore(base_path=root_path)
+    """Instancia o motor do projeto uma única vez (dataset cacheado pelo Streamlit)."""
+    return SunoMaestroCore(base_path=root_path, cache=st.cache_data)
+
+@st.cache_resource
+def get_historico(caminho: str) -> HistoricoSQLite:
+    """Banco do histórico compartilhado por todas as sessões (pool de conexões próprio)."""
+    return HistoricoSQLite(caminho)
+
+@st.cache_resource
+def get_cache_exportacao() -> CacheExportacao:
+    return CacheExportacao()
+
+def get_usuario() -> str:
+    """
+    Identificador do dono do histórico, guardado num cookie do navegador para
+    sobreviver ao refresh sem aparecer na URL: um link ou print compartilhado
+    não dá acesso ao histórico. Links antigos com ?u= são migrados para o
+    cookie (quando o navegador ainda não tem um) e o parâmetro sai da URL.
+    """
+    usuario = st.session_state.get("_usuario")
+    if usuario:
+        return usuario
+    valido = lambda u: isinstance(u, str) and re.fullmatch(r"[0-9a-f]{32}", u)
+    legado = st.query_params.get("u")
+    if legado is not None:
+        del st.query_params["u"]
+    usuario = st.context.cookies.get(COOKIE_USUARIO)
+    if not valido(usuario):
+        usuario = legado if valido(legado) else uuid.uuid4().hex
+        ui.gravar_cookie(COOKIE_USUARIO, usuario, COOKIE_MAX_IDADE)
+    st.session_state._usuario = usuario
+    return usuario
+
+def stream_llm(prompt: str):
+    """
+    Ponte síncrona para st.write_stream: consome o stream assíncrono de
+    core.llm num event loop próprio desta execução do script.
+    """
+    chave = os.environ.get("SUNO_MAESTRO_LLM_KEY") or os.environ.get("OPENAI_API_KEY")
+    cliente = ClienteLLM(LLM_URL, chave_api=chave, max_conexoes=1)
+    loop = asyncio.new_event_loop()
+    trechos = cliente.stream(prompt)
+    try:
+        while True:
+            try:
+                yield loop.run_until_complete(trechos.__anext__())
+            except StopAsyncIteration:
+                return
+    finally:
+        loop.run_until_complete(trechos.aclose())
+        loop.run_until_complete(cliente.fechar())
+        loop.close()
 
 # --- FUNÇÕES UI ESPECÍFICAS DE SEÇÃO ---
+# As seções de catálogo são fragmentos: cliques dentro delas re-executam só a
+# própria seção. Mudanças vindas de fora (ex.: on_ritmo_change preenchendo a
+# estrutura, Aleatório, Restaurar) passam por um rerun completo, que também
+# re-executa os fragmentos.
+@st.fragment
+@profiler.secao
 def render_structure_section(core, help_text):
 
     st.markdown("**🎶 Estrutura**", help=help_text.get("estrutura"))
     sc1, sc3, sc4 = st.columns([0.70, 0.10, .10], gap="small", vertical_alignment="bottom")
     with sc1: 
-        opts_est = [""] + state.get_all_unique_structures(core)
+        opts_est = core.indice.opcoes_estruturas
         curr = st.session_state.estrutura_sel
         idx_est = opts_est.index(curr) if curr in opts_est else 0
         st.selectbox("Sug. Est.", opts_est, index=idx_est, key="estrutura_sel", 
@@ -44,30 +115,31 @@ def render_structure_section(core, help_text):
     with sc3:
         st.button("🎲", key="btn_rnd_est", use_container_width=True, on_click=state.randomize_struct_callback, args=(core,))
     with sc4:
-        st.button("🧹", key="btn_clr_est", use_container_width=True, on_click=lambda: st.session_state.update({"estrutura_sel":"", "estrutura":""}))
+        st.button("🧹", key="btn_clr_est", use_container_width=True, on_click=state.limpar_campos, args=("estrutura_sel", "estrutura"))
     
     st.text_input("Editável", key="estrutura", label_visibility="collapsed", placeholder="Selecione ou monte sua estrutura...")
 
-    # Tags de Estrutura
+    # Tags de Estrutura (expander e abas preguiçosos: só a aba aberta é renderizada)
     metatags = core.dados.get("metatags", {})
     if metatags:
-        with st.expander("🏷️ Adicionar Seções e Tags", expanded=False):
+        exp = st.expander("🏷️ Adicionar Seções e Tags", key="exp_metatags", on_change="rerun")
+        with exp:
+            if not exp.open:
+                return
             mapa_nomes = {
                 "Estrutura_Principal": "Principal",
                 "Secoes_Instrumentais_e_Dinamicas": "Instrumental/Dinâmica",
                 "Finalizacao_e_Transicao_Sonora": "Transições/Final"
             }
-            abas = st.tabs([mapa_nomes.get(k, k) for k in metatags.keys()])
-            for i, (categoria, itens) in enumerate(metatags.items()):
-                with abas[i]:
-                    cols = st.columns(4) 
-                    for idx, item in enumerate(itens):
-                        tag_nome, tag_desc = item[0], item[1]
-                        with cols[idx % 4]:
-                            st.button(tag_nome, key=f"tag_{categoria}_{idx}", help=tag_desc, 
-                                      on_click=state.add_tag_to_structure, args=(tag_nome,), use_container_width=True)
+            abas = st.tabs([mapa_nomes.get(k, k) for k in metatags.keys()], key="abas_metatags", on_change="rerun")
+            for aba, (categoria, itens) in zip(abas, metatags.items()):
+                if aba.open:
+                    with aba:
+                        ui.catalog_grid(f"tag_{categoria}", itens, state.add_tag_to_structure, colunas=4)
             st.caption("💡 Clique nas tags para adicionar ao final da estrutura.")
 
+@st.fragment
+@profiler.secao
 def render_vibe_section(core, help_text):
     """
     Renderiza a seção de Vibes Emocionais com seletor de categorias.
@@ -76,54 +148,39 @@ def render_vibe_section(core, help_text):
     st.subheader("✨ Vibe Emocional", help=help_text.get("vibe_emocional"))
     dados_vibes = core.dados.get("vibe_emocional", {})
     
-    # 1. Catálogo com Seletor (Substituindo Abas)
+    # 1. Catálogo com Seletor (Substituindo Abas), em expander preguiçoso
     if dados_vibes:
-        with st.expander("🎭 Catálogo de Emoções e Vibes", expanded=False):
-            if isinstance(dados_vibes, dict):
-                # Organização por Seletor
-                categorias_ordenadas = sorted(dados_vibes.keys())
-                
-                col_sel, col_info = st.columns([0.45, 0.55], vertical_alignment="center")
-                with col_sel:
-                    cat_vibe = st.selectbox(
-                        "Categoria de Vibe",
-                        categorias_ordenadas,
-                        key="vibe_cat_selector",
-                        label_visibility="collapsed"
-                    )
-                with col_info:
-                    st.caption(f"Explorando: **{cat_vibe}**")
-                
-                st.divider()
-
-                # Renderização das Tags da Categoria Selecionada
-                itens = dados_vibes[cat_vibe]
-                itens_ordenados = sorted(itens, key=lambda x: x[0] if isinstance(x, list) else x)
+        exp = st.expander("🎭 Catálogo de Emoções e Vibes", key="exp_vibes", on_change="rerun")
+        with exp:
+            if exp.open:
+                if isinstance(dados_vibes, dict):
+                    # Organização por Seletor
+                    categorias_ordenadas = core.indice.categorias["vibe_emocional"]
                 
-                cols_v = st.columns(4)
-                for idx, item in enumerate(itens_ordenados):
-                    v_nome = item[0] if isinstance(item, list) else item
-                    v_desc = item[1] if isinstance(item, list) and len(item) > 1 else ""
-                    
-                    with cols_v[idx % 4]:
-                        st.button(
-                            v_nome, 
-                            key=f"tag_v_cat_{cat_vibe}_{idx}", 
-                            help=v_desc, 
-                            on_click=state.add_vibe_click, 
-                            args=(v_nome,), 
-                            use_container_width=True
+                    col_sel, col_info = st.columns([0.45, 0.55], vertical_alignment="center")
+                    with col_sel:
+                        cat_vibe = st.selectbox(
+                            "Categoria de Vibe",
+                            categorias_ordenadas,
+                            key="vibe_cat_selector",
+                            label_visibility="collapsed",
+                            on_change=state.resetar_pagina_grade, args=("tag_v_cat",)
                         )
-            else:
-                # Caso o JSON seja apenas uma lista simples
-                itens_ordenados = sorted(dados_vibes, key=lambda x: x[0] if isinstance(x, list) else x)
-                cols_v = st.columns(4)
-                for idx, item in enumerate(itens_ordenados):
-                    v_nome = item[0] if isinstance(item, list) else item
-                    with cols_v[idx % 4]:
-                        st.button(v_nome, key=f"tag_v_list_{idx}", on_click=state.add_vibe_click, args=(v_nome,), use_container_width=True)
+                    with col_info:
+                        st.caption(f"Explorando: **{cat_vibe}**")
+                
+                    st.divider()
+
+                    # Renderização das Tags da Categoria Selecionada
+                    itens = dados_vibes[cat_vibe]
+                    itens_ordenados = sorted(itens, key=nome_item)
+                    ui.catalog_grid("tag_v_cat", itens_ordenados, state.add_vibe_click, colunas=4)
+                else:
+                    # Caso o JSON seja apenas uma lista simples
+                    itens_ordenados = sorted(dados_vibes, key=nome_item)
+                    ui.catalog_grid("tag_v_list", itens_ordenados, state.add_vibe_click, colunas=4)
             
-            st.caption("💡 Clique para adicionar à lista de vibes.")
+                st.caption("💡 Clique para adicionar à lista de vibes.")
 
     # 2. Controles de Input Manual, Aleatório e Limpeza
     cv1, cv2, cv3 = st.columns([0.76, 0.12, 0.12], gap="small", vertical_alignment="bottom")
@@ -138,7 +195,7 @@ def render_vibe_section(core, help_text):
     with cv2:
         st.button("🎲", key="btn_rnd_vibe_local", use_container_width=True, on_click=state.random_vibe_generator, args=(core,))
     with cv3:
-        st.button("🧹", key="btn_clr_vibe_local", use_container_width=True, on_click=lambda: st.session_state.update({"vibe_emocional": []}))
+        st.button("🧹", key="btn_clr_vibe_local", use_container_width=True, on_click=state.limpar_campos, args=("vibe_emocional",))
     
     # 3. Exibição das Vibes Selecionadas (Tags Ativas)
     if st.session_state.vibe_emocional:
@@ -149,20 +206,52 @@ def render_vibe_section(core, help_text):
             with c1: 
                 st.info(f"✨ {v}") # Usei st.info para dar um destaque visual de tag
             with c2:
-                if st.button("❌", use_container_width=True, key=f"del_vibe_{i}"):
-                    state.delete_vibe(i)
-                    st.rerun()
+                st.button("❌", use_container_width=True, key=f"del_vibe_{i}", on_click=state.delete_vibe, args=(i,))
     else:
         st.caption("Nenhuma vibe selecionada.")
 
-def criar_zip_historico(historico):
-    buffer = io.BytesIO()
-    with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
-        for i, item in enumerate(historico):
-            nome_arquivo = f"{len(historico)-i:02d}_{item['titulo'].replace(' ', '_').replace('|', '')}.txt"
-            zip_file.writestr(nome_arquivo, item['conteudo'])
-    return buffer.getvalue()
-
+@profiler.secao
+def render_search_section(core):
+    """Busca única em todos os catálogos (nomes e descrições, sem acentos)."""
+    with st.expander("🔎 Buscar no Catálogo", expanded=False):
+        consulta = st.text_input("Buscar tag", key="busca_catalogo", label_visibility="collapsed",
+                                 placeholder="Ex: melancolico, voz grave, samba...")
+        if not consulta.strip():
+            st.caption("💡 Digite para buscar em todos os catálogos. Clique no resultado para aplicá-lo.")
+            return
+
+        resultados = core.busca.buscar(consulta, limite=12)
+        if not resultados:
+            st.caption("Nenhum resultado encontrado.")
+            return
+
+        cols = st.columns(3)
+        for idx, r in enumerate(resultados):
+            with cols[idx % 3]:
+                st.button(f"{r.nome} · {CATALOGOS_BUSCA[r.catalogo]}", key=f"busca_res_{idx}",
+                          help=f"{r.categoria}: {r.descricao}" if r.descricao else r.categoria,
+                          on_click=state.aplicar_resultado_busca,
+                          args=(core, r.catalogo, r.categoria, r.nome), use_container_width=True)
+
+def exportacao_historico(core, historico, usuario, formato):
+    """
+    Gerador do download: só roda quando o botão é clicado (em outra thread,
+    sem acesso ao session_state) e devolve os bytes do arquivo do cache de
+    exportação. O arquivo é lido e fechado na hora: nenhum descritor fica
+    aberto nem prende versões antigas que o cache já substituiu.
+    """
+    cache, medir = get_cache_exportacao(), profiler.ativo()
+    def ler():
+        with open(cache.arquivo(core, historico, usuario, formato), "rb") as f:
+            return f.read()
+    def gerar():
+        if not medir:
+            return ler()
+        with profiler.cronometro(f"exportacao_{formato}", "exportacao", sessao=False):
+            return ler()
+    return gerar
+
+@profiler.secao
 def render_history_sidebar(core):
     with st.sidebar:
         st.header("Suno Maestro")
@@ -171,31 +260,76 @@ def render_history_sidebar(core):
         
         st.markdown("---")
         st.header("📜 Histórico")
-        st.info("Os prompts gerados nesta sessão ficam salvos abaixo.")
-        
-        if not st.session_state.history:
+        st.info("Os prompts gerados ficam salvos abaixo, vinculados a este navegador.")
+
+        # Fechado por padrão: sem consulta ao banco nem elementos enquanto não for aberto
+        if not st.toggle("Mostrar histórico", key="hist_aberto"):
+            return
+
+        historico, usuario = get_historico(HISTORICO_DB), get_usuario()
+        voltar_inicio = lambda: st.session_state.update(hist_pagina=0)
+        hf1, hf2 = st.columns([0.7, 0.3], gap="small")
+        with hf1: genero = st.selectbox("Filtrar por gênero", [""] + historico.generos(usuario), key="hist_genero",
+                                        format_func=lambda g: g or "Todos os gêneros", on_change=voltar_inicio,
+                                        label_visibility="collapsed")
+        with hf2: por_pagina = st.selectbox("Por página", HIST_POR_PAGINA, key="hist_por_pagina",
+                                            on_change=voltar_inicio, label_visibility="collapsed")
+
+        total = historico.contar(usuario, genero=genero)
+        if not total:
             st.write("Nenhum prompt gerado ainda.")
-        
-        for idx, item in enumerate(st.session_state.history):
-            with st.expander(item["titulo"]):
-                st.caption(f"Gerado em: {item['data']}")
+
+        # Só a página atual é lida do banco
+        paginas = max(1, -(-total // por_pagina))
+        pagina = min(st.session_state.get("hist_pagina", 0), paginas - 1)
+        for item in historico.pagina(usuario, pagina, por_pagina, genero=genero):
+            # O texto só é renderizado quando a entrada está aberta
+            exp = st.expander(titulo(item), key=f"hist_{item['id']}", on_change="rerun")
+            if not exp.open:
+                continue
+            with exp:
+                # Sem o bloco de spec, como o prompt principal: é o texto colado na IA.
+                # A spec fica nas exportações; Restaurar usa item["campos"] direto.
+                conteudo = core.gerar_prompt(item["campos"])
+                st.caption(f"Gerado em: {datetime.fromtimestamp(item['ts']).strftime('%d/%m/%Y %H:%M')}")
                 sb1, sb2 = st.columns([0.2, 0.2], gap="small", vertical_alignment="bottom")
-                with sb1: st.button("🔄 Restaurar", key=f"rest_{idx}", use_container_width=True, on_click=state.callback_restaurar, args=(item["conteudo"],))
-                with sb2: ui.custom_copy_button(item["conteudo"])
-                st.code(item["conteudo"], language="yaml")
+                with sb1: st.button("🔄 Restaurar", key=f"rest_{item['id']}", use_container_width=True, on_click=state.callback_restaurar_campos, args=(item["campos"],))
+                with sb2: ui.custom_copy_button(conteudo)
+                st.code(conteudo, language="yaml")
+
+        if paginas > 1:
+            pg1, pg2, pg3 = st.columns([0.3, 0.4, 0.3], vertical_alignment="center")
+            with pg1: st.button("◀", key="hist_ant", disabled=pagina == 0, use_container_width=True,
+                                on_click=lambda: st.session_state.update(hist_pagina=pagina - 1))
+            with pg2: st.caption(f"Página {pagina + 1} de {paginas}")
+            with pg3: st.button("▶", key="hist_prox", disabled=pagina >= paginas - 1, use_container_width=True,
+                                on_click=lambda: st.session_state.update(hist_pagina=pagina + 1))
         
         st.markdown("---")
         
-        if st.session_state.history:
-            zip_data = criar_zip_historico(st.session_state.history)
-            st.download_button(
-                label="📦 Baixar Tudo (ZIP)", data=zip_data,
-                file_name=f"prompts_suno_{datetime.now().strftime('%Y%m%d_%H%M')}.zip",
-                mime="application/zip", use_container_width=True
+        with st.expander("📥 Importar prompts salvos"):
+            chave_upload = f"hist_upload_{st.session_state.get('hist_upload_n', 0)}"
+            arquivos = st.file_uploader("Arquivos .txt ou o ZIP/JSONL exportado", type=["txt", "zip", "jsonl"],
+                                        accept_multiple_files=True, key=chave_upload)
+            st.button("Importar", key="hist_importar", disabled=not arquivos, use_container_width=True,
+                      on_click=state.importar_historico, args=(historico, usuario, chave_upload))
+
+        if total:
+            # A exportação cobre o histórico inteiro e só é gerada no clique
+            nome_base = f"prompts_suno_{datetime.now().strftime('%Y%m%d_%H%M')}"
+            ex1, ex2 = st.columns(2, gap="small")
+            with ex1: st.download_button(
+                label="📦 ZIP (TXT)", data=exportacao_historico(core, historico, usuario, "zip"),
+                file_name=f"{nome_base}.zip", mime=FORMATOS["zip"], on_click="ignore", use_container_width=True
+            )
+            with ex2: st.download_button(
+                label="🧾 JSONL", data=exportacao_historico(core, historico, usuario, "jsonl"),
+                file_name=f"{nome_base}.jsonl", mime=FORMATOS["jsonl"], on_click="ignore", use_container_width=True
             )
             
             if st.button("🗑️ Limpar Histórico", use_container_width=True):
-                st.session_state.history = []
+                historico.limpar(usuario)
+                st.session_state.hist_pagina = 0
                 st.rerun()
 
 def render_help_sidebar(core):
@@ -227,14 +361,17 @@ def render_help_sidebar(core):
 # --- MAIN APP ---
 def main():
     # Inicializações
+    profiler.iniciar()
+    profiler.marco("inicializacao")
     st.markdown(f"<style>{load_css()}</style>", unsafe_allow_html=True)
     state.init_session_state()
 
-    # Adicione esta verificação extra para garantir
-    if "history" not in st.session_state:
-        st.session_state.history = []
-    
-    core = get_core_instance(ROOT)
+    profiler.marco("dataset")
+    compartilhado = get_core_instance(ROOT)
+    # Catálogos editados em disco entram sem reiniciar o processo
+    compartilhado.recarregar_alterados(intervalo_min=CATALOGO_RECHECK_SEG)
+    # Este rerun (e os callbacks e fragmentos que recebem `core`) lê uma única versão do dataset
+    core = compartilhado.fixar()
     placeholder_aviso = st.empty()
 
     raw_help = core.dados.get("help", {})
@@ -242,6 +379,7 @@ def main():
     help_text = dict(raw_help.get("campos", []))
 
     # Cabeçalho
+    profiler.marco("cabecalho_e_geracao")
     st.title("🎛️ Suno Maestro")
     st.markdown("Generate professional prompts for Suno AI v5.")
     st.markdown("---")
@@ -263,24 +401,18 @@ def main():
             else:
                 # Geração
                 with st.spinner("Maestro está compondo seu prompt..."):
-                    campos = {k: st.session_state[k] for k in ["genero","ritmo","estrutura","tipo_de_gravacao",
-                                                               "influencia_estetica","vibe_emocional","referencia",
-                                                               "idioma","tema","mensagem","palavras_chave",
-                                                               "publico","narrador","tom", "vocal_masculino", "vocal_feminino"]}
-                    texto_gerado = core.gerar_prompt(campos)
+                    # Normalizada uma única vez (listas/textos da sessão -> PromptSpec)
+                    spec = PromptSpec({k: st.session_state[k] for k in CAMPOS_PROMPT})
+                    # Sem o bloco de spec: este é o texto copiado/baixado/enviado para a IA.
+                    # A spec fica na entrada do histórico e nas exportações.
+                    texto_gerado = core.gerar_prompt(spec)
                     st.session_state.prompt_final = texto_gerado
+                    st.session_state.pop("resposta_llm", None)
                     st.session_state.show_prompt = True
 
-                    # Salvar Histórico
-                    agora = datetime.now()
-                    gen = st.session_state.genero or "Estilo"
-                    tem = st.session_state.tema or "Geral"
-                    novo_item = {
-                        "titulo": f"{agora.strftime('%H:%M')} | {gen} - {tem}"[:40], 
-                        "conteudo": texto_gerado,
-                        "data": agora.strftime("%d/%m/%Y %H:%M")
-                    }
-                    st.session_state.history.insert(0, novo_item)                    
+                    # Salvar Histórico (spec compacta; o texto é re-renderizado ao abrir/exportar)
+                    get_historico(HISTORICO_DB).adicionar(get_usuario(), [novo_item(spec)])
+                    st.session_state.hist_pagina = 0
                     
                     # Feedback Visual
                     with placeholder_aviso:
@@ -293,22 +425,37 @@ def main():
                         </div>
                         """, unsafe_allow_html=True)
 
+    profiler.marco("busca")
+    render_search_section(core)
+
     # Exibição do Prompt Gerado
+    profiler.marco("prompt_gerado")
     if st.session_state.show_prompt:
         st.divider()
-        ac1, ac2, ac3 = st.columns([1, 1, 1], vertical_alignment="bottom")
-        with ac1: ui.custom_copy_button(st.session_state.prompt_final)
-        with ac2: st.download_button("⬇️ Baixar", st.session_state.prompt_final, "prompt.txt", use_container_width=True)
-        with ac3: 
+        acoes = st.columns(4 if LLM_URL else 3, vertical_alignment="bottom")
+        with acoes[0]: ui.custom_copy_button(st.session_state.prompt_final)
+        with acoes[1]: st.download_button("⬇️ Baixar", st.session_state.prompt_final, "prompt.txt", use_container_width=True)
+        with acoes[2]: 
             if st.button("❌ Fechar", use_container_width=True):
                 state.clear_all()
                 st.session_state.show_prompt = False
+                st.session_state.pop("resposta_llm", None)
                 st.rerun()
+        enviar = LLM_URL and acoes[3].button("🤖 Enviar para a IA", use_container_width=True)
         st.code(st.session_state.prompt_final, language="yaml")
+        if enviar:
+            # Mesmo texto que o core.llm envia em lote: renderizado sem o bloco de spec
+            try:
+                st.session_state.resposta_llm = st.write_stream(stream_llm(st.session_state.prompt_final))
+            except ErroLLM as e:
+                st.error(f"Falha ao enviar para a IA: {e}")
+        elif st.session_state.get("resposta_llm"):
+            st.markdown(st.session_state.resposta_llm)
 
     # Layout Principal (Formulários)
     col_left, col_right = st.columns(2, gap="large")
 
+    profiler.marco("formulario_esquerdo")
     with col_left:
         st.subheader("📝 Composição")
         lc1, lc2 = st.columns(2)
@@ -319,11 +466,11 @@ def main():
         st.subheader("🎵 Identidade Musical")
         mc1, mc2 = st.columns(2)
         with mc1: 
-            opts_gen = [""] + sorted(list(core.dados["hierarquia"].keys()))
+            opts_gen = core.indice.opcoes_generos
             idx_gen = opts_gen.index(st.session_state.genero) if st.session_state.genero in opts_gen else 0
             st.selectbox("Gênero*", opts_gen, index=idx_gen, key="genero", help=help_text.get("genero"), on_change=state.on_genero_change)
         with mc2: 
-            opts_rit = [""] + sorted(state.get_ritmos_list(st.session_state.genero, core))
+            opts_rit = core.indice.opcoes_ritmos.get(st.session_state.genero, [""])
             curr_rit = st.session_state.ritmo
             idx_rit = opts_rit.index(curr_rit) if curr_rit in opts_rit else 0
             st.selectbox("Ritmo", opts_rit, index=idx_rit, key="ritmo", help=help_text.get("ritmo"), on_change=state.on_ritmo_change, args=(core,))
@@ -334,36 +481,39 @@ def main():
         st.divider()
         render_vibe_section(core, help_text)
 
+    profiler.marco("formulario_direito")
     with col_right:
         # 1. Elemento Principal de Destaque na Direita
-        ui.render_vocal_section("🎤 Vocais", "tipo_vocal", core.dados["tipo_vocal"], core.dados["descritivos"], help_text.get("tipo_vocal"))
+        ui.render_vocal_section("🎤 Vocais", "tipo_vocal", core.dados["tipo_vocal"], core.dados["descritivos"], core.indice.itens_categoria.get("tipo_vocal", {}), help_text.get("tipo_vocal"))
         st.divider()
     
         # 2. Expander para Outras Características
         with st.expander("⚙️ Outras Características Teatrais e Técnicas", expanded=True):
             # Público Alvo
-            ui.hierarchical_field("🎧 Público Alvo", "publico", core.dados["publico"], help_msg=help_text.get("publico"))
+            ui.hierarchical_field("🎧 Público Alvo", "publico", core.dados["publico"], help_msg=help_text.get("publico"), categorias=core.indice.categorias.get("publico"))
             st.divider()
             
             # Narrador
-            ui.hierarchical_field("🎤 Narrador", "narrador", core.dados["narrador"], help_msg=help_text.get("narrador"))
+            ui.hierarchical_field("🎤 Narrador", "narrador", core.dados["narrador"], help_msg=help_text.get("narrador"), categorias=core.indice.categorias.get("narrador"))
             st.divider()
             
             # Tom Lírico (Atitude Interpretativa)
-            ui.render_tag_system("📜 Tom Lírico", "tom", core.dados["tom"], core.dados["descritivos"], help_msg=help_text.get("tom"))
+            ui.render_tag_system("📜 Tom Lírico", "tom", core.dados["tom"], core.dados["descritivos"], core.indice.itens_categoria.get("tom", {}), help_msg=help_text.get("tom"))
             st.divider()
             
             # Influência Estética
-            ui.render_tag_system("🎨 Influência Estética", "influencia_estetica", core.dados["influencia_estetica"], core.dados["descritivos"], help_msg=help_text.get("influencia_estetica"))
+            ui.render_tag_system("🎨 Influência Estética", "influencia_estetica", core.dados["influencia_estetica"], core.dados["descritivos"], core.indice.itens_categoria.get("influencia_estetica", {}), help_msg=help_text.get("influencia_estetica"))
             st.divider()
             
             # Tipo de Gravação
-            ui.hierarchical_field("🎚️ Tipo de Gravação", "tipo_de_gravacao", core.dados["tipo_de_gravacao"], help_msg=help_text.get("tipo_de_gravacao"))
+            ui.hierarchical_field("🎚️ Tipo de Gravação", "tipo_de_gravacao", core.dados["tipo_de_gravacao"], help_msg=help_text.get("tipo_de_gravacao"), categorias=core.indice.categorias.get("tipo_de_gravacao"))
 
     st.markdown("---")
     st.markdown("<div style='text-align: center; color: #666; font-size: 0.8rem;'>Suno Maestro • Powered by Eduardo Palombo</div>", unsafe_allow_html=True)
 
+    profiler.marco("sidebar")
     render_history_sidebar(core)
+    profiler.finalizar()
 
 if __name__ == "__main__":
 
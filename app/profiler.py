@@ -0,0 +1,129 @@
+"""
+Profiler opcional dos reruns do app.
+
+Ativado com a variável de ambiente SUNO_MAESTRO_PROFILE=1 ou com ?profile=1
+na URL. Mede as etapas de `main()` (marcos sequenciais), as seções
+renderizadas (inclusive em reruns de fragmento) e os callbacks de
+`app/state.py`. Os tempos aparecem num painel na barra lateral e são
+anexados a um arquivo no formato Chrome Trace (abre em chrome://tracing ou
+https://ui.perfetto.dev), por padrão em data/trace.json.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import streamlit as st
+
+from core.generator import CACHE_RENDER
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ENV_ATIVO = "SUNO_MAESTRO_PROFILE"
+TRACE_ARQUIVO = os.environ.get("SUNO_MAESTRO_TRACE", os.path.join(ROOT, "data", "trace.json"))
+
+_lock_trace = threading.Lock()
+
+def _ativo_no_ambiente():
+    return os.environ.get(ENV_ATIVO, "").lower() in ("1", "true", "yes")
+
+def ativo() -> bool:
+    """Estado do profiler no rerun atual (definido por iniciar)."""
+    return bool(st.session_state.get("_perfil_ativo"))
+
+def gravar_trace(eventos, caminho=None):
+    """
+    Anexa eventos ao arquivo de trace. O formato de array JSON do Chrome
+    Trace aceita o arquivo sem o "]" final, então cada evento é só anexado.
+    """
+    caminho = caminho or TRACE_ARQUIVO
+    linhas = "".join(json.dumps(e, ensure_ascii=False) + ",\n" for e in eventos)
+    with _lock_trace:
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        with open(caminho, "a", encoding="utf-8") as f:
+            if f.tell() == 0:
+                f.write("[\n")
+            f.write(linhas)
+
+def _evento(nome, cat, inicio_us, dur_ns):
+    return {"name": nome, "cat": cat, "ph": "X", "ts": inicio_us, "dur": dur_ns / 1000,
+            "pid": os.getpid(), "tid": threading.get_ident()}
+
+def _registrar(evento, sessao=True):
+    if sessao:
+        st.session_state.setdefault("_perfil_eventos", []).append(evento)
+    gravar_trace([evento])
+
+@contextmanager
+def cronometro(nome, cat="secao", sessao=True):
+    """
+    Mede o bloco se o profiler estiver ativo. Com `sessao=False` grava só no
+    arquivo de trace (para código fora da thread do script, sem session_state).
+    """
+    if sessao and not ativo():
+        yield
+        return
+    inicio_us, t = time.time_ns() // 1000, time.perf_counter_ns()
+    try:
+        yield
+    finally:
+        _registrar(_evento(nome, cat, inicio_us, time.perf_counter_ns() - t), sessao)
+
+def _medir(cat):
+    def decorador(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not ativo():
+                return fn(*args, **kwargs)
+            with cronometro(fn.__name__, cat):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorador
+
+# Decoradores: seções renderizadas e callbacks de widgets
+secao = _medir("secao")
+callback = _medir("callback")
+
+def iniciar():
+    """Início de um rerun completo: decide se o profiler está ativo e zera o painel."""
+    st.session_state._perfil_ativo = _ativo_no_ambiente() or st.query_params.get("profile") == "1"
+    if not st.session_state._perfil_ativo:
+        return
+    # Callbacks rodam antes do script: os eventos deles continuam no painel deste rerun
+    st.session_state._perfil_eventos = [e for e in st.session_state.get("_perfil_eventos", [])
+                                        if e["cat"] == "callback" and e["ts"] >= st.session_state.get("_perfil_fim", 0)]
+    st.session_state._perfil_rerun = (time.time_ns() // 1000, time.perf_counter_ns())
+    st.session_state._perfil_marco = None
+
+def marco(nome):
+    """Fecha a etapa anterior de main() e abre a etapa `nome`."""
+    if not ativo():
+        return
+    agora_us, agora = time.time_ns() // 1000, time.perf_counter_ns()
+    anterior = st.session_state.get("_perfil_marco")
+    if anterior:
+        nome_ant, inicio_us, t = anterior
+        _registrar(_evento(nome_ant, "etapa", inicio_us, agora - t))
+    st.session_state._perfil_marco = (nome, agora_us, agora) if nome else None
+
+def finalizar():
+    """Fecha a última etapa e o rerun e mostra o painel de tempos."""
+    if not ativo():
+        return
+    marco(None)
+    inicio_us, t = st.session_state._perfil_rerun
+    _registrar(_evento("rerun", "rerun", inicio_us, time.perf_counter_ns() - t))
+    st.session_state._perfil_fim = time.time_ns() // 1000
+    render_painel()
+
+def render_painel():
+    eventos = sorted(st.session_state.get("_perfil_eventos", []), key=lambda e: e["ts"])
+    with st.sidebar.expander("⏱️ Perfil do rerun", expanded=True):
+        st.caption(f"Trace: `{TRACE_ARQUIVO}`")
+        st.dataframe([{"nome": e["name"], "tipo": e["cat"], "ms": round(e["dur"] / 1000, 2)} for e in eventos],
+                     hide_index=True, use_container_width=True)
+        cache = CACHE_RENDER.estatisticas()
+        st.caption(f"Cache de prompts (processo): {cache['entradas']} entradas, {cache['bytes'] / 1024:.0f} KB · "
+                   f"acertos {cache['acertos']} · falhas {cache['falhas']} ({cache['taxa_acerto']:.0%}) · "
+                   f"remoções LRU {cache['remocoes_lru']} / TTL {cache['remocoes_ttl']}")
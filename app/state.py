@@ -1,6 +1,8 @@
 import streamlit as st
-import random
-import re
+import copy
+from app import profiler
+from core import restore, sampler
+from core.spec import CAMPOS_PROMPT
 
 # --- CONSTANTES ---
 HIER_KEYS = ["publico", "tipo_de_gravacao", "narrador"]
@@ -10,7 +12,6 @@ STATE_DEFAULTS = {
     "vibe_emocional": [], "vibe_cat": "", "vibe_item": "", "vibe_manual": "",
     "prompt_final": "", "show_prompt": False,
     "estrutura": "", "estrutura_sel": "",
-    "history": [],
     "new_vibe_input": "",
     "tom": "", 
     "influencia_estetica": "",
@@ -24,55 +25,37 @@ def init_session_state():
     """Garante que todas as chaves necessárias existam no session_state."""
     for k, v in STATE_DEFAULTS.items():
         if k not in st.session_state:
-            # Se for o histórico, garantimos uma lista nova [ ]
-            if k == "history":
-                st.session_state[k] = []
-            else:
-                st.session_state[k] = v
+            # Cópia: a lista padrão de vibes não pode ser compartilhada com a sessão
+            st.session_state[k] = copy.copy(v)
 
     for k in HIER_KEYS:
         if f"{k}_cat" not in st.session_state: st.session_state[f"{k}_cat"] = ""
         if f"{k}_sel" not in st.session_state: st.session_state[f"{k}_sel"] = ""
         if k not in st.session_state: st.session_state[k] = ""
 
-# --- HELPERS DE DADOS ---
-def get_ritmos_list(genero, core):
-    if not genero or genero not in core.dados["hierarquia"]: return []
-    return [item[0] for item in core.dados["hierarquia"][genero]]
-
-def get_structure_map(genero, core):
-    if not genero or genero not in core.dados["hierarquia"]: return {}
-    return {item[0]: item[1] for item in core.dados["hierarquia"][genero]}
-
-def get_all_unique_structures(core):
-    structures = set()
-    for gen_list in core.dados["hierarquia"].values():
-        for item in gen_list:
-            if len(item) > 1: structures.add(item[1])
-    return sorted(list(structures))
-
 # --- CALLBACKS ---
+@profiler.callback
 def on_genero_change():
     st.session_state.ritmo = ""
 
+@profiler.callback
 def on_ritmo_change(core):
     g, r = st.session_state.genero, st.session_state.ritmo
     if g and r:
-        mapa = get_structure_map(g, core)
-        sugestao = mapa.get(r, "")
+        sugestao = core.indice.estrutura_de(g, r)
         if sugestao:
             st.session_state.estrutura_sel = sugestao
             st.session_state.estrutura = sugestao
 
+@profiler.callback
 def on_estrutura_sel_change():
     if st.session_state.estrutura_sel:
         st.session_state.estrutura = st.session_state.estrutura_sel
 
+@profiler.callback
 def clear_all():
     # 1. Limpa os campos definidos no STATE_DEFAULTS
     for k in STATE_DEFAULTS.keys():
-        if k == "history": 
-            continue
         if k == "vibe_emocional":
             st.session_state[k] = []  # Garante lista vazia
         else:
@@ -91,118 +74,140 @@ def clear_all():
     if "new_vibe_input" in st.session_state:
         st.session_state.new_vibe_input = ""
 
+@profiler.callback
 def randomize_hier_callback(key, data):
-    cats = [c for c in data.keys() if data[c]]
-    if cats:
-        c = random.choice(cats)
-        v = random.choice(data[c])
+    tabela = sampler.TabelaCatalogo(data)
+    if len(tabela):
+        (c, idx), = sampler.sortear_com_categoria(tabela, 1, sampler.gerador())
+        v = tabela.nomes[idx]
         st.session_state[f"{key}_cat"] = c
         st.session_state[f"{key}_sel"] = v
         st.session_state[key] = v
 
+@profiler.callback
 def clear_hier_callback(key):
     st.session_state[f"{key}_cat"] = ""
     st.session_state[f"{key}_sel"] = ""
     st.session_state[key] = ""
 
+@profiler.callback
 def random_vibe_generator(core):
-    vibe_data = core.dados["vibe_emocional"]
-    st.session_state.vibe_emocional = []
-    valid_cats = [c for c, itens in vibe_data.items() if any(i for i in itens)]
-    if valid_cats:
-        for _ in range(random.randint(3, 5)):
-            c = random.choice(valid_cats)
-            itens = [i for i in vibe_data[c] if i]
-            if itens:
-                v = random.choice(itens)
-                if v not in st.session_state.vibe_emocional: 
-                    st.session_state.vibe_emocional.append(v)
+    tabela = core.amostrador.tabelas["vibe_emocional"]
+    st.session_state.vibe_emocional = sampler.sortear_vibes(tabela, 1, sampler.gerador())[0]
 
+@profiler.callback
 def random_all(core):
-    # 1. Gênero e Ritmo
-    generos = list(core.dados["hierarquia"].keys())
-    if generos:
-        g = random.choice(generos)
-        st.session_state.genero = g
-        itens_ritmo = core.dados["hierarquia"].get(g, [])
-        if itens_ritmo:
-            escolhido = random.choice(itens_ritmo)
-            st.session_state.ritmo = escolhido[0]
-            st.session_state.estrutura = escolhido[1]
-            st.session_state.estrutura_sel = escolhido[1]
-
-    # 2. Tom Lírico (Agora usando a nova lógica inteligente)
-    dados_tom = core.dados.get("tom", {})
-    if dados_tom:
-        randomize_tags_callback("tom", dados_tom)
-
-    # 3. Influência Estética (Agora usando a nova lógica inteligente)
-    dados_inf = core.dados.get("influencia_estetica", {})
-    if dados_inf:
-        randomize_tags_callback("influencia_estetica", dados_inf)
-
-    # 4. Campos Hierárquicos Restantes (Público, Narrador, Tipo de Gravação)
-    for k in HIER_KEYS:
-        if k in core.dados:
-            data = core.dados[k]
-            randomize_hier_callback(k, data)
-        
-    # 5. Vibes
-    random_vibe_generator(core)
+    """Sorteia uma configuração completa (core.sampler) e aplica no session_state."""
+    campos = core.amostrador.amostrar(1)[0]
+    for k, v in campos.items():
+        st.session_state[k] = v
+    st.session_state.estrutura_sel = campos["estrutura"]
 
-    # 6. Vocais (Sorteia Masculino e Feminino separadamente)
-    dados_vocal = core.dados.get("tipo_vocal", {})
-    if dados_vocal:
-        randomize_tags_callback("vocal_masculino", dados_vocal)
-        randomize_tags_callback("vocal_feminino", dados_vocal)
+    # Campos hierárquicos: seleciona também a categoria do item sorteado
+    for k in HIER_KEYS:
+        st.session_state[f"{k}_cat"] = core.indice.item_categoria.get(k, {}).get(campos[k], "")
+        st.session_state[f"{k}_sel"] = campos[k]
 
+@profiler.callback
 def randomize_struct_callback(core):
-    structs = get_all_unique_structures(core)
-    if structs:
-        s = random.choice(structs)
+    """Sorteia uma estrutura pelo core.sampler, entre as dos ritmos do gênero escolhido (se houver)."""
+    s = core.amostrador.estruturas(1, genero=st.session_state.genero)[0]
+    if s:
         st.session_state.estrutura_sel = s
         st.session_state.estrutura = s
 
+@profiler.callback
 def callback_restaurar(texto_prompt):
-    partes = texto_prompt.split("AUTOMATIC_INPUTS:")
-    texto_usuario = partes[0] if len(partes) > 0 else texto_prompt
-    
-    mapeamento = {
-        "primary_genre": "genero", "specific_style": "ritmo",
-        "recording_aesthetic": "tipo_de_gravacao", "artistic_influence": "influencia_estetica",
-        "emotional_vibe": "vibe_emocional", "external_refs": "referencia",
-        "language": "idioma", "topic": "tema", "core_message": "mensagem",
-        "keywords": "palavras_chave", "target_audience": "publico",
-        "narrator_perspective": "narrador", "structure_format": "estrutura",
-        "lyrical_tone": "tom",
-        "male_vocal_specs": "vocal_masculino",
-        "female_vocal_specs": "vocal_feminino"
-    }
-
-    for chave_prompt, chave_state in mapeamento.items():
-        padrao = rf'{chave_prompt}: "(.*?)"'
-        match = re.search(padrao, texto_usuario)
-        if match:
-            valor = match.group(1).strip()
-            if "AUTOMATIC_INPUT" in valor or valor.lower() == "none" or valor == "":
-                novo_valor = [] if chave_state == "vibe_emocional" else ""
-            elif chave_state == "vibe_emocional":
-                limpo = valor.replace("[", "").replace("]", "").replace("'", "").replace('"', "")
-                novo_valor = [v.strip() for v in limpo.split(",") if v.strip()]
-            else:
-                novo_valor = valor
-            st.session_state[chave_state] = novo_valor
+    """Restaura os campos a partir do texto de um prompt (bloco de spec ou, em prompts antigos, scanner)."""
+    callback_restaurar_campos(restore.extrair_campos(texto_prompt))
+
+@profiler.callback
+def importar_historico(historico, usuario: str, chave_upload: str):
+    """Importa os arquivos enviados para o histórico numa única escrita em lote."""
+    arquivos = st.session_state.get(chave_upload) or []
+    itens, ignorados = restore.importar_arquivos((a.name, a.getvalue()) for a in arquivos)
+    historico.adicionar(usuario, itens)
+
+    # Troca a chave do uploader para esvaziá-lo e volta para a primeira página
+    st.session_state.hist_upload_n = st.session_state.get("hist_upload_n", 0) + 1
+    st.session_state.hist_pagina = 0
+    st.toast(f"{len(itens)} prompt(s) importado(s).", icon="📥")
+    if ignorados:
+        st.toast(f"Sem campos reconhecidos: {', '.join(ignorados[:5])}{'…' if len(ignorados) > 5 else ''}", icon="⚠️")
+
+@profiler.callback
+def callback_restaurar_campos(spec: dict):
+    """Restaura a partir da spec compacta do histórico (core.spec.normalizar_campos)."""
+    for k in CAMPOS_PROMPT:
+        valor = spec.get(k, "")
+        if k == "vibe_emocional":
+            valor = [v.strip() for v in valor.split(",") if v.strip()]
+        st.session_state[k] = valor
+
+    _finalizar_restauracao()
 
+def _finalizar_restauracao():
     for k in HIER_KEYS:
         st.session_state[f"{k}_cat"] = ""
         st.session_state[f"{k}_sel"] = ""
     
     st.session_state.show_prompt = False
 
+@profiler.callback
+def aplicar_tag_categoria(key: str, itens_da_categoria, nome: str):
+    """Adiciona `nome` ao campo de tags `key`, removendo as tags da mesma categoria."""
+    atual = st.session_state.get(key, "")
+    tags_atuais = [t.strip() for t in atual.split(",") if t.strip()]
+    nova_lista = [t for t in tags_atuais if t not in itens_da_categoria]
+    nova_lista.append(nome)
+    st.session_state[key] = ", ".join(nova_lista)
+
+@profiler.callback
+def aplicar_resultado_busca(core, catalogo: str, categoria: str, nome: str):
+    """Envia um resultado da busca de catálogo para o campo correspondente."""
+    if catalogo == "hierarquia":
+        st.session_state.genero = categoria
+        st.session_state.ritmo = nome
+        on_ritmo_change(core)
+    elif catalogo == "vibe_emocional":
+        add_vibe_click(nome)
+    elif catalogo == "metatags":
+        add_tag_to_structure(nome)
+    elif catalogo in HIER_KEYS:
+        st.session_state[f"{catalogo}_cat"] = categoria
+        st.session_state[f"{catalogo}_sel"] = nome
+        st.session_state[catalogo] = nome
+    else:
+        # Catálogos de tags (tom, influência estética, tipo vocal)
+        key = catalogo
+        if catalogo == "tipo_vocal":
+            alvo = st.session_state.get("vocal_target_radio", "Masculino")
+            key = "vocal_masculino" if alvo == "Masculino" else "vocal_feminino"
+        aplicar_tag_categoria(key, core.indice.itens_categoria[catalogo][categoria], nome)
+    st.toast(f"'{nome}' aplicado.", icon="✅")
+
+@profiler.callback
+def limpar_campos(*keys: str):
+    """Volta os campos ao valor padrão de STATE_DEFAULTS (botões 🧹)."""
+    for k in keys:
+        st.session_state[k] = copy.copy(STATE_DEFAULTS.get(k, ""))
+
+# --- GRADES DE CATÁLOGO (components.catalog_grid) ---
+@profiler.callback
+def mudar_pagina_grade(chave: str, delta: int):
+    st.session_state[f"{chave}_pagina"] = st.session_state.get(f"{chave}_pagina", 0) + delta
+
+@profiler.callback
+def resetar_pagina_grade(chave: str):
+    """Volta a grade para a primeira página (filtro ou categoria alterados)."""
+    st.session_state[f"{chave}_pagina"] = 0
+
+@profiler.callback
 def add_tag_to_structure(tag):
     cur = st.session_state.estrutura
     st.session_state.estrutura = f"{cur} {tag}" if cur else tag
 
+@profiler.callback
 def add_vibe_click(vibe_nome):
     if "vibe_emocional" not in st.session_state: st.session_state.vibe_emocional = []
     if vibe_nome not in st.session_state.vibe_emocional:
@@ -210,31 +215,28 @@ def add_vibe_click(vibe_nome):
     else:
         st.toast(f"A vibe '{vibe_nome}' já foi adicionada!", icon="⚠️")
 
+@profiler.callback
 def delete_vibe(index):
     if len(st.session_state.vibe_emocional) > index:
         st.session_state.vibe_emocional.pop(index)
 
+@profiler.callback
 def submit_manual_vibe():
     val = st.session_state.get("new_vibe_input", "").strip()
     if val:
         if val not in st.session_state.vibe_emocional:
             st.session_state.vibe_emocional.append(val)
 
-def handle_tag_selection(key: str, data: dict):
+@profiler.callback
+def handle_tag_selection(key: str, item_to_cat: dict):
     """
     Garante que apenas 1 item por categoria seja selecionado.
     Se o usuário selecionar um novo item da mesma categoria, o antigo é removido.
+    `item_to_cat` é o mapa {"Item": "Categoria"} pré-calculado em core.indice.item_categoria.
     """
     selected_items = st.session_state[key]
-    
-    # 1. Mapeia cada item para sua categoria {"Item": "Categoria"}
-    item_to_cat = {}
-    for cat, items_list in data.items():
-        for item_pair in items_list:
-            item_name = item_pair[0] # O nome está no índice 0
-            item_to_cat[item_name] = cat
             
-    # 2. Verifica duplicidade de categorias (de trás para frente para manter o último selecionado)
+    # Verifica duplicidade de categorias (de trás para frente para manter o último selecionado)
     seen_cats = set()
     final_list = []
     
@@ -246,41 +248,27 @@ def handle_tag_selection(key: str, data: dict):
         if cat:
             if cat not in seen_cats:
                 seen_cats.add(cat)
-                final_list.insert(0, item) # Adiciona no início para manter ordem original
+                final_list.append(item)
             # Se a categoria já foi vista, ignoramos este item (foi substituído pelo novo)
         else:
             # Se for um item que não está no JSON (segurança), mantém
-            final_list.insert(0, item)
+            final_list.append(item)
             
+    # Desfaz a inversão para manter a ordem original
+    final_list.reverse()
     st.session_state[key] = final_list
 
+@profiler.callback
 def randomize_tags_callback(key: str, data: dict):
     """
     Seleciona aleatoriamente 1 item de categorias variadas (entre 1 a 4 categorias).
     Garante que nunca haja duplicidade de itens da mesma categoria.
+    O resultado é gravado como string separada por vírgula.
     """
- 
-    # 1. Pegamos a lista de todas as categorias disponíveis no JSON
-    categorias_disponiveis = list(data.keys())
-    
-    if categorias_disponiveis:
-        # 2. Sorteamos QUANTAS categorias queremos (ex: de 1 a 4)
-        n_categorias = random.randint(1, min(4, len(categorias_disponiveis)))
-        categorias_sorteadas = random.sample(categorias_disponiveis, k=n_categorias)
-        
-        selecao_final = []
-        
-        # 3. Para cada categoria sorteada, pegamos exatamente UM item
-        for cat in categorias_sorteadas:
-            itens_da_cat = data[cat]
-            if itens_da_cat:
-                escolhido = random.choice(itens_da_cat)
-                # Adicionamos apenas o nome (índice 0)
-                selecao_final.append(escolhido[0])
-        
-        # 4. Atualizamos o estado como String separada por vírgula
-        st.session_state[key] = ", ".join(selecao_final)
+    if data:
+        st.session_state[key] = sampler.sortear_tags(sampler.TabelaCatalogo(data), 1, sampler.gerador())[0]
 
+@profiler.callback
 def clear_tags_callback(key: str):
     """Limpa a seleção e o input manual."""
     st.session_state[key] = []
@@ -289,6 +277,7 @@ def clear_tags_callback(key: str):
     if manual_key in st.session_state:
         st.session_state[manual_key] = ""
 
+@profiler.callback
 def update_categorized_selection(main_key: str, sub_key: str, manual_key: str):
     """
     Callback executado toda vez que uma categoria específica muda.
@@ -320,6 +309,7 @@ def update_categorized_selection(main_key: str, sub_key: str, manual_key: str):
     # Atualiza a lista principal que o gerador usa
     st.session_state[main_key] = final_list
 
+@profiler.callback
 def clear_categorized_callback(main_key: str, prefix: str):
     """Limpa todos os selectboxes daquela seção."""
     # Limpa input manual
@@ -334,6 +324,7 @@ def clear_categorized_callback(main_key: str, prefix: str):
     # Zera a lista principal
     st.session_state[main_key] = []
 
+@profiler.callback
 def random_all_vocals(key: str, data: dict):
     """
     Sorteia aleatoriamente entre Solo Masculino, Solo Feminino ou Dueto.
@@ -342,7 +333,7 @@ def random_all_vocals(key: str, data: dict):
         st.session_state["vocal_masculino"] = ""
         st.session_state["vocal_feminino"] = ""
         
-        modo = random.randint(0, 2)
+        modo = sampler.gerador().integers(0, 3)
         
         if modo == 0: # Solo Masculino
             randomize_tags_callback("vocal_masculino", data)
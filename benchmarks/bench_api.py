@@ -0,0 +1,123 @@
+"""
+Teste de carga local da API HTTP (core/api.py).
+
+Sobe a API num subprocesso (ou usa --url de uma já rodando) e abre
+`--conexoes` clientes asyncio com keep-alive, cada um enviando requisições
+em sequência pela mesma conexão durante `--duracao` segundos. Reporta
+req/s e latências p50/p99 por cenário.
+Uso: python benchmarks/bench_api.py [--conexoes 32] [--duracao 5] [--cenarios prompt catalogo]
+"""
+import argparse
+import asyncio
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.generator import SunoMaestroCore
+
+def _post(caminho, dados):
+    corpo = json.dumps(dados, ensure_ascii=False).encode("utf-8")
+    return ("POST", caminho, corpo)
+
+def montar_cenarios(core):
+    """Cenário -> lista de requisições (método, caminho, corpo) usadas em rodízio pelos clientes."""
+    campos = core.amostrador.amostrar(200, seed=0)
+    return {
+        "saude": [("GET", "/saude", b"")],
+        # Poucas specs distintas: exercita o cache de renderização compartilhado
+        "prompt": [_post("/prompt", {"campos": c}) for c in campos[:20]],
+        "prompt_spec": [_post("/prompt", {"campos": c, "incluir_spec": True}) for c in campos],
+        "lote_50": [_post("/prompts", {"itens": campos[i:i + 50]}) for i in range(0, 200, 50)],
+        "catalogo": [("GET", "/catalogos/tom", b""), ("GET", "/catalogos", b"")],
+        "aleatorio_10": [("GET", "/aleatorio?n=10", b"")],
+    }
+
+def _bruto(host, metodo, caminho, corpo):
+    return (f"{metodo} {caminho} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+            f"Content-Length: {len(corpo)}\r\n\r\n").encode("latin-1") + corpo
+
+async def _cliente(host, porta, requisicoes, fim, latencias, deslocamento):
+    reader, writer = await asyncio.open_connection(host, porta)
+    i = deslocamento
+    try:
+        while time.perf_counter() < fim:
+            t = time.perf_counter()
+            writer.write(requisicoes[i % len(requisicoes)])
+            i += 1
+            cabecalho = await reader.readuntil(b"\r\n\r\n")
+            status = int(cabecalho[9:12])
+            tamanho = next(int(l.split(b":")[1]) for l in cabecalho.split(b"\r\n")
+                           if l.lower().startswith(b"content-length:"))
+            await reader.readexactly(tamanho)
+            if status != 200:
+                raise RuntimeError(f"status {status}")
+            latencias.append(time.perf_counter() - t)
+    finally:
+        writer.close()
+
+async def rodar_cenario(host, porta, requisicoes, conexoes, duracao):
+    """(req/s, p50, p99) com `conexoes` clientes keep-alive durante `duracao` segundos."""
+    brutos = [_bruto(host, m, c, b) for m, c, b in requisicoes]
+    latencias = []
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    await asyncio.gather(*(_cliente(host, porta, brutos, fim, latencias, k) for k in range(conexoes)))
+    total = time.perf_counter() - inicio
+    cortes = statistics.quantiles(latencias, n=100)
+    return len(latencias) / total, cortes[49], cortes[98]
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _aguardar(host, porta, processo, timeout=60):
+    limite = time.monotonic() + timeout
+    while time.monotonic() < limite:
+        if processo is not None and processo.poll() is not None:
+            raise RuntimeError("a API encerrou durante a inicialização")
+        try:
+            socket.create_connection((host, porta), timeout=1).close()
+            return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("a API não respondeu a tempo")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=None, help="API já em execução (ex.: http://127.0.0.1:8765)")
+    parser.add_argument("--conexoes", type=int, default=32)
+    parser.add_argument("--duracao", type=float, default=5.0, help="Segundos por cenário")
+    parser.add_argument("--cenarios", nargs="*", default=None)
+    args = parser.parse_args()
+
+    cenarios = montar_cenarios(SunoMaestroCore(base_path=ROOT))
+    processo = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, porta = url.hostname, url.port or 80
+    else:
+        host, porta = "127.0.0.1", _porta_livre()
+        processo = subprocess.Popen([sys.executable, "-m", "core.api", "--host", host, "--porta", str(porta)],
+                                    cwd=ROOT, stdout=subprocess.DEVNULL)
+    try:
+        _aguardar(host, porta, processo)
+        print(f"{'cenário':<14} {'req/s':>10} {'p50':>10} {'p99':>10}   ({args.conexoes} conexões keep-alive)")
+        for nome in args.cenarios or cenarios:
+            rps, p50, p99 = asyncio.run(rodar_cenario(host, porta, cenarios[nome], args.conexoes, args.duracao))
+            print(f"{nome:<14} {rps:>10,.0f} {p50 * 1000:>7.2f} ms {p99 * 1000:>7.2f} ms", flush=True)
+    finally:
+        if processo is not None:
+            processo.terminate()
+            processo.wait()
+
+if __name__ == "__main__":
+    main()
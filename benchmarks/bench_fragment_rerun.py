@@ -0,0 +1,74 @@
+"""
+Latência de clique nas seções de catálogo: rerun completo x rerun do fragmento.
+
+"Antes" é o tempo do script inteiro após um clique numa tag (o que o
+Streamlit executava sem fragmentos). "Depois" é o tempo de executar só a
+seção clicada, que é o que um rerun de fragmento executa. Ambos medidos no
+servidor com o AppTest do Streamlit (sem navegador/rede).
+Uso: python benchmarks/bench_fragment_rerun.py [--repeticoes 10]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.testing.v1 import AppTest
+
+# Script mínimo que executa só uma seção, como no rerun do fragmento
+SCRIPT_SECAO = """
+import sys
+sys.path.insert(0, {root!r})
+from app import main as app_main, state, components as ui
+state.init_session_state()
+core = app_main.get_core_instance({root!r})
+{chamada}
+"""
+
+# seção: (chamada, prefixo do botão clicado, expander do catálogo a abrir)
+SECOES = {
+    "tags (tom)": ('ui.render_tag_system("Tom", "tom", core.dados["tom"], core.dados["descritivos"], '
+                   'core.indice.itens_categoria["tom"])', "btn_tom_", "exp_cat_tom"),
+    "vocais": ('ui.render_vocal_section("Vocais", "tipo_vocal", core.dados["tipo_vocal"], core.dados["descritivos"], '
+               'core.indice.itens_categoria["tipo_vocal"])', "vbtn_", "exp_cat_vocal"),
+    "vibes": ("app_main.render_vibe_section(core, {})", "tag_v_cat_", "exp_vibes"),
+    "estrutura": ("app_main.render_structure_section(core, {})", "btn_rnd_est", None),
+}
+
+def _clicar(at, prefixo, expander, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        if expander:
+            # O AppTest não devolve o estado dos expanders: reabre a cada rerun
+            at.session_state[expander] = True
+            at.run()
+        botao = next(b for b in at.button if b.key and b.key.startswith(prefixo))
+        if expander:
+            at.session_state[expander] = True
+        t = time.perf_counter()
+        botao.click().run()
+        tempos.append(time.perf_counter() - t)
+    return statistics.median(tempos)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeticoes", type=int, default=10)
+    args = parser.parse_args()
+
+    os.environ.setdefault("SUNO_MAESTRO_HISTORICO", os.path.join(ROOT, "data", "bench_historico.sqlite3"))
+    app = AppTest.from_file(os.path.join(ROOT, "app", "main.py"), default_timeout=60)
+    app.run()
+
+    print(f"{'seção':<12} {'rerun completo':>15} {'fragmento':>12}")
+    for nome, (chamada, prefixo, expander) in SECOES.items():
+        completo = _clicar(app, prefixo, expander, args.repeticoes)
+        secao = AppTest.from_string(SCRIPT_SECAO.format(root=ROOT, chamada=chamada), default_timeout=60)
+        secao.run()
+        fragmento = _clicar(secao, prefixo, expander, args.repeticoes)
+        print(f"{nome:<12} {completo * 1000:>12.1f} ms {fragmento * 1000:>9.1f} ms")
+
+if __name__ == "__main__":
+    main()
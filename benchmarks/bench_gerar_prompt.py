@@ -0,0 +1,125 @@
+"""
+Benchmark de geração de prompts (prompts/seg).
+
+Compara a renderização antiga (normalização + f-string, reconstruída a partir
+do PROMPT_TEMPLATE atual) com o template pré-compilado fora do CACHE_RENDER
+(com e sem o custo de montar a PromptSpec) e com `gerar_prompt`/`gerar_prompts`
+em specs todas distintas (cache frio) e repetidas (cache quente). Acertos e
+falhas do cache são reportados à parte; cada cenário vale a melhor de
+`--repeticoes` rodadas, com o cache esvaziado antes de cada rodada fria.
+
+Com specs distintas o custo é dominado por escrever os ~7 mil caracteres de
+cada prompt, o mesmo da f-string: o lote (`gerar_prompts`, que não passa pelo
+cache) empata com ela ou fica um pouco à frente, e `gerar_prompt` com o cache
+frio fica abaixo dela, pelo custo de montar a PromptSpec e gravar no cache. O
+ganho do cache aparece nos cenários quentes.
+Uso: python benchmarks/bench_gerar_prompt.py [--n 20000] [--distintos 512] [--repeticoes 5]
+"""
+import argparse
+import os
+import sys
+import time
+from string import Formatter
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from core.generator import (AUTOMATIC_INPUT, CACHE_RENDER, PROMPT_TEMPLATE, SunoMaestroCore, _renderizar_spec,
+                            como_spec)
+
+CAMPOS_EXEMPLO = {
+    "genero": "Samba", "ritmo": "Enredo", "estrutura": "[Intro] [Verse] [Chorus]",
+    "tipo_de_gravacao": "Roda de Samba", "influencia_estetica": "Barroco",
+    "vibe_emocional": ["Alegre", "Doce"], "referencia": "",
+    "idioma": "Português (Brasil)", "tema": "Carnaval", "mensagem": "",
+    "palavras_chave": "", "publico": "", "narrador": "Primeira Pessoa",
+    "tom": "Confessional", "vocal_masculino": "Tenor", "vocal_feminino": "",
+}
+
+def _referencia_fstring():
+    """
+    Renderização de antes do template compilado: normaliza o dicionário a cada
+    chamada e monta o texto com uma f-string gerada a partir do PROMPT_TEMPLATE.
+    """
+    corpo = []
+    for literal, campo, _, _ in Formatter().parse(PROMPT_TEMPLATE):
+        corpo.append(literal.replace("\\", "\\\\").replace("{", "{{").replace("}", "}}"))
+        if campo is not None:
+            corpo.append("{vocal_gender}" if campo == "vocal_gender" else
+                         "{v_masc}" if campo == "vocal_masculino" else
+                         "{v_fem}" if campo == "vocal_feminino" else f"{{d.get({campo!r})}}")
+    fonte = f'''def gerar_prompt(campos):
+    d = {{}}
+    for k, v in campos.items():
+        if isinstance(v, list):
+            val = ", ".join(filter(None, v))
+            d[k] = val if val.strip() else AUTOMATIC_INPUT
+        else:
+            val = str(v).strip() if v else ""
+            d[k] = val if val else AUTOMATIC_INPUT
+    v_masc = d.get("vocal_masculino", AUTOMATIC_INPUT)
+    v_fem = d.get("vocal_feminino", AUTOMATIC_INPUT)
+    has_masc, has_fem = v_masc != AUTOMATIC_INPUT, v_fem != AUTOMATIC_INPUT
+    if has_masc and has_fem:
+        vocal_gender = "Duet"
+    elif has_masc:
+        vocal_gender = "Male Solo"
+    elif has_fem:
+        vocal_gender = "Female Solo"
+    else:
+        vocal_gender = AUTOMATIC_INPUT
+    return f"""{"".join(corpo)}"""
+'''
+    escopo = {"AUTOMATIC_INPUT": AUTOMATIC_INPUT}
+    exec(compile(fonte, "<referencia_fstring>", "exec"), escopo)
+    return escopo["gerar_prompt"]
+
+def medir(nome, func, n, repeticoes, preparar=None):
+    """Melhor de `repeticoes` rodadas; `preparar` roda antes de cada uma, fora do tempo medido."""
+    duracao = float("inf")
+    acertos = falhas = 0
+    for _ in range(repeticoes):
+        if preparar:
+            preparar()
+        antes = CACHE_RENDER.estatisticas()
+        inicio = time.perf_counter()
+        func()
+        duracao = min(duracao, time.perf_counter() - inicio)
+        depois = CACHE_RENDER.estatisticas()
+        acertos, falhas = (depois[k] - antes[k] for k in ("acertos", "falhas"))
+    cache = f"{acertos:>9,} {falhas:>9,}" if acertos or falhas else f"{'-':>9} {'-':>9}"
+    print(f"{nome:<30} {n / duracao:>12,.0f} {duracao:>8.3f}s {cache}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=20_000)
+    parser.add_argument("--distintos", type=int, default=512, help="Specs distintas no cenário de cache quente")
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    core = SunoMaestroCore(base_path=ROOT)
+    referencia = _referencia_fstring()
+    lote = [dict(CAMPOS_EXEMPLO, tema=f"Tema {i}") for i in range(args.n)]
+    repetidos = [lote[i % args.distintos] for i in range(args.n)]
+    # Mesma saída byte a byte para dicionários completos
+    assert referencia(lote[0]) == _renderizar_spec(como_spec(lote[0]))
+
+    print(f"{'cenário':<30} {'prompts/s':>12} {'tempo':>9} {'acertos':>9} {'falhas':>9}")
+    rodadas = args.n, args.repeticoes
+    medir("f-string (antes)", lambda: [referencia(c) for c in lote], *rodadas)
+    medir("compilado, sem cache", lambda: [_renderizar_spec(como_spec(c)) for c in lote], *rodadas)
+    specs = [como_spec(c) for c in lote]
+    medir("compilado, spec pronta", lambda: [_renderizar_spec(s) for s in specs], *rodadas)
+    del specs
+
+    medir("gerar_prompt, cache frio", lambda: [core.gerar_prompt(c) for c in lote], *rodadas, CACHE_RENDER.limpar)
+    medir("gerar_prompts, cache frio", lambda: core.gerar_prompts(lote), *rodadas, CACHE_RENDER.limpar)
+
+    CACHE_RENDER.limpar()
+    for c in repetidos[:args.distintos]:
+        core.gerar_prompt(c)
+    medir(f"gerar_prompt, quente ({args.distintos})", lambda: [core.gerar_prompt(c) for c in repetidos], *rodadas)
+    medir(f"gerar_prompts, repetidas ({args.distintos})", lambda: core.gerar_prompts(repetidos), *rodadas)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Mede a memória do histórico de uma sessão: entradas com o prompt completo
+(formato antigo) contra a spec compacta (campos normalizados + versão + ts),
+e o custo de re-renderizar o texto de uma entrada quando ela é aberta (com o
+CACHE_RENDER vazio, e à parte o de reabrir uma entrada que já está no cache).
+Uso: python benchmarks/bench_history_memory.py [--entradas 200] [--seed 0]
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.generator import CACHE_RENDER, SunoMaestroCore, TEMPLATE_VERSION, normalizar_campos
+
+def entrada_completa(core, campos):
+    agora = datetime.now()
+    return {
+        "titulo": f"{agora.strftime('%H:%M')} | {campos['genero']} - {campos['tema']}"[:40],
+        "conteudo": core.gerar_prompt(campos),
+        "data": agora.strftime("%d/%m/%Y %H:%M"),
+    }
+
+def entrada_compacta(_core, campos):
+    return {"campos": normalizar_campos(campos), "versao": TEMPLATE_VERSION, "ts": time.time()}
+
+def medir(fabrica, core, lista_campos):
+    """Bytes alocados (tracemalloc) pelo histórico montado com `fabrica`."""
+    tracemalloc.start()
+    inicio = tracemalloc.get_traced_memory()[0]
+    historico = [fabrica(core, campos) for campos in lista_campos]
+    total = tracemalloc.get_traced_memory()[0] - inicio
+    tracemalloc.stop()
+    return historico, total
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--entradas", type=int, default=200)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    core = SunoMaestroCore(base_path=ROOT)
+    lista_campos = core.amostrador.amostrar(args.entradas, seed=args.seed)
+    for i, campos in enumerate(lista_campos):
+        campos.update(idioma="Português", tema=f"Tema {i}", mensagem="Uma mensagem curta sobre o tema")
+
+    for nome, fabrica in (("prompt completo", entrada_completa), ("spec compacta", entrada_compacta)):
+        _, total = medir(fabrica, core, lista_campos)
+        print(f"{nome:<16} {total / 1024:>9.1f} KB   {total / args.entradas:>7.0f} B/entrada")
+
+    historico, _ = medir(entrada_compacta, core, lista_campos)
+    # "prompt completo" já renderizou estas specs: sem limpar, só mediríamos acertos do cache
+    CACHE_RENDER.limpar()
+    for rotulo in ("re-render por entrada aberta", "reabrir entrada em cache"):
+        t = time.perf_counter()
+        for item in historico:
+            core.gerar_prompt(item["campos"])
+        dt = (time.perf_counter() - t) / len(historico)
+        print(f"{rotulo + ':':<30} {dt * 1e6:.1f} µs")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Vazão do envio de prompts à LLM (core/llm.py) contra o mock local.
+
+Sobe o MockLLM no mesmo event loop e envia `--n` prompts gerados pelo core
+em cada nível de concorrência, com streaming e pool de conexões. O nível 1
+equivale ao envio sequencial (um prompt por vez, como o copiar/colar
+manual) e usa só `--n-sequencial` prompts. Com `--taxa-erro` o mock injeta
+429/500 e o relatório mostra as novas tentativas. Com `--validar` as
+respostas passam pelo core/output.py durante o stream; `--taxa-invalida`
+faz o mock quebrar o formato e o relatório mostra as violações, cada uma
+interrompida no meio da resposta e refeita.
+Uso: python benchmarks/bench_llm_dispatch.py [--n 128] [--concorrencias 1 8 32 128] [--taxa-erro 0.05]
+                                             [--validar] [--taxa-invalida 0.2]
+"""
+import argparse
+import asyncio
+import os
+import socket
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.mock_llm import MockLLM, servir
+from core.generator import SunoMaestroCore
+from core.llm import ClienteLLM, despachar
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def rodar(prompts, args):
+    porta = _porta_livre()
+    mock = MockLLM(args.ttft, args.atraso_trecho, args.taxa_erro, seed=0, taxa_invalida=args.taxa_invalida)
+    pronto = asyncio.Event()
+    servidor = asyncio.create_task(servir(mock, "127.0.0.1", porta, pronto))
+    await pronto.wait()
+    print(f"{'concorrência':>12} {'prompts':>8} {'prompts/s':>10} {'p50':>9} {'p99':>9} {'erros':>6} {'repetições':>11} {'violações':>10}")
+    try:
+        for concorrencia in args.concorrencias:
+            lote = prompts[:args.n_sequencial] if concorrencia == 1 else prompts
+            cliente = ClienteLLM(f"http://127.0.0.1:{porta}/v1", "mock", max_conexoes=concorrencia,
+                                 backoff_base=0.05)
+            inicio = time.perf_counter()
+            resultados = await despachar(cliente, lote, concorrencia, validar=args.validar)
+            total = time.perf_counter() - inicio
+            await cliente.fechar()
+            # Deixa o mock ver o fim das conexões antes do próximo nível
+            await asyncio.sleep(0.05)
+            tempos = sorted(r.segundos for r in resultados)
+            cortes = statistics.quantiles(tempos, n=100) if len(tempos) > 1 else tempos * 99
+            print(f"{concorrencia:>12} {len(lote):>8} {len(lote) / total:>10.1f} {cortes[49]:>8.2f}s "
+                  f"{cortes[98]:>8.2f}s {sum(1 for r in resultados if r.erro):>6} "
+                  f"{cliente.contadores['novas_tentativas']:>11} {cliente.contadores['violacoes']:>10}", flush=True)
+    finally:
+        servidor.cancel()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--n", type=int, default=128, help="Prompts por nível de concorrência")
+    parser.add_argument("--n-sequencial", type=int, default=8, help="Prompts no nível 1 (sequencial)")
+    parser.add_argument("--concorrencias", nargs="*", type=int, default=[1, 8, 32, 128])
+    parser.add_argument("--ttft", type=float, default=0.2)
+    parser.add_argument("--atraso-trecho", type=float, default=0.002)
+    parser.add_argument("--taxa-erro", type=float, default=0.0)
+    parser.add_argument("--validar", action="store_true", help="Valida o formato das respostas durante o stream")
+    parser.add_argument("--taxa-invalida", type=float, default=0.0, help="Fração de respostas fora do formato")
+    args = parser.parse_args()
+
+    core = SunoMaestroCore(base_path=ROOT)
+    prompts = core.gerar_prompts(core.amostrador.amostrar(args.n, seed=0))
+    asyncio.run(rodar(prompts, args))
+
+if __name__ == "__main__":
+    main()
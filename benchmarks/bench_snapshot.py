@@ -0,0 +1,51 @@
+"""
+Compara a carga do dataset pelos JSONs com a carga pelo snapshot binário.
+
+Mede tempo (mediana) e pico de memória (tracemalloc) de `CatalogoLoader.carregar`
+nos dois caminhos. O snapshot é (re)gerado num diretório temporário.
+Uso: python benchmarks/bench_snapshot.py [--repeticoes 50]
+"""
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(ROOT)
+
+from core import snapshot
+from core.dataset import ARQUIVOS_MAP, CatalogoLoader
+
+def medir(nome, criar_loader, repeticoes):
+    tempos = []
+    for _ in range(repeticoes):
+        loader = criar_loader()
+        inicio = time.perf_counter()
+        loader.carregar()
+        tempos.append(time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    criar_loader().carregar()
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{nome:<10} {statistics.median(tempos) * 1000:>8.2f} ms   pico {pico / 1024:>8.1f} KB")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeticoes", type=int, default=50)
+    args = parser.parse_args()
+
+    dataset_dir = os.path.join(ROOT, "dataset")
+    with tempfile.TemporaryDirectory() as tmp:
+        caminho = os.path.join(tmp, snapshot.NOME_ARQUIVO)
+        snapshot.construir(dataset_dir, ARQUIVOS_MAP, caminho)
+        print(f"snapshot: {os.path.getsize(caminho) / 1024:.1f} KB")
+
+        medir("json", lambda: CatalogoLoader(dataset_dir, ARQUIVOS_MAP), args.repeticoes)
+        medir("snapshot", lambda: CatalogoLoader(dataset_dir, ARQUIVOS_MAP, snapshot_path=caminho), args.repeticoes)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""
+Mede o tempo de importação e a memória (RSS máx.) de um processo novo.
+
+Compara o core sozinho (só stdlib) com o core + streamlit, que era o custo
+pago por qualquer consumidor antes de o cache virar um adaptador opcional.
+Uso: python benchmarks/bench_startup.py [--repeticoes 5]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CENARIOS = {
+    "core (stdlib)": "import core.generator",
+    "core + streamlit": "import streamlit; import core.generator",
+}
+
+CODIGO_FILHO = """
+import resource, time
+t = time.perf_counter()
+{imports}
+from core.generator import SunoMaestroCore
+SunoMaestroCore(base_path={root!r})
+print(time.perf_counter() - t, resource.getrusage(resource.RUSAGE_SELF).ru_maxrss)
+"""
+
+def medir(imports, repeticoes):
+    tempos, memorias = [], []
+    codigo = CODIGO_FILHO.format(imports=imports, root=ROOT)
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, "-c", codigo], cwd=ROOT,
+                               capture_output=True, text=True, check=True).stdout
+        tempo, rss_kb = saida.split()
+        tempos.append(float(tempo))
+        memorias.append(int(rss_kb))
+    return statistics.median(tempos), statistics.median(memorias)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    args = parser.parse_args()
+
+    for nome, imports in CENARIOS.items():
+        tempo, rss_kb = medir(imports, args.repeticoes)
+        print(f"{nome:<20} {tempo * 1000:>8.1f} ms   {rss_kb / 1024:>7.1f} MB RSS")
+
+if __name__ == "__main__":
+    main()
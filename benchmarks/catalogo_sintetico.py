@@ -0,0 +1,181 @@
+"""
+Gerador de catálogos sintéticos para testes de carga.
+
+Escreve versões de todos os arquivos do dataset (01_genero_ritmo.json a
+12_afinidade.json) no mesmo formato dos distribuídos, em escala configurável:
+quantidade de categorias, itens por categoria e tamanho das descrições.
+Com a mesma seed a saída é idêntica byte a byte.
+
+Por padrão cada catálogo tem o formato médio do dataset distribuído
+multiplicado por `--escala` no número de categorias (gêneros, no caso da
+hierarquia); `--itens` e `--palavras-descricao` sobrescrevem as médias.
+Uso:
+    python benchmarks/catalogo_sintetico.py -o /tmp/sintetico --escala 100 --seed 7
+"""
+import argparse
+import json
+import os
+import random
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.dataset import ARQUIVOS_MAP, CATALOGOS_NOMES, validar_catalogo
+from core.generator import CAMPOS_PROMPT
+
+# Formato médio do dataset distribuído: (categorias, itens por categoria, palavras na descrição)
+FORMATO_BASE = {
+    "hierarquia": (25, 9, 5),
+    "tipo_de_gravacao": (4, 9, 0),
+    "influencia_estetica": (6, 14, 5),
+    "vibe_emocional": (8, 22, 0),
+    "publico": (5, 8, 0),
+    "tom": (7, 9, 5),
+    "narrador": (6, 9, 0),
+    "metatags": (3, 5, 10),
+    "tipo_vocal": (7, 8, 4),
+}
+# Categorias de metatags usadas pela UI (render_structure_section)
+CATEGORIAS_METATAGS = ["Estrutura_Principal", "Secoes_Instrumentais_e_Dinamicas", "Finalizacao_e_Transicao_Sonora"]
+SECOES_ESTRUTURA = ["Intro", "Verse", "Pre-Chorus", "Chorus", "Bridge", "Solo", "Breakdown", "Outro"]
+# Sílabas com acentos para exercitar a normalização da busca
+SILABAS = ["ba", "ca", "da", "fe", "ga", "la", "ma", "na", "pa", "ra", "sa", "ta", "va", "xo", "zu",
+           "ção", "são", "lé", "mô", "tí", "rú", "nha", "lha", "que", "gui", "bra", "tre", "flo", "cri", "pã"]
+
+class GeradorCatalogo:
+    def __init__(self, seed=0, escala=1, itens=None, palavras_descricao=None):
+        self.rng = random.Random(seed)
+        self.escala = escala
+        self.itens = itens
+        self.palavras_descricao = palavras_descricao
+
+    def palavra(self):
+        return "".join(self.rng.choice(SILABAS) for _ in range(self.rng.randint(2, 4)))
+
+    def nome(self, usados):
+        """Nome de 1 a 3 palavras, único dentro de `usados`."""
+        while True:
+            nome = " ".join(self.palavra() for _ in range(self.rng.randint(1, 3))).title()
+            if nome not in usados:
+                usados.add(nome)
+                return nome
+
+    def descricao(self, palavras):
+        n = max(1, int(self.rng.gauss(palavras, palavras / 4)))
+        texto = " ".join(self.palavra() for _ in range(n))
+        return texto[0].upper() + texto[1:]
+
+    def _formato(self, chave):
+        categorias, itens, palavras = FORMATO_BASE[chave]
+        return (categorias * self.escala, self.itens or itens,
+                palavras if self.palavras_descricao is None or not palavras else self.palavras_descricao)
+
+    def _quantidade(self, media):
+        # Variação de ±50% em torno da média, como no dataset real
+        return max(1, self.rng.randint(media - media // 2, media + media // 2))
+
+    def catalogo(self, chave, categorias=None):
+        """{categoria: [itens]} com nomes simples ou pares [nome, descrição] conforme o catálogo."""
+        n_cat, n_itens, palavras = self._formato(chave)
+        usados_cat, usados = set(), set()
+        categorias = categorias or [self.nome(usados_cat) for _ in range(n_cat)]
+        dados = {}
+        for cat in categorias:
+            nomes = [self.nome(usados) for _ in range(self._quantidade(n_itens))]
+            if chave in CATALOGOS_NOMES or chave == "vibe_emocional":
+                dados[cat] = nomes
+            else:
+                dados[cat] = [[n, self.descricao(palavras)] for n in nomes]
+        return dados
+
+    def hierarquia(self):
+        n_gen, n_rit, _ = self._formato("hierarquia")
+        usados_gen, usados = set(), set()
+        dados = {}
+        for _ in range(n_gen):
+            genero = self.nome(usados_gen)
+            ritmos = []
+            for _ in range(self._quantidade(n_rit)):
+                secoes = self.rng.choices(SECOES_ESTRUTURA, k=self.rng.randint(3, 8))
+                ritmos.append([self.nome(usados), " ".join(f"[{s}]" for s in secoes)])
+            dados[genero] = ritmos
+        return dados
+
+    def metatags(self):
+        n_cat, _, _ = self._formato("metatags")
+        extras = [f"Metatags_{i}" for i in range(len(CATEGORIAS_METATAGS), n_cat)]
+        dados = self.catalogo("metatags", CATEGORIAS_METATAGS + extras)
+        # Nomes de metatags vêm entre colchetes: "[Verse]"
+        return {cat: [[f"[{n}]", d] for n, d in itens] for cat, itens in dados.items()}
+
+    def ajuda(self):
+        return {
+            "geral": [["titulo", "Catálogo sintético"], ["descricao", self.descricao(30)],
+                      ["campos_em_branco", self.descricao(30)]],
+            "campos": [[campo, self.descricao(15)] for campo in CAMPOS_PROMPT],
+        }
+
+    def descritivos(self, dados):
+        fontes = {"Estetica_Musical": "influencia_estetica", "Tom_Lirico": "tom", "Tipos_de_Vocais": "tipo_vocal"}
+        return {nome: [[cat, self.descricao(15)] for cat in dados[chave]] for nome, chave in fontes.items()}
+
+    def afinidade(self, dados, fracao=0.3):
+        """Pesos para uma fração dos gêneros sobre algumas categorias e itens de cada catálogo."""
+        alvos = ("tipo_de_gravacao", "influencia_estetica", "vibe_emocional", "tom")
+        tabela = {}
+        for genero in dados["hierarquia"]:
+            if self.rng.random() >= fracao:
+                continue
+            regras = {}
+            for chave in self.rng.sample(alvos, 2):
+                catalogo = dados[chave]
+                cat = self.rng.choice(list(catalogo))
+                item = self.rng.choice(catalogo[self.rng.choice(list(catalogo))])
+                nome = item[0] if isinstance(item, list) else item
+                regras[chave] = {cat: self.rng.choice([0, 0.5, 2]), nome: self.rng.choice([0, 0.1, 3])}
+            tabela[genero] = regras
+        return tabela
+
+    def gerar(self):
+        """Todos os catálogos, por chave de ARQUIVOS_MAP."""
+        dados = {"hierarquia": self.hierarquia()}
+        for chave in ("tipo_de_gravacao", "influencia_estetica", "vibe_emocional", "publico",
+                      "tom", "narrador", "tipo_vocal"):
+            dados[chave] = self.catalogo(chave)
+        dados["metatags"] = self.metatags()
+        dados["help"] = self.ajuda()
+        dados["descritivos"] = self.descritivos(dados)
+        dados["afinidade"] = self.afinidade(dados)
+        return dados
+
+def escrever(destino, dados):
+    """Valida e grava os catálogos em `destino` (o diretório dataset/ de uma base do core)."""
+    erros = [e for chave in ARQUIVOS_MAP for e in validar_catalogo(chave, dados[chave])]
+    if erros:
+        raise ValueError("\n".join(erros))
+    os.makedirs(destino, exist_ok=True)
+    for chave, nome in ARQUIVOS_MAP.items():
+        with open(os.path.join(destino, nome), "w", encoding="utf-8") as f:
+            json.dump(dados[chave], f, ensure_ascii=False, indent=1)
+
+def gerar_base(destino, seed=0, escala=1, **kwargs):
+    """Gera uma base completa (`destino/dataset`) utilizável com SunoMaestroCore(destino)."""
+    escrever(os.path.join(destino, "dataset"), GeradorCatalogo(seed, escala, **kwargs).gerar())
+    return destino
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera um dataset sintético no formato do Suno Maestro.")
+    parser.add_argument("-o", "--saida", required=True, help="Diretório base (os JSONs vão em <saida>/dataset)")
+    parser.add_argument("--escala", type=int, default=1, help="Multiplicador do número de categorias")
+    parser.add_argument("--itens", type=int, default=None, help="Itens por categoria (média)")
+    parser.add_argument("--palavras-descricao", type=int, default=None, help="Palavras por descrição (média)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    gerar_base(args.saida, seed=args.seed, escala=args.escala, itens=args.itens,
+               palavras_descricao=args.palavras_descricao)
+    print(f"Dataset sintético gravado em {os.path.join(args.saida, 'dataset')}")
+
+if __name__ == "__main__":
+    main()
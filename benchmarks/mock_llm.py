@@ -0,0 +1,155 @@
+"""
+Servidor local compatível com `POST /v1/chat/completions` da OpenAI, para
+testes e benchmarks do core/llm.py sem chamar um modelo de verdade.
+
+Responde com uma composição no formato pedido pelo template (# Title,
+# Lyrics, # Prompt for Suno), em streaming SSE (chunked) ou numa única
+resposta JSON, com latência configurável antes do primeiro trecho e entre
+trechos. Uma fração das requisições pode falhar com 429/500 para exercitar
+as novas tentativas do cliente, e outra pode vir fora do formato (marcação
+instrumental longa demais no meio da letra) para exercitar a validação.
+Uso: python benchmarks/mock_llm.py --porta 8766 [--ttft 0.2] [--atraso-trecho 0.01] [--taxa-erro 0.05]
+                                  [--taxa-invalida 0.1]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from core.api import ErroHTTP, _ler_requisicao, _manter_conexao
+
+SEPARADOR = "─" * 45
+
+def composicao(rng, invalida=False):
+    """Resposta de exemplo que segue o contrato de saída do template (ou o quebra, com `invalida`)."""
+    instrumentos = ["soft acoustic guitar", "warm upright bass", "brushed snare", "rhodes piano",
+                    "airy string pads", "light shaker groove", "muted trumpet line", "deep sub-bass pulse"]
+    secoes = []
+    for nome in ("Intro", "Verse 1", "Chorus", "Verse 2", "Bridge", "Chorus", "Outro"):
+        fontes = rng.sample(instrumentos, 6 if invalida and nome == "Bridge" else 3)
+        marcacao = f"[{nome}: {', '.join(fontes)}, gentle tape saturation]"
+        versos = [" ".join(rng.choice(["luz", "mar", "noite", "canção", "saudade", "vento", "estrada", "sol"])
+                           for _ in range(rng.randint(5, 8))).capitalize() for _ in range(4)]
+        secoes.append("\n".join([marcacao, *versos]))
+    prompt = ("Warm Brazilian acoustic pop at ~92 BPM in 4/4, key of D major, built on fingerpicked nylon guitar "
+              "and upright bass. Brushed drums and a light shaker keep a relaxed groove while rhodes chords "
+              "and airy strings widen the stereo field in the choruses. An intimate baritone vocal sits "
+              "front and center with subtle plate reverb, rising to an open, emotional climax before a "
+              "soft fade-out.")
+    return "\n".join(["# Title", "Luz da Estrada", SEPARADOR, "# Lyrics", "\n\n".join(secoes), SEPARADOR,
+                      "# Prompt for Suno", prompt])
+
+def _trechos(texto, rng):
+    """Divide o texto em trechos de 1 a 4 palavras, como os tokens de um stream."""
+    palavras = texto.split(" ")
+    i = 0
+    while i < len(palavras):
+        n = rng.randint(1, 4)
+        yield " ".join(palavras[i:i + n]) + (" " if i + n < len(palavras) else "")
+        i += n
+
+def _chunk(dados):
+    return f"{len(dados):x}\r\n".encode("latin-1") + dados + b"\r\n"
+
+def _evento(modelo, texto=None, fim=False):
+    delta = {"content": texto} if texto is not None else {}
+    corpo = {"object": "chat.completion.chunk", "created": int(time.time()), "model": modelo,
+             "choices": [{"index": 0, "delta": delta, "finish_reason": "stop" if fim else None}]}
+    return f"data: {json.dumps(corpo, ensure_ascii=False)}\n\n".encode("utf-8")
+
+class MockLLM:
+    def __init__(self, ttft=0.2, atraso_trecho=0.01, taxa_erro=0.0, seed=None, taxa_invalida=0.0):
+        self.ttft, self.atraso_trecho, self.taxa_erro = ttft, atraso_trecho, taxa_erro
+        self.taxa_invalida = taxa_invalida
+        self.rng = random.Random(seed)
+        self.contadores = dict.fromkeys(("requisicoes", "erros_injetados", "respostas_invalidas"), 0)
+
+    async def _responder(self, writer, corpo, manter):
+        self.contadores["requisicoes"] += 1
+        pedido = json.loads(corpo or b"{}")
+        modelo = pedido.get("model", "mock")
+        conexao = f"Connection: {'keep-alive' if manter else 'close'}\r\n"
+        if self.rng.random() < self.taxa_erro:
+            self.contadores["erros_injetados"] += 1
+            status = self.rng.choice([429, 500])
+            erro = json.dumps({"error": {"message": "erro injetado pelo mock"}}).encode("utf-8")
+            writer.write((f"HTTP/1.1 {status} Erro\r\nContent-Type: application/json\r\nRetry-After: 0\r\n"
+                          f"Content-Length: {len(erro)}\r\n{conexao}\r\n").encode("latin-1") + erro)
+            return
+        await asyncio.sleep(self.ttft)
+        invalida = self.rng.random() < self.taxa_invalida
+        self.contadores["respostas_invalidas"] += invalida
+        texto = composicao(self.rng, invalida)
+        if not pedido.get("stream"):
+            resposta = json.dumps({"object": "chat.completion", "model": modelo, "choices": [
+                {"index": 0, "message": {"role": "assistant", "content": texto}, "finish_reason": "stop"}]},
+                ensure_ascii=False).encode("utf-8")
+            writer.write((f"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                          f"Content-Length: {len(resposta)}\r\n{conexao}\r\n").encode("latin-1") + resposta)
+            return
+        writer.write((f"HTTP/1.1 200 OK\r\nContent-Type: text/event-stream\r\n"
+                      f"Transfer-Encoding: chunked\r\n{conexao}\r\n").encode("latin-1"))
+        for trecho in _trechos(texto, self.rng):
+            writer.write(_chunk(_evento(modelo, trecho)))
+            await writer.drain()
+            if self.atraso_trecho:
+                await asyncio.sleep(self.atraso_trecho)
+        writer.write(_chunk(_evento(modelo, fim=True) + b"data: [DONE]\n\n") + b"0\r\n\r\n")
+
+    async def atender(self, reader, writer):
+        try:
+            while True:
+                try:
+                    requisicao = await _ler_requisicao(reader)
+                except ErroHTTP:
+                    return
+                if requisicao is None:
+                    return
+                metodo, alvo, versao, cabecalhos, corpo = requisicao
+                manter = _manter_conexao(versao, cabecalhos)
+                if metodo != "POST" or not alvo.rstrip("/").endswith("/chat/completions"):
+                    writer.write(b"HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n")
+                else:
+                    await self._responder(writer, corpo, manter)
+                await writer.drain()
+                if not manter:
+                    return
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+async def servir(mock, host="127.0.0.1", porta=8766, pronto=None):
+    """Atende até ser cancelado; `pronto` (asyncio.Event) é sinalizado ao começar a escutar."""
+    servidor = await asyncio.start_server(mock.atender, host, porta, reuse_address=True)
+    if pronto is not None:
+        pronto.set()
+    async with servidor:
+        await servidor.serve_forever()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8766)
+    parser.add_argument("--ttft", type=float, default=0.2, help="Segundos até o primeiro trecho")
+    parser.add_argument("--atraso-trecho", type=float, default=0.01, help="Segundos entre trechos")
+    parser.add_argument("--taxa-erro", type=float, default=0.0, help="Fração de respostas 429/500")
+    parser.add_argument("--taxa-invalida", type=float, default=0.0, help="Fração de respostas fora do formato")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    print(f"Mock LLM em http://{args.host}:{args.porta}/v1")
+    mock = MockLLM(args.ttft, args.atraso_trecho, args.taxa_erro, args.seed, args.taxa_invalida)
+    try:
+        asyncio.run(servir(mock, args.host, args.porta))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
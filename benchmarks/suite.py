@@ -0,0 +1,271 @@
+"""
+Suíte de micro-benchmarks dos caminhos quentes do core e do app/state.
+
+Cada caso roda em datasets escalados (1×, 10×, 100× o número de categorias
+de cada catálogo) e, quando depende do histórico, em 10 / 1.000 / 10.000
+entradas. Os callbacks de `app/state.py` rodam sem servidor, sobre uma
+sessão falsa (SessaoFake) no lugar de `st.session_state`. Com `--sintetico`,
+as escalas usam catálogos gerados por `catalogo_sintetico.py` (nomes e
+descrições novos, com a seed dada) em vez de réplicas do dataset distribuído.
+
+Os resultados são gravados em JSON (com o commit atual) e podem ser
+comparados com uma execução anterior:
+    python benchmarks/suite.py -o antes.json
+    python benchmarks/suite.py -o depois.json --comparar antes.json
+    python benchmarks/suite.py --casos gerar_prompt restaurar_spec --escalas 1 10
+    python benchmarks/suite.py --sintetico 7 --escalas 100 1000
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import types
+from datetime import datetime
+from itertools import cycle
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from app import profiler, state
+from benchmarks import catalogo_sintetico
+from core import export, snapshot
+from core.dataset import ARQUIVOS_MAP, CatalogoLoader
+from core.generator import TAMANHO_CACHE_RENDER, SunoMaestroCore
+from core.history import HistoricoSQLite, novo_item
+
+ESCALAS = (1, 10, 100)
+HISTORICOS = (10, 1_000, 10_000)
+# Catálogos que não são {categoria: [itens]} com nomes a replicar
+NAO_ESCALAVEIS = {"help", "afinidade"}
+
+class SessaoFake(dict):
+    """Substituto de st.session_state: dicionário com acesso também por atributo."""
+
+    def __getattr__(self, nome):
+        try:
+            return self[nome]
+        except KeyError:
+            raise AttributeError(nome) from None
+
+    def __setattr__(self, nome, valor):
+        self[nome] = valor
+
+def usar_sessao_fake():
+    """Aponta o `st` de app.state e app.profiler para um stand-in sem servidor."""
+    sessao = SessaoFake()
+    fake = types.SimpleNamespace(session_state=sessao, toast=lambda *a, **k: None)
+    state.st = profiler.st = fake
+    state.init_session_state()
+    return sessao
+
+def _sufixo(nome, k):
+    return nome if k == 0 else f"{nome} #{k}"
+
+def escalar_catalogo(catalogo, fator):
+    """Replica cada categoria `fator` vezes, com sufixo nos nomes de categorias e itens."""
+    novo = {}
+    for k in range(fator):
+        for cat, itens in catalogo.items():
+            novo[_sufixo(cat, k)] = [[_sufixo(i[0], k), *i[1:]] if isinstance(i, list) else _sufixo(i, k)
+                                     for i in itens]
+    return novo
+
+def escrever_dataset_escalado(fator, destino):
+    """Escreve em `destino/dataset` a versão escalada do dataset distribuído e retorna a base."""
+    dataset_dir = os.path.join(destino, "dataset")
+    os.makedirs(dataset_dir, exist_ok=True)
+    for chave, nome in ARQUIVOS_MAP.items():
+        with open(os.path.join(ROOT, "dataset", nome), encoding="utf-8") as f:
+            dados = json.load(f)
+        if chave not in NAO_ESCALAVEIS:
+            dados = escalar_catalogo(dados, fator)
+        with open(os.path.join(dataset_dir, nome), "w", encoding="utf-8") as f:
+            json.dump(dados, f, ensure_ascii=False)
+    return destino
+
+def medir(fn, repeticoes):
+    """(mediana, mínimo) do tempo por chamada, com o número de chamadas calibrado pelo timeit."""
+    timer = timeit.Timer(fn)
+    numero, _ = timer.autorange()
+    tempos = [t / numero for t in timer.repeat(repeat=repeticoes, number=numero)]
+    return statistics.median(tempos), min(tempos), numero
+
+def _campos(core, n, seed=0):
+    lista = core.amostrador.amostrar(n, seed=seed)
+    for i, campos in enumerate(lista):
+        campos.update(idioma="Português (Brasil)", tema=f"Tema {i}", mensagem="Mensagem de teste")
+    return lista
+
+# --- CASOS ---
+# Cada caso recebe o contexto da escala (e o tamanho do histórico, se usar)
+# e retorna a função a ser cronometrada.
+
+def caso_gerar_prompt(ctx):
+    # Percorre em ciclo o dobro de specs que cabem no CACHE_RENDER: no LRU cada
+    # spec sai antes de voltar, então toda chamada é uma renderização a frio
+    proximo = cycle(_campos(ctx["core"], 2 * TAMANHO_CACHE_RENDER)).__next__
+    return lambda: ctx["core"].gerar_prompt(proximo())
+
+def caso_gerar_prompt_cache(ctx):
+    campos = _campos(ctx["core"], 1)[0]
+    return lambda: ctx["core"].gerar_prompt(campos)
+
+def caso_carregar_dataset_json(ctx):
+    base = ctx["base"]
+    dataset_dir = os.path.join(base, "dataset")
+    return lambda: CatalogoLoader(dataset_dir, dict(ARQUIVOS_MAP)).carregar()
+
+def caso_carregar_dataset_snapshot(ctx):
+    dataset_dir = os.path.join(ctx["base"], "dataset")
+    caminho = os.path.join(ctx["tmp"], "dataset.snapshot")
+    snapshot.construir(dataset_dir, ARQUIVOS_MAP, caminho)
+    return lambda: CatalogoLoader(dataset_dir, dict(ARQUIVOS_MAP), snapshot_path=caminho).carregar()
+
+def caso_random_all(ctx):
+    core = ctx["core"]
+    usar_sessao_fake()
+    return lambda: state.random_all(core)
+
+def caso_handle_tag_selection(ctx):
+    core = ctx["core"]
+    sessao = usar_sessao_fake()
+    item_cat = core.indice.item_categoria["tom"]
+    # Seleção com várias tags de categorias repetidas (o pior caso do filtro)
+    selecao = list(item_cat)[:: max(1, len(item_cat) // 50)]
+    def rodar():
+        sessao["tom"] = list(selecao)
+        state.handle_tag_selection("tom", item_cat)
+    return rodar
+
+def caso_update_categorized_selection(ctx):
+    core = ctx["core"]
+    sessao = usar_sessao_fake()
+    for cat, itens in core.dados["tom"].items():
+        sessao[f"tom_CAT_{cat}"] = itens[0]
+    sessao["tom_manual_input"] = "Manual"
+    return lambda: state.update_categorized_selection("tom", "tom_CAT_", "tom_manual_input")
+
+def caso_restaurar_spec(ctx):
+    usar_sessao_fake()
+    texto = ctx["core"].gerar_prompt(_campos(ctx["core"], 1)[0], incluir_spec=True)
+    return lambda: state.callback_restaurar(texto)
+
+def caso_restaurar_legado(ctx):
+    usar_sessao_fake()
+    texto = ctx["core"].gerar_prompt(_campos(ctx["core"], 1)[0])
+    return lambda: state.callback_restaurar(texto)
+
+def _historico(ctx, n):
+    historico = HistoricoSQLite(os.path.join(ctx["tmp"], f"historico_{n}.sqlite3"))
+    if not historico.contar("bench"):
+        # Uma entrada por segundo até agora (datas que o ZIP consegue gravar)
+        inicio = time.time() - n
+        historico.adicionar("bench", [novo_item(c, ts=inicio + i) for i, c in enumerate(_campos(ctx["core"], n))])
+    return historico
+
+def caso_historico_pagina(ctx, n):
+    historico = _historico(ctx, n)
+    return lambda: historico.pagina("bench", pagina=0)
+
+def caso_exportar_zip(ctx, n):
+    historico, destino = _historico(ctx, n), os.path.join(ctx["tmp"], "export.zip")
+    return lambda: export.escrever_zip(ctx["core"], historico.todos("bench"), destino, n)
+
+def caso_exportar_jsonl(ctx, n):
+    historico, destino = _historico(ctx, n), os.path.join(ctx["tmp"], "export.jsonl")
+    return lambda: export.escrever_jsonl(ctx["core"], historico.todos("bench"), destino)
+
+CASOS = {
+    "gerar_prompt": caso_gerar_prompt,
+    "gerar_prompt_cache": caso_gerar_prompt_cache,
+    "carregar_dataset_json": caso_carregar_dataset_json,
+    "carregar_dataset_snapshot": caso_carregar_dataset_snapshot,
+    "random_all": caso_random_all,
+    "handle_tag_selection": caso_handle_tag_selection,
+    "update_categorized_selection": caso_update_categorized_selection,
+    "restaurar_spec": caso_restaurar_spec,
+    "restaurar_legado": caso_restaurar_legado,
+}
+CASOS_HISTORICO = {
+    "historico_pagina": caso_historico_pagina,
+    "exportar_zip": caso_exportar_zip,
+    "exportar_jsonl": caso_exportar_jsonl,
+}
+
+def _commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def _chave(r):
+    return (r["caso"], r["escala"], r["historico"])
+
+def imprimir(resultados, anterior=None):
+    base = {_chave(r): r for r in (anterior or {}).get("resultados", [])}
+    for r in resultados:
+        linha = f"{r['caso']:<30} {r['escala']:>4}× {r['historico'] or '':>6} {r['mediana_s'] * 1e6:>14,.1f} µs"
+        antes = base.get(_chave(r))
+        if antes:
+            linha += f"   {antes['mediana_s'] / r['mediana_s']:>6.2f}x vs anterior"
+        print(linha, flush=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-o", "--saida", default=None, help="Arquivo JSON de resultados")
+    parser.add_argument("--comparar", default=None, help="JSON de uma execução anterior")
+    parser.add_argument("--casos", nargs="*", default=None, choices=[*CASOS, *CASOS_HISTORICO])
+    parser.add_argument("--escalas", nargs="*", type=int, default=list(ESCALAS))
+    parser.add_argument("--historicos", nargs="*", type=int, default=list(HISTORICOS))
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--sintetico", type=int, default=None, metavar="SEED",
+                        help="Usa catálogos sintéticos gerados com esta seed")
+    args = parser.parse_args()
+
+    casos = args.casos or [*CASOS, *CASOS_HISTORICO]
+    anterior = None
+    if args.comparar:
+        with open(args.comparar, encoding="utf-8") as f:
+            anterior = json.load(f)
+
+    resultados = []
+    for escala in args.escalas:
+        tmp = tempfile.mkdtemp(prefix=f"suno_bench_{escala}x_")
+        try:
+            if args.sintetico is None:
+                base = escrever_dataset_escalado(escala, tmp)
+            else:
+                base = catalogo_sintetico.gerar_base(tmp, seed=args.sintetico, escala=escala)
+            ctx = {"base": base, "tmp": tmp, "core": SunoMaestroCore(base_path=base)}
+            execucoes = [(c, None) for c in casos if c in CASOS]
+            execucoes += [(c, n) for c in casos if c in CASOS_HISTORICO for n in args.historicos]
+            for caso, n in execucoes:
+                fn = CASOS[caso](ctx) if n is None else CASOS_HISTORICO[caso](ctx, n)
+                mediana, minimo, numero = medir(fn, args.repeticoes)
+                resultados.append({"caso": caso, "escala": escala, "historico": n,
+                                   "mediana_s": mediana, "min_s": minimo, "numero": numero})
+                imprimir(resultados[-1:], anterior)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+
+    if args.saida:
+        saida = {
+            "meta": {"commit": _commit(), "data": datetime.now().isoformat(timespec="seconds"),
+                     "python": platform.python_version(), "plataforma": platform.platform(),
+                     "repeticoes": args.repeticoes, "sintetico": args.sintetico},
+            "resultados": resultados,
+        }
+        with open(args.saida, "w", encoding="utf-8") as f:
+            json.dump(saida, f, ensure_ascii=False, indent=2)
+        print(f"Resultados gravados em {args.saida}")
+
+if __name__ == "__main__":
+    main()
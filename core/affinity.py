@@ -0,0 +1,111 @@
+"""
+Afinidade gênero × atributo para o sorteio ponderado (core.sampler).
+
+O arquivo opcional `12_afinidade.json` define multiplicadores de peso por
+gênero da hierarquia, catálogo e item (ou categoria inteira):
+
+    {"Sertanejo": {"tipo_de_gravacao": {"Club Noturno": 0.1, "Ao Vivo": 1.5}}}
+
+Peso 1 é o padrão (não precisa ser listado) e 0 proíbe a combinação. Pesos de
+item têm prioridade sobre os da categoria. Para cada catálogo a tabela vira uma
+matriz esparsa CSR (gêneros × itens) guardando só os pares diferentes de 1.
+
+O sorteio segue um modelo em forma de produto: P(gênero, atributos) ∝
+Π base(atributo) × peso(gênero, atributo), com um fator por item sorteado. O
+gênero é sorteado pela marginal e, dado o gênero, cada campo pelo seu
+condicional, sem gerar e descartar combinações. A parcela de cada campo na
+marginal é E_k[Z(gênero)^k], sobre o número k de itens que o campo sorteia:
+exata para os campos de um item e para as vibes (sorteios independentes) e
+uma aproximação para as tags, cujas categorias saem sem reposição (Gumbel
+top-k) e não têm uma marginal em forma fechada.
+"""
+import numpy as np
+
+class MatrizAfinidade:
+    def __init__(self, afinidade, generos, tabelas):
+        self.generos = list(generos)
+        self._csr = {}
+        for catalogo, tabela in tabelas.items():
+            self._csr[catalogo] = self._montar_csr(afinidade, catalogo, tabela)
+
+    def _montar_csr(self, afinidade, catalogo, tabela):
+        pos_categoria = {cat: range(o, o + c) for cat, o, c in
+                         zip(tabela.categorias, tabela.offsets.tolist(), tabela.contagens.tolist())}
+        pos_nome = {}
+        for i, nome in enumerate(tabela.nomes.tolist()):
+            pos_nome.setdefault(nome, []).append(i)
+
+        indptr, indices, pesos = [0], [], []
+        for genero in self.generos:
+            regras = afinidade.get(genero, {}).get(catalogo, {})
+            linha = {}
+            for chave, peso in regras.items():
+                for i in pos_categoria.get(chave, ()):
+                    linha[i] = float(peso)
+            for chave, peso in regras.items():
+                for i in pos_nome.get(chave, ()):
+                    linha[i] = float(peso)
+            for i in sorted(linha):
+                if linha[i] != 1.0:
+                    indices.append(i)
+                    pesos.append(linha[i])
+            indptr.append(len(indices))
+        return (np.array(indptr, dtype=np.int64), np.array(indices, dtype=np.int64),
+                np.array(pesos, dtype=np.float64))
+
+    def pesos(self, catalogo, g, n_itens):
+        """Vetor denso de pesos dos itens do catálogo para o gênero de índice `g`."""
+        indptr, indices, pesos = self._csr[catalogo]
+        w = np.ones(n_itens)
+        w[indices[indptr[g]:indptr[g + 1]]] = pesos[indptr[g]:indptr[g + 1]]
+        return w
+
+    def normalizador(self, catalogo, base):
+        """Z[g] = Σ base·peso para cada gênero, calculado só sobre as entradas esparsas."""
+        indptr, indices, pesos = self._csr[catalogo]
+        linhas = np.repeat(np.arange(len(self.generos)), np.diff(indptr))
+        return 1.0 + np.bincount(linhas, weights=base[indices] * (pesos - 1.0), minlength=len(self.generos))
+
+def media_potencias(z, sorteios):
+    """E_k[z^k] com k uniforme em `sorteios`: a parcela de um campo na marginal do gênero."""
+    return np.mean([z ** k for k in sorteios], axis=0)
+
+def probabilidade_base(tabela):
+    """Probabilidade de cada item no sorteio sem afinidade (categoria uniforme, item uniforme)."""
+    return np.repeat(1.0 / (len(tabela) * tabela.contagens), tabela.contagens)
+
+def sortear_itens(tabela, w, rng, shape):
+    """Índices de itens com probabilidade ∝ base × w; -1 se todos os pesos forem zero."""
+    cdf = np.cumsum(probabilidade_base(tabela) * w)
+    if cdf[-1] <= 0:
+        return np.full(shape, -1)
+    idx = np.searchsorted(cdf, rng.random(shape) * cdf[-1], side="right")
+    return np.minimum(idx, len(cdf) - 1)
+
+def sortear_tags(tabela, w, rng, n, max_categorias):
+    """
+    Versão ponderada de core.sampler.sortear_tags: as categorias são escolhidas
+    sem reposição com peso = média dos pesos dos seus itens (Gumbel top-k) e o
+    item de cada categoria com probabilidade ∝ peso.
+    """
+    soma_cat = np.add.reduceat(w, tabela.offsets)
+    disponiveis = int(np.count_nonzero(soma_cat > 0))
+    if not disponiveis:
+        return [""] * n
+    m = min(max_categorias, disponiveis)
+    k = rng.integers(1, m + 1, n)
+
+    with np.errstate(divide="ignore"):
+        chaves = np.log(soma_cat / tabela.contagens) + rng.gumbel(size=(n, len(tabela)))
+    cats = np.argsort(-chaves, axis=1)[:, :m]
+
+    # Item dentro da categoria: busca na soma acumulada global restrita ao trecho da categoria
+    acumulado = np.concatenate(([0.0], np.cumsum(w)))
+    inicio = acumulado[tabela.offsets[cats]]
+    fim = acumulado[tabela.offsets[cats] + tabela.contagens[cats]]
+    alvo = inicio + rng.random(cats.shape) * (fim - inicio)
+    idx = np.searchsorted(acumulado, alvo, side="right") - 1
+    idx = np.clip(idx, tabela.offsets[cats], tabela.offsets[cats] + tabela.contagens[cats] - 1)
+
+    nomes = tabela.nomes[idx]
+    return [", ".join(linha[:ki]) for linha, ki in zip(nomes.tolist(), k.tolist())]
@@ -0,0 +1,259 @@
+"""
+API HTTP do Suno Maestro, sem a interface Streamlit.
+
+Servidor asyncio só com a stdlib (HTTP/1.1 com keep-alive). Um único
+SunoMaestroCore é carregado na partida e compartilhado por todas as
+requisições; os prompts passam pelo cache de renderização do processo
+(core.generator.CACHE_RENDER). As rotas pesadas (lotes de prompts e sorteios)
+rodam num pool de threads pequeno, para que um lote grande não pare o event
+loop e as demais conexões keep-alive.
+
+Rotas (corpos e respostas em JSON):
+    GET  /saude                     -> {"ok": true, "cache": {...}}
+    POST /prompt                    {"campos": {...}, "incluir_spec": false} -> {"prompt", "digest"}
+    POST /prompts                   {"itens": [{campos}, ...]} -> {"prompts": [...]}
+    GET  /catalogos                 -> {chave: nº de categorias}
+    GET  /catalogos/<chave>         -> o catálogo de core.dados
+    GET  /aleatorio?n=1&seed=&afinidade=1 -> {"itens": [{campos}, ...]}
+
+Uso:
+    python -m core.api --porta 8765
+"""
+import argparse
+import asyncio
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from core.generator import CACHE_RENDER, SunoMaestroCore
+from core.spec import CAMPOS_PROMPT, PromptSpec
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MAX_CORPO = 8 * 1024 * 1024
+MAX_LOTE = 1000
+MAX_ALEATORIO = 1000
+# Tempo máximo de uma conexão keep-alive ociosa (e de leitura de uma requisição)
+TIMEOUT_OCIOSO = 15.0
+# Rotas atendidas fora do event loop e quantas delas rodam ao mesmo tempo
+ROTAS_EM_THREAD = {"/prompts", "/aleatorio"}
+THREADS_ROTAS = 4
+
+_STATUS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           408: "Request Timeout", 411: "Length Required", 413: "Payload Too Large",
+           500: "Internal Server Error"}
+
+class ErroHTTP(Exception):
+    def __init__(self, status, mensagem):
+        super().__init__(mensagem)
+        self.status = status
+
+def _json(dados):
+    return json.dumps(dados, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+def _campos_validos(campos, onde):
+    """
+    `campos` se for um objeto em que cada campo do prompt é texto, null ou lista
+    de textos; senão 400. Chaves fora de CAMPOS_PROMPT são ignoradas pela spec.
+    """
+    if not isinstance(campos, dict):
+        raise ErroHTTP(400, f"{onde}: esperado um objeto com os campos do prompt")
+    for chave in CAMPOS_PROMPT:
+        valor = campos.get(chave)
+        if valor is None or isinstance(valor, str):
+            continue
+        if not (isinstance(valor, list) and all(isinstance(v, str) for v in valor)):
+            raise ErroHTTP(400, f"{onde}.{chave}: esperado texto, null ou lista de textos")
+    return campos
+
+class ApiMaestro:
+    """Rotas da API sobre um SunoMaestroCore compartilhado."""
+
+    def __init__(self, core, threads=THREADS_ROTAS):
+        self.core = core
+        self.executor = ThreadPoolExecutor(threads, thread_name_prefix="api")
+        # Respostas de /catalogos prontas em bytes, refeitas só quando core.dados muda
+        self._catalogos = (None, {})
+
+    def _catalogo_bytes(self, chave):
+        dados = self.core.dados
+        versao, cache = self._catalogos
+        if versao is not dados:
+            cache = {}
+            self._catalogos = (dados, cache)
+        if chave not in cache:
+            if chave is None:
+                cache[chave] = _json({k: len(v) for k, v in dados.items() if isinstance(v, dict)})
+            elif chave in dados:
+                cache[chave] = _json(dados[chave])
+            else:
+                raise ErroHTTP(404, f"Catálogo desconhecido: {chave}")
+        return cache[chave]
+
+    def prompt(self, corpo):
+        campos = _campos_validos(corpo.get("campos", corpo), "campos")
+        spec = PromptSpec(campos)
+        texto = self.core.gerar_prompt(spec, incluir_spec=bool(corpo.get("incluir_spec")))
+        return _json({"prompt": texto, "digest": spec.digest})
+
+    def prompts(self, corpo):
+        itens = corpo.get("itens")
+        if not isinstance(itens, list):
+            raise ErroHTTP(400, "esperado {\"itens\": [campos, ...]}")
+        if len(itens) > MAX_LOTE:
+            raise ErroHTTP(413, f"no máximo {MAX_LOTE} itens por lote")
+        lista = [_campos_validos(c, f"itens[{i}]") for i, c in enumerate(itens)]
+        return _json({"prompts": self.core.gerar_prompts(lista)})
+
+    def aleatorio(self, query):
+        try:
+            n = int(query.get("n", ["1"])[0])
+            seed = int(query["seed"][0]) if "seed" in query else None
+        except ValueError:
+            raise ErroHTTP(400, "n e seed devem ser inteiros") from None
+        if not 1 <= n <= MAX_ALEATORIO:
+            raise ErroHTTP(400, f"n deve estar entre 1 e {MAX_ALEATORIO}")
+        afinidade = query.get("afinidade", ["1"])[0] not in ("0", "false")
+        return _json({"itens": self.core.amostrador.amostrar(n, seed=seed, afinidade=afinidade)})
+
+    def em_thread(self, alvo):
+        """Se a rota é pesada o bastante para sair do event loop (ROTAS_EM_THREAD)."""
+        return (urlsplit(alvo).path.rstrip("/") or "/") in ROTAS_EM_THREAD
+
+    def despachar(self, metodo, alvo, corpo):
+        """Retorna os bytes JSON da resposta (status 200) ou levanta ErroHTTP."""
+        url = urlsplit(alvo)
+        caminho = url.path.rstrip("/") or "/"
+        if caminho.startswith("/catalogos"):
+            if metodo != "GET":
+                raise ErroHTTP(405, "use GET")
+            resto = caminho[len("/catalogos"):]
+            if resto and not resto.startswith("/"):
+                raise ErroHTTP(404, f"Rota desconhecida: {caminho}")
+            return self._catalogo_bytes(unquote(resto[1:]) if resto else None)
+        if caminho == "/saude":
+            return _json({"ok": True, "cache": CACHE_RENDER.estatisticas()})
+        if caminho == "/aleatorio":
+            if metodo != "GET":
+                raise ErroHTTP(405, "use GET")
+            return self.aleatorio(parse_qs(url.query))
+        rota = {"/prompt": self.prompt, "/prompts": self.prompts}.get(caminho)
+        if rota is None:
+            raise ErroHTTP(404, f"Rota desconhecida: {caminho}")
+        if metodo != "POST":
+            raise ErroHTTP(405, "use POST")
+        try:
+            dados = json.loads(corpo or b"{}")
+        except ValueError:
+            raise ErroHTTP(400, "corpo não é um JSON válido") from None
+        if not isinstance(dados, dict):
+            raise ErroHTTP(400, "esperado um objeto JSON")
+        return rota(dados)
+
+async def _ler_requisicao(reader):
+    """(método, alvo, versão, cabeçalhos, corpo), ou None se o cliente fechou a conexão."""
+    try:
+        cabecalho = await reader.readuntil(b"\r\n\r\n")
+    except asyncio.IncompleteReadError:
+        return None
+    except asyncio.LimitOverrunError:
+        raise ErroHTTP(413, "cabeçalhos muito grandes") from None
+    linhas = cabecalho.decode("latin-1").split("\r\n")
+    try:
+        metodo, alvo, versao = linhas[0].split(" ")
+    except ValueError:
+        raise ErroHTTP(400, "linha de requisição inválida") from None
+    cabecalhos = {}
+    for linha in linhas[1:]:
+        if linha:
+            nome, _, valor = linha.partition(":")
+            cabecalhos[nome.strip().lower()] = valor.strip()
+    if "chunked" in cabecalhos.get("transfer-encoding", "").lower():
+        raise ErroHTTP(411, "envie o corpo com Content-Length")
+    try:
+        tamanho = int(cabecalhos.get("content-length", "0"))
+    except ValueError:
+        raise ErroHTTP(400, "Content-Length inválido") from None
+    if tamanho > MAX_CORPO:
+        raise ErroHTTP(413, f"corpo maior que {MAX_CORPO} bytes")
+    corpo = await reader.readexactly(tamanho) if tamanho else b""
+    return metodo, alvo, versao, cabecalhos, corpo
+
+def _manter_conexao(versao, cabecalhos):
+    conexao = cabecalhos.get("connection", "").lower()
+    if versao == "HTTP/1.1":
+        return conexao != "close"
+    return conexao == "keep-alive"
+
+def _resposta(status, corpo, manter):
+    return (f"HTTP/1.1 {status} {_STATUS.get(status, '')}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            f"Connection: {'keep-alive' if manter else 'close'}\r\n\r\n").encode("latin-1") + corpo
+
+async def _atender(api, reader, writer):
+    """Atende as requisições de uma conexão em sequência até o cliente fechar ou a conexão ficar ociosa."""
+    try:
+        while True:
+            try:
+                requisicao = await asyncio.wait_for(_ler_requisicao(reader), TIMEOUT_OCIOSO)
+            except asyncio.TimeoutError:
+                return
+            except ErroHTTP as e:
+                writer.write(_resposta(e.status, _json({"erro": str(e)}), False))
+                await writer.drain()
+                return
+            if requisicao is None:
+                return
+            metodo, alvo, versao, cabecalhos, corpo = requisicao
+            manter = _manter_conexao(versao, cabecalhos)
+            try:
+                if api.em_thread(alvo):
+                    resposta = await asyncio.get_running_loop().run_in_executor(
+                        api.executor, api.despachar, metodo, alvo, corpo)
+                else:
+                    resposta = api.despachar(metodo, alvo, corpo)
+                status = 200
+            except ErroHTTP as e:
+                status, resposta = e.status, _json({"erro": str(e)})
+            except Exception as e:  # a conexão continua utilizável após um erro interno
+                status, resposta = 500, _json({"erro": f"{type(e).__name__}: {e}"})
+            writer.write(_resposta(status, resposta, manter))
+            await writer.drain()
+            if not manter:
+                return
+    except (ConnectionError, asyncio.IncompleteReadError):
+        pass
+    finally:
+        writer.close()
+
+async def servir(core, host="127.0.0.1", porta=8765, pronto=None):
+    """Sobe o servidor e atende até ser cancelado. `pronto` (asyncio.Event) é sinalizado ao começar a escutar."""
+    api = ApiMaestro(core)
+    servidor = await asyncio.start_server(lambda r, w: _atender(api, r, w), host, porta,
+                                          limit=64 * 1024, reuse_address=True)
+    if pronto is not None:
+        pronto.set()
+    try:
+        async with servidor:
+            await servidor.serve_forever()
+    finally:
+        api.executor.shutdown(wait=False, cancel_futures=True)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="API HTTP do Suno Maestro (asyncio, HTTP/1.1 keep-alive).")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--porta", type=int, default=8765)
+    parser.add_argument("--base", default=ROOT, help="Diretório base com a pasta dataset/")
+    args = parser.parse_args(argv)
+
+    core = SunoMaestroCore(base_path=args.base)
+    print(f"Suno Maestro API em http://{args.host}:{args.porta}")
+    try:
+        asyncio.run(servir(core, args.host, args.porta))
+    except KeyboardInterrupt:
+        pass
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Cache de prompts renderizados compartilhado pelo processo.
+
+Uma única instância (core.generator.CACHE_RENDER) atende todas as sessões
+do servidor: presets populares são renderizados uma vez e servidos a todos
+os usuários. O cache é LRU, limitado em número de entradas e em bytes (a
+memória ocupada por cada texto, via sys.getsizeof, que é O(1)), e cada
+entrada expira `ttl` segundos após ser gravada. As operações são
+protegidas por um lock (os scripts do Streamlit rodam em threads) e os
+contadores de acertos, falhas e remoções ficam em `estatisticas()`.
+"""
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+class CacheRender:
+    def __init__(self, max_entradas=1024, max_bytes=32 * 1024 * 1024, ttl=3600.0, relogio=time.monotonic):
+        self.max_entradas = max_entradas
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._relogio = relogio
+        self._lock = threading.Lock()
+        # chave -> (texto, bytes, expira_em), do menos para o mais recente
+        self._entradas = OrderedDict()
+        self._bytes = 0
+        self._contadores = dict.fromkeys(("acertos", "falhas", "remocoes_lru", "remocoes_ttl"), 0)
+
+    def _remover(self, chave, motivo):
+        _, tamanho, _ = self._entradas.pop(chave)
+        self._bytes -= tamanho
+        self._contadores[motivo] += 1
+
+    def get(self, chave):
+        """Texto em cache para `chave`, ou None (ausente ou expirado)."""
+        with self._lock:
+            entrada = self._entradas.get(chave)
+            if entrada is not None:
+                if entrada[2] > self._relogio():
+                    self._entradas.move_to_end(chave)
+                    self._contadores["acertos"] += 1
+                    return entrada[0]
+                self._remover(chave, "remocoes_ttl")
+            self._contadores["falhas"] += 1
+            return None
+
+    def put(self, chave, texto):
+        """Grava `texto` e remove as entradas menos usadas até caber nos limites."""
+        # Codificar ~7 KB de texto a cada falha custava mais que renderizá-lo
+        tamanho = sys.getsizeof(texto)
+        if tamanho > self.max_bytes:
+            return
+        with self._lock:
+            anterior = self._entradas.pop(chave, None)
+            if anterior is not None:
+                self._bytes -= anterior[1]
+            self._entradas[chave] = (texto, tamanho, self._relogio() + self.ttl)
+            self._bytes += tamanho
+            while len(self._entradas) > self.max_entradas or self._bytes > self.max_bytes:
+                self._remover(next(iter(self._entradas)), "remocoes_lru")
+
+    def obter(self, chave, renderizar):
+        """Texto em cache ou `renderizar(chave)`, gravado em seguida. A renderização roda fora do lock."""
+        texto = self.get(chave)
+        if texto is None:
+            texto = renderizar(chave)
+            self.put(chave, texto)
+        return texto
+
+    def limpar_expirados(self):
+        """Remove as entradas vencidas; retorna quantas foram removidas."""
+        with self._lock:
+            agora = self._relogio()
+            vencidas = [k for k, (_, _, expira) in self._entradas.items() if expira <= agora]
+            for chave in vencidas:
+                self._remover(chave, "remocoes_ttl")
+            return len(vencidas)
+
+    def limpar(self):
+        with self._lock:
+            self._entradas.clear()
+            self._bytes = 0
+
+    def estatisticas(self):
+        """Contadores e ocupação atual (entradas, bytes e taxa de acerto)."""
+        with self._lock:
+            stats = dict(self._contadores, entradas=len(self._entradas), bytes=self._bytes)
+        consultas = stats["acertos"] + stats["falhas"]
+        stats["taxa_acerto"] = stats["acertos"] / consultas if consultas else 0.0
+        return stats
@@ -0,0 +1,104 @@
+"""
+Geração em massa de prompts sem a interface Streamlit.
+
+Lê um JSONL (arquivo ou stdin) onde cada linha é um dicionário de campos
+(as mesmas chaves que o app coleta em `campos`) e grava um JSONL de saída
+com um prompt por linha, na mesma ordem da entrada.
+
+Uso:
+    python -m core.cli entrada.jsonl -o prompts.jsonl --workers 8
+    cat entrada.jsonl | python -m core.cli - -o prompts.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+
+from core.generator import SunoMaestroCore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Instância do motor dentro de cada processo do pool
+_core = None
+
+def _init_worker(base_path):
+    global _core
+    _core = SunoMaestroCore(base_path=base_path)
+
+def _gerar_lote(lote):
+    """Executado no worker: recebe [(n_linha, texto_json)] e devolve linhas JSONL prontas."""
+    lista_campos = []
+    for n_linha, linha in lote:
+        try:
+            campos = json.loads(linha)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Linha {n_linha}: JSON inválido ({e.msg})") from None
+        if not isinstance(campos, dict):
+            raise ValueError(f"Linha {n_linha}: esperado um objeto JSON com os campos")
+        lista_campos.append(campos)
+
+    prompts = _core.gerar_prompts(lista_campos)
+    return "".join(
+        json.dumps({"linha": n_linha, "prompt": prompt}, ensure_ascii=False) + "\n"
+        for (n_linha, _), prompt in zip(lote, prompts)
+    )
+
+def ler_lotes(entrada, tamanho_lote):
+    """Agrupa as linhas não vazias da entrada em lotes de (n_linha, texto)."""
+    linhas = ((n, l) for n, l in enumerate(entrada, start=1) if l.strip())
+    while True:
+        lote = list(islice(linhas, tamanho_lote))
+        if not lote:
+            return
+        yield lote
+
+def gerar_em_massa(entrada, saida, workers=None, tamanho_lote=500, base_path=ROOT):
+    """
+    Distribui os lotes pelo pool mantendo no máximo `2 * workers` lotes em voo.
+    Os resultados são gravados assim que o lote mais antigo termina, então a
+    ordem da entrada é preservada e a memória não cresce com o tamanho do arquivo.
+    Retorna o número de prompts gravados.
+    """
+    workers = workers or os.cpu_count() or 1
+    max_em_voo = 2 * workers
+    total = 0
+
+    with Pool(workers, initializer=_init_worker, initargs=(base_path,)) as pool:
+        pendentes = deque()
+        for lote in ler_lotes(entrada, tamanho_lote):
+            pendentes.append((len(lote), pool.apply_async(_gerar_lote, (lote,))))
+            if len(pendentes) >= max_em_voo:
+                n, resultado = pendentes.popleft()
+                saida.write(resultado.get())
+                total += n
+        while pendentes:
+            n, resultado = pendentes.popleft()
+            saida.write(resultado.get())
+            total += n
+    return total
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera prompts do Suno Maestro em massa a partir de um JSONL.")
+    parser.add_argument("entrada", help="Arquivo JSONL com os campos ('-' para stdin)")
+    parser.add_argument("-o", "--saida", default="-", help="Arquivo JSONL de saída ('-' para stdout)")
+    parser.add_argument("-w", "--workers", type=int, default=None, help="Processos no pool (padrão: nº de CPUs)")
+    parser.add_argument("--lote", type=int, default=500, help="Linhas enviadas por tarefa ao pool")
+    args = parser.parse_args(argv)
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, "r", encoding="utf-8")
+    saida = sys.stdout if args.saida == "-" else open(args.saida, "w", encoding="utf-8")
+    try:
+        total = gerar_em_massa(entrada, saida, workers=args.workers, tamanho_lote=args.lote)
+    except ValueError as e:
+        parser.exit(1, f"Erro: {e}\n")
+    finally:
+        if entrada is not sys.stdin: entrada.close()
+        if saida is not sys.stdout: saida.close()
+
+    print(f"{total} prompts gerados.", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""
+Carregamento dos catálogos JSON com recarga por arquivo.
+
+Cada arquivo de `arquivos_map` é acompanhado por uma assinatura
+(mtime, tamanho, sha256). Na verificação, só os arquivos cujo mtime/tamanho
+mudou são relidos, e só os que tiveram o conteúdo alterado são re-parseados.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+# Arquivos do dataset por chave de core.dados
+ARQUIVOS_MAP = {
+    "hierarquia": "01_genero_ritmo.json",
+    "tipo_de_gravacao": "02_tipo_de_gravacao.json",
+    "influencia_estetica": "03_influencia_estetica.json",
+    "vibe_emocional": "04_vibe_emocional.json",
+    "publico": "05_publico_alvo.json",
+    "tom": "06_tom_lirico.json",
+    "narrador": "07_narrador.json",
+    "metatags": "08_metatags_musicais.json",
+    "help": "09_ajuda.json",
+    "tipo_vocal": "10_tipo_vocal.json",
+    "descritivos": "11_descritivos.json",
+    "afinidade": "12_afinidade.json",
+}
+
+# Formato esperado dos itens de cada catálogo {categoria: [itens]}
+CATALOGOS_PARES = {"hierarquia", "influencia_estetica", "tom", "metatags", "help", "tipo_vocal", "descritivos"}
+CATALOGOS_NOMES = {"tipo_de_gravacao", "publico", "narrador"}
+
+def _item_valido(chave, item):
+    par = isinstance(item, list) and len(item) == 2 and all(isinstance(x, str) for x in item)
+    if chave in CATALOGOS_PARES:
+        return par
+    if chave in CATALOGOS_NOMES:
+        return isinstance(item, str)
+    return par or isinstance(item, str)
+
+def _validar_afinidade(dados):
+    """Formato {gênero: {catálogo: {item ou categoria: peso >= 0}}}."""
+    erros = []
+    for genero, catalogos in dados.items():
+        if not isinstance(catalogos, dict):
+            erros.append(f"afinidade/{genero}: esperado um objeto {{catálogo: {{item: peso}}}}")
+            continue
+        for catalogo, pesos in catalogos.items():
+            if not isinstance(pesos, dict):
+                erros.append(f"afinidade/{genero}/{catalogo}: esperado um objeto {{item: peso}}")
+                continue
+            for item, peso in pesos.items():
+                if isinstance(peso, bool) or not isinstance(peso, (int, float)) or peso < 0:
+                    erros.append(f"afinidade/{genero}/{catalogo}/{item}: peso inválido: {peso!r}")
+    return erros
+
+def validar_catalogo(chave, dados):
+    """Retorna a lista de problemas encontrados no catálogo (vazia se válido)."""
+    if not isinstance(dados, dict):
+        return [f"{chave}: esperado um objeto {{categoria: [itens]}}"]
+    if chave == "afinidade":
+        return _validar_afinidade(dados)
+    erros = []
+    for cat, itens in dados.items():
+        if not isinstance(itens, list):
+            erros.append(f"{chave}/{cat}: esperado uma lista de itens")
+            continue
+        for i, item in enumerate(itens):
+            if not _item_valido(chave, item):
+                erros.append(f"{chave}/{cat}[{i}]: item em formato inválido: {item!r}")
+    return erros
+
+def parse_catalogo(_conteudo, digest):
+    """
+    Converte o conteúdo bruto (bytes) de um catálogo em objeto Python.
+    O `digest` identifica o conteúdo; o parâmetro com "_" fica fora da chave
+    de caches externos (ex.: `st.cache_data`), que passam a ser por conteúdo.
+    """
+    return json.loads(_conteudo)
+
+class CatalogoLoader:
+    def __init__(self, dataset_dir, arquivos_map, cache=None, snapshot_path=None):
+        self.dataset_dir = dataset_dir
+        self.arquivos_map = arquivos_map
+        self.snapshot_path = snapshot_path
+        self._parse = cache(parse_catalogo) if cache else parse_catalogo
+        self._assinaturas = {}  # chave -> (mtime_ns, tamanho, sha256)
+        self._lock = threading.Lock()
+        self._ultima_verificacao = 0.0
+
+    def _caminho(self, chave):
+        return os.path.join(self.dataset_dir, self.arquivos_map[chave])
+
+    def _ler(self, chave):
+        """Lê o arquivo e retorna (assinatura, conteúdo)."""
+        with open(self._caminho(chave), "rb") as f:
+            st_arq = os.fstat(f.fileno())
+            conteudo = f.read()
+        digest = hashlib.sha256(conteudo).hexdigest()
+        return (st_arq.st_mtime_ns, st_arq.st_size, digest), conteudo
+
+    def carregar(self):
+        """
+        Carga completa inicial. Usa o snapshot binário quando ele está em dia
+        com os JSONs; senão lê arquivo a arquivo (ausentes ou inválidos viram {}).
+        """
+        dados = {}
+        with self._lock:
+            if self.snapshot_path:
+                from core import snapshot
+                arquivos = snapshot.carregar(self.snapshot_path, self.dataset_dir, self.arquivos_map)
+                if arquivos:
+                    for chave, (assinatura, conteudo) in arquivos.items():
+                        self._assinaturas[chave] = assinatura
+                        dados[chave] = conteudo
+                    self._ultima_verificacao = time.monotonic()
+                    return dados
+
+            for chave in self.arquivos_map:
+                dados[chave] = {}
+                try:
+                    assinatura, conteudo = self._ler(chave)
+                except FileNotFoundError:
+                    continue
+                self._assinaturas[chave] = assinatura
+                try:
+                    dados[chave] = self._parse(conteudo, assinatura[2])
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    pass
+            self._ultima_verificacao = time.monotonic()
+        return dados
+
+    def alterados(self, intervalo_min=0.0):
+        """
+        Retorna {chave: novos_dados} apenas para os arquivos cujo conteúdo mudou.
+        Chamadas dentro de `intervalo_min` segundos da última verificação, ou
+        concorrentes com uma verificação em andamento, retornam {} sem tocar no disco.
+        Edições com JSON inválido mantêm a versão anterior até serem corrigidas.
+        """
+        if time.monotonic() - self._ultima_verificacao < intervalo_min:
+            return {}
+        if not self._lock.acquire(blocking=False):
+            return {}
+        try:
+            novos = {}
+            for chave in self.arquivos_map:
+                atual = self._assinaturas.get(chave)
+                try:
+                    st_arq = os.stat(self._caminho(chave))
+                except FileNotFoundError:
+                    continue
+                if atual and (st_arq.st_mtime_ns, st_arq.st_size) == atual[:2]:
+                    continue
+
+                try:
+                    assinatura, conteudo = self._ler(chave)
+                except FileNotFoundError:
+                    continue
+                mesmo_conteudo = atual and assinatura[2] == atual[2]
+                self._assinaturas[chave] = assinatura
+                if mesmo_conteudo:
+                    # Só o mtime mudou (ex.: arquivo salvo sem edição)
+                    continue
+                try:
+                    novos[chave] = self._parse(conteudo, assinatura[2])
+                except (json.JSONDecodeError, UnicodeDecodeError):
+                    # Mantém a versão anterior até o arquivo ser corrigido
+                    continue
+            self._ultima_verificacao = time.monotonic()
+            return novos
+        finally:
+            self._lock.release()
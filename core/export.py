@@ -0,0 +1,93 @@
+"""
+Exportação do histórico (ZIP com um .txt por prompt, ou JSONL).
+
+As entradas são lidas do banco em lotes e cada prompt é renderizado e
+gravado direto no arquivo de destino, um por vez: o histórico inteiro nunca
+fica em memória. O arquivo pronto é guardado em disco por (usuário, versão
+do histórico), então downloads repetidos sem novas entradas reaproveitam os
+mesmos bytes.
+"""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import zipfile
+
+from core.history import titulo
+
+FORMATOS = {"zip": "application/zip", "jsonl": "application/jsonl"}
+# Datas que o formato ZIP (MS-DOS) consegue representar
+DATA_MIN_ZIP = (1980, 1, 1, 0, 0, 0)
+DATA_MAX_ZIP = (2107, 12, 31, 23, 59, 58)
+
+def data_zip(ts):
+    """date_time do ZIP para o timestamp `ts`, limitado à faixa que o formato representa."""
+    try:
+        data = time.localtime(ts)[:6]
+    except (OverflowError, OSError, ValueError):
+        return DATA_MAX_ZIP if ts > 0 else DATA_MIN_ZIP
+    return min(max(data, DATA_MIN_ZIP), DATA_MAX_ZIP)
+
+def escrever_zip(core, itens, destino, total):
+    """
+    Um .txt por entrada (com o bloco de spec, para reimportação sem perdas);
+    `total` numera os arquivos do mais antigo (01) ao mais novo. A data de
+    cada arquivo no ZIP é a da entrada (limitada a 1980–2107), lida de volta
+    por core.restore.
+    """
+    with zipfile.ZipFile(destino, "w", zipfile.ZIP_DEFLATED) as zip_file:
+        for i, item in enumerate(itens):
+            nome_arquivo = f"{total-i:02d}_{titulo(item).replace(' ', '_').replace('|', '')}.txt"
+            info = zipfile.ZipInfo(nome_arquivo, date_time=data_zip(item["ts"]))
+            info.compress_type = zipfile.ZIP_DEFLATED
+            zip_file.writestr(info, core.gerar_prompt(item["campos"], incluir_spec=True))
+
+def escrever_jsonl(core, itens, destino, total=None):
+    """Uma linha por entrada com a spec, a versão do template, o timestamp e o prompt renderizado."""
+    with open(destino, "w", encoding="utf-8", newline="\n") as f:
+        for item in itens:
+            linha = {"ts": item["ts"], "versao": item["versao"], "campos": item["campos"],
+                     "prompt": core.gerar_prompt(item["campos"])}
+            f.write(json.dumps(linha, ensure_ascii=False) + "\n")
+
+_ESCRITORES = {"zip": escrever_zip, "jsonl": escrever_jsonl}
+
+class CacheExportacao:
+    def __init__(self, diretorio=None):
+        self.diretorio = diretorio or os.path.join(tempfile.gettempdir(), "suno_maestro_export")
+        os.makedirs(self.diretorio, exist_ok=True)
+        self._lock = threading.Lock()
+
+    def _prefixo(self, usuario):
+        # O identificador vem de um cookie do navegador: nunca entra cru no caminho do arquivo
+        return hashlib.sha256(usuario.encode("utf-8")).hexdigest()[:16]
+
+    def arquivo(self, core, historico, usuario, formato):
+        """Caminho do arquivo exportado na versão atual do histórico (gera se ainda não existir)."""
+        prefixo = self._prefixo(usuario)
+        with self._lock:
+            versao = historico.versao(usuario)
+            caminho = os.path.join(self.diretorio, f"{prefixo}_{versao}.{formato}")
+            if os.path.exists(caminho):
+                return caminho
+
+            temporario = f"{caminho}.tmp"
+            try:
+                _ESCRITORES[formato](core, historico.todos(usuario), temporario, historico.contar(usuario))
+                os.replace(temporario, caminho)
+            except BaseException:
+                # Sem o arquivo pela metade: o próximo pedido gera de novo
+                if os.path.exists(temporario):
+                    os.remove(temporario)
+                raise
+
+            # Versões anteriores deste usuário não serão mais pedidas
+            for nome in os.listdir(self.diretorio):
+                if nome.startswith(f"{prefixo}_") and not nome.startswith(f"{prefixo}_{versao}."):
+                    try:
+                        os.remove(os.path.join(self.diretorio, nome))
+                    except FileNotFoundError:
+                        pass
+            return caminho
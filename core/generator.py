@@ -1,85 +1,53 @@
-import json
+import copy
 import os
-import streamlit as st
+from collections import namedtuple
+from operator import itemgetter
+from string import Formatter
 
-class SunoMaestroCore:
-    def __init__(self, base_path):
-        self.base_path = base_path
-        self.dataset_dir = os.path.join(self.base_path, "dataset")
-        # Adicionei a linha do "help" abaixo
-        self.arquivos_map = {
-            "hierarquia": "01_genero_ritmo.json", 
-            "tipo_de_gravacao": "02_tipo_de_gravacao.json",
-            "influencia_estetica": "03_influencia_estetica.json", 
-            "vibe_emocional": "04_vibe_emocional.json",
-            "publico": "05_publico_alvo.json", 
-            "tom": "06_tom_lirico.json",
-            "narrador": "07_narrador.json",
-            "metatags": "08_metatags_musicais.json",
-            "help": "09_ajuda.json",
-            "tipo_vocal": "10_tipo_vocal.json",
-            "descritivos": "11_descritivos.json"
-        }
-        self.dados = self._load_data()
-
-    def _load_data(self):
-        """Carrega os dados usando o cache do Streamlit."""
-        return load_dataset_cached(self.dataset_dir, self.arquivos_map)
-
-    def gerar_prompt(self, campos):
-        # Normalização dos campos para evitar None
-        d = {}
-        for k, v in campos.items():
-            if isinstance(v, list):
-                val = ", ".join(filter(None, v))
-                d[k] = val if val.strip() else "AUTOMATIC_INPUT"
-            else:
-                val = str(v).strip() if v else ""
-                d[k] = val if val else "AUTOMATIC_INPUT"
-
-        # --- LÓGICA DE EXPOSIÇÃO PARA O PROMPT ---
-        v_masc = d.get('vocal_masculino', "AUTOMATIC_INPUT")
-        v_fem = d.get('vocal_feminino', "AUTOMATIC_INPUT")
-        
-        # Verificamos se tem conteúdo real (diferente do padrão AUTOMATIC)
-        has_masc = v_masc != "AUTOMATIC_INPUT"
-        has_fem = v_fem != "AUTOMATIC_INPUT"
-        
-        if has_masc and has_fem:
-            vocal_gender = "Duet"
-        elif has_masc:
-            vocal_gender = "Male Solo"
-        elif has_fem:
-            vocal_gender = "Female Solo"
-        else:
-            vocal_gender = "AUTOMATIC_INPUT"
-            
-        # Template do Prompt
-        return f"""ROLE: Composer, arranger, lyricist, and music producer who creates commercially viable songs with realistic instrumentation and writes Suno 5.0–compatible prompts; prioritizes musical identity and functional audio description over poetic abstraction, infers missing details consistently, and structures outputs for real-world mixability and singability.
+from core.cache import CacheRender
+from core.dataset import ARQUIVOS_MAP, CatalogoLoader
+from core.snapshot import NOME_ARQUIVO as SNAPSHOT_ARQUIVO
+from core.index import DatasetIndex
+from core.search import IndiceBusca
+# PromptSpec, CAMPOS_PROMPT e normalizar_campos continuam importáveis daqui
+from core.spec import AUTOMATIC_INPUT, CAMPOS_PROMPT, PromptSpec, como_spec, normalizar_campos
+from core.spec import normalizar_valor as _normalizar_valor
+
+# Versão do template: gravada junto das specs salvas (histórico) para re-renderização
+TEMPLATE_VERSION = 1
+# Limites do cache de prompts renderizados (por PromptSpec), compartilhado pelo processo
+TAMANHO_CACHE_RENDER = 1024
+BYTES_CACHE_RENDER = 32 * 1024 * 1024
+TTL_CACHE_RENDER = 3600.0
+# Linha com a spec compacta anexada ao prompt (lida de volta por core.restore)
+MARCADOR_SPEC = "# suno-maestro-spec: "
+
+# Template do Prompt (placeholders no formato {campo})
+PROMPT_TEMPLATE = """ROLE: Composer, arranger, lyricist, and music producer who creates commercially viable songs with realistic instrumentation and writes Suno 5.0–compatible prompts; prioritizes musical identity and functional audio description over poetic abstraction, infers missing details consistently, and structures outputs for real-world mixability and singability.
 
   USER_INPUTS:
     musical_identity:
-      primary_genre: "{d.get('genero')}"
-      specific_style: "{d.get('ritmo')}"
-      recording_aesthetic: "{d.get('tipo_de_gravacao')}"
-      artistic_influence: "{d.get('influencia_estetica')}"
-      emotional_vibe: "{d.get('vibe_emocional')}"
-      external_refs: "{d.get('referencia')}"
+      primary_genre: "{genero}"
+      specific_style: "{ritmo}"
+      recording_aesthetic: "{tipo_de_gravacao}"
+      artistic_influence: "{influencia_estetica}"
+      emotional_vibe: "{vibe_emocional}"
+      external_refs: "{referencia}"
 
     vocal_config:
       vocal_gender: "{vocal_gender}"
-      male_vocal_specs: "{v_masc}"
-      female_vocal_specs: "{v_fem}"
+      male_vocal_specs: "{vocal_masculino}"
+      female_vocal_specs: "{vocal_feminino}"
 
     lyrics_specs:
-      language: "{d.get('idioma')}"
-      topic: "{d.get('tema')}"
-      core_message: "{d.get('mensagem')}"
-      keywords: "{d.get('palavras_chave')}"
-      target_audience: "{d.get('publico')}"
-      narrator_perspective: "{d.get('narrador')}"
-      structure_format: "{d.get('estrutura')}"
-      lyrical_tone: "{d.get('tom')}"
+      language: "{idioma}"
+      topic: "{tema}"
+      core_message: "{mensagem}"
+      keywords: "{palavras_chave}"
+      target_audience: "{publico}"
+      narrator_perspective: "{narrador}"
+      structure_format: "{estrutura}"
+      lyrical_tone: "{tom}"
 
   AUTOMATIC_INPUTS:
     arrangement_and_production_inference:
@@ -187,24 +155,157 @@ class SunoMaestroCore:
       - "# Prompt for Suno"
 """
 
-@st.cache_data
-def load_dataset_cached(dataset_dir, arquivos_map):
-    """Função isolada para permitir cache correto do Streamlit."""
-    dados = {}
-    for key, filename in arquivos_map.items():
-        filepath = os.path.join(dataset_dir, filename)
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                dados[key] = json.load(f)
-        except FileNotFoundError:
-            dados[key] = {}
-            # Opcional: st.warning(f"Arquivo não encontrado: {filename}")
-        except json.JSONDecodeError:
-            dados[key] = {}
-            # Opcional: st.error(f"Erro ao ler JSON: {filename}")
+# Valores na ordem de CAMPOS_PROMPT seguidos do vocal_gender, que é derivado
+_CAMPOS_TEMPLATE = CAMPOS_PROMPT + ("vocal_gender",)
+_I_MASC = CAMPOS_PROMPT.index("vocal_masculino")
+_I_FEM = CAMPOS_PROMPT.index("vocal_feminino")
+
+def _compilar_template(template):
+    """
+    Quebra o template em segmentos uma única vez. Retorna os literais numa
+    tupla e um itemgetter que, aplicado a `valores + literais` (valores na
+    ordem de _CAMPOS_TEMPLATE), devolve os pedaços na ordem do texto final.
+    """
+    literais, ordem = [], []
+    for literal, campo, _, _ in Formatter().parse(template):
+        if literal:
+            ordem.append(len(_CAMPOS_TEMPLATE) + len(literais))
+            literais.append(literal)
+        if campo is not None:
+            ordem.append(_CAMPOS_TEMPLATE.index(campo))
+    return tuple(literais), itemgetter(*ordem)
+
+_LITERAIS, _ORDEM = _compilar_template(PROMPT_TEMPLATE)
+
+def bloco_spec(campos):
+    """Linha `# suno-maestro-spec: {json}` com a versão do template e os campos preenchidos."""
+    return f'\n{MARCADOR_SPEC}{{"v":{TEMPLATE_VERSION},"campos":{como_spec(campos).codificar()}}}\n'
+
+_VOCAL_GENDER = {
+    (True, True): "Duet",
+    (True, False): "Male Solo",
+    (False, True): "Female Solo",
+    (False, False): AUTOMATIC_INPUT,
+}
+
+def _renderizar_valores(valores):
+    """
+    Texto do prompt a partir da tupla de valores já normalizados, na ordem de
+    CAMPOS_PROMPT e com AUTOMATIC_INPUT nos campos vazios.
+    """
+    # Verificamos se tem conteúdo real (diferente do padrão AUTOMATIC)
+    vocal_gender = _VOCAL_GENDER[valores[_I_MASC] != AUTOMATIC_INPUT, valores[_I_FEM] != AUTOMATIC_INPUT]
+    return "".join(_ORDEM(valores + (vocal_gender,) + _LITERAIS))
+
+def _renderizar_spec(spec):
+    # Os valores da spec já estão normalizados: só os vazios (None) viram AUTOMATIC_INPUT
+    return _renderizar_valores(tuple([AUTOMATIC_INPUT if v is None else v for v in spec._valores]))
+
+# Uma versão do dataset: catálogos, índice e busca montados a partir dos mesmos dados
+EstadoDataset = namedtuple("EstadoDataset", "dados indice busca")
+
+# Único para todas as sessões (o template não depende do dataset carregado)
+CACHE_RENDER = CacheRender(TAMANHO_CACHE_RENDER, BYTES_CACHE_RENDER, TTL_CACHE_RENDER)
+
+def renderizar_spec(spec):
+    """Prompt de uma PromptSpec; specs iguais (mesmo hash) saem do cache sem re-renderizar."""
+    return CACHE_RENDER.obter(spec, _renderizar_spec)
+
+class SunoMaestroCore:
+    def __init__(self, base_path, cache=None):
+        """
+        `cache` é um decorador opcional aplicado ao parse de cada catálogo
+        (ex.: `st.cache_data` no app). Sem ele o core usa apenas a stdlib.
+        """
+        self.base_path = base_path
+        self.dataset_dir = os.path.join(self.base_path, "dataset")
+        self.arquivos_map = dict(ARQUIVOS_MAP)
+        self._loader = CatalogoLoader(self.dataset_dir, self.arquivos_map, cache=cache,
+                                      snapshot_path=os.path.join(self.dataset_dir, SNAPSHOT_ARQUIVO))
+        # (estado, Amostrador): lista compartilhada com as cópias de fixar()
+        self._amostrador = [None]
+        self._aplicar_dados(self._loader.carregar())
+
+    def _aplicar_dados(self, dados):
+        # Publicado numa única atribuição, mas core.dados e core.indice são
+        # leituras separadas: um reload pode cair entre elas. Quem precisa de
+        # um conjunto consistente lê `estado` uma vez ou usa fixar().
+        self._estado = EstadoDataset(dados, DatasetIndex(dados), IndiceBusca(dados))
+
+    @property
+    def estado(self):
+        """EstadoDataset (dados, indice, busca) publicado por último."""
+        return self._estado
+
+    def fixar(self):
+        """
+        Cópia leve do core presa ao estado atual: todas as leituras de dados,
+        índice, busca e amostrador vêm da mesma versão, mesmo que o reload de
+        outra sessão seja publicado no meio de um rerun. Recarregar continua
+        sendo feito no core compartilhado.
+        """
+        return copy.copy(self)
+
+    @property
+    def dados(self):
+        return self._estado[0]
+
+    @property
+    def indice(self):
+        return self._estado[1]
 
-    return dados
+    @property
+    def busca(self):
+        return self._estado[2]
 
+    @property
+    def amostrador(self):
+        """Sorteador vetorizado (core.sampler), criado sob demanda para não exigir NumPy no import."""
+        estado = self._estado
+        cache = self._amostrador[0]
+        if cache is None or cache[0] is not estado:
+            from core.sampler import Amostrador
+            cache = (estado, Amostrador(estado.dados))
+            self._amostrador[0] = cache
+        return cache[1]
 
+    def recarregar_alterados(self, intervalo_min=0.0):
+        """
+        Recarrega apenas os catálogos alterados em disco (mtime + hash) e os
+        publica atomicamente. Retorna o conjunto de chaves atualizadas.
+        """
+        novos = self._loader.alterados(intervalo_min)
+        if novos:
+            self._aplicar_dados({**self.dados, **novos})
+        return set(novos)
 
+    def gerar_prompt(self, campos, incluir_spec=False):
+        """
+        Gera o prompt final a partir dos campos da UI (dict ou PromptSpec),
+        normalizados uma vez e renderizados pelo cache LRU. Com `incluir_spec`
+        anexa o bloco de spec, que permite restaurar o prompt sem perdas
+        (core.restore).
+        """
+        spec = como_spec(campos)
+        texto = renderizar_spec(spec)
+        return texto + bloco_spec(spec) if incluir_spec else texto
 
+    def gerar_prompts(self, lista_campos):
+        """
+        Versão em lote de gerar_prompt para geração em massa (CLI, API, LLM).
+        Não passa pelo CACHE_RENDER: num lote de specs distintas o lock, a
+        contabilidade de bytes e as remoções do LRU custariam mais que a
+        própria renderização. Dicionários são normalizados direto nos valores
+        do template, sem montar a PromptSpec.
+        """
+        normalizar = _normalizar_valor
+        textos = []
+        for campos in lista_campos:
+            if isinstance(campos, PromptSpec):
+                textos.append(_renderizar_spec(campos))
+                continue
+            # Atalho para o caso comum (texto), como em PromptSpec
+            valores = tuple([v.strip() or AUTOMATIC_INPUT if v.__class__ is str else normalizar(v)
+                             for v in map(campos.get, CAMPOS_PROMPT)])
+            textos.append(_renderizar_valores(valores))
+        return textos
@@ -0,0 +1,185 @@
+"""
+Histórico de prompts persistido em SQLite.
+
+Cada entrada guarda a spec compacta dos campos (core.spec.normalizar_campos),
+a versão do template e o timestamp; o texto é re-renderizado sob demanda.
+O banco roda em modo WAL (leitores não bloqueiam o escritor) e as conexões
+vêm de um pool pequeno compartilhado entre as threads do servidor; cada
+operação pega uma conexão só pelo tempo de uma consulta (com prazo para
+esperar por uma livre). As leituras são paginadas pelo índice (usuario, ts)
+e as escritas em lote são feitas numa única transação.
+"""
+import json
+import os
+import queue
+import sqlite3
+import time
+from contextlib import contextmanager
+from datetime import datetime
+
+from core.generator import TEMPLATE_VERSION
+from core.spec import normalizar_campos
+
+TAMANHO_POOL = 4
+POR_PAGINA = 10
+TIMEOUT_POOL = 10.0  # Segundos esperando uma conexão livre antes de desistir
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS historico (
+    id      INTEGER PRIMARY KEY,
+    usuario TEXT NOT NULL,
+    ts      REAL NOT NULL,
+    versao  INTEGER NOT NULL,
+    genero  TEXT NOT NULL DEFAULT '',
+    tema    TEXT NOT NULL DEFAULT '',
+    campos  TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_historico_ts ON historico (usuario, ts DESC);
+CREATE INDEX IF NOT EXISTS idx_historico_genero ON historico (usuario, genero, ts DESC);
+CREATE INDEX IF NOT EXISTS idx_historico_tema ON historico (usuario, tema, ts DESC);
+CREATE TABLE IF NOT EXISTS versoes (
+    usuario TEXT PRIMARY KEY,
+    versao  INTEGER NOT NULL
+);
+"""
+
+class ErroHistorico(RuntimeError):
+    pass
+
+def _linha(item):
+    campos = item["campos"]
+    return (item["ts"], item["versao"], campos.get("genero", ""), campos.get("tema", ""),
+            json.dumps(campos, ensure_ascii=False, separators=(",", ":")))
+
+def _item(linha):
+    id_, ts, versao, campos = linha
+    return {"id": id_, "campos": json.loads(campos), "versao": versao, "ts": ts}
+
+def novo_item(campos, ts=None):
+    """Entrada compacta: só os campos preenchidos; o texto é re-renderizado sob demanda."""
+    return {"campos": normalizar_campos(campos), "versao": TEMPLATE_VERSION,
+            "ts": time.time() if ts is None else ts}
+
+def titulo(item):
+    """Título curto da entrada: hora | gênero - tema."""
+    gen = item["campos"].get("genero", "Estilo")
+    tem = item["campos"].get("tema", "Geral")
+    return f"{datetime.fromtimestamp(item['ts']).strftime('%H:%M')} | {gen} - {tem}"[:40]
+
+class HistoricoSQLite:
+    def __init__(self, caminho, tamanho_pool=TAMANHO_POOL, timeout_pool=TIMEOUT_POOL):
+        self.caminho = caminho
+        self.timeout_pool = timeout_pool
+        os.makedirs(os.path.dirname(os.path.abspath(caminho)), exist_ok=True)
+        self._pool = queue.Queue()
+        for _ in range(tamanho_pool):
+            self._pool.put(self._conectar())
+        with self._conexao() as con:
+            con.executescript(_ESQUEMA)
+
+    def _conectar(self):
+        # isolation_level=None: transações explícitas (BEGIN) só nas escritas
+        con = sqlite3.connect(self.caminho, check_same_thread=False, isolation_level=None, timeout=5.0)
+        con.execute("PRAGMA journal_mode=WAL")
+        con.execute("PRAGMA synchronous=NORMAL")
+        return con
+
+    @contextmanager
+    def _conexao(self):
+        try:
+            con = self._pool.get(timeout=self.timeout_pool)
+        except queue.Empty:
+            raise ErroHistorico(f"nenhuma conexão livre no pool do histórico após {self.timeout_pool:g} s") from None
+        try:
+            yield con
+        finally:
+            self._pool.put(con)
+
+    @contextmanager
+    def _transacao(self, usuario):
+        """Transação de escrita que também incrementa a versão do histórico do usuário."""
+        with self._conexao() as con:
+            con.execute("BEGIN IMMEDIATE")
+            try:
+                yield con
+                con.execute("INSERT INTO versoes (usuario, versao) VALUES (?, 1) "
+                            "ON CONFLICT (usuario) DO UPDATE SET versao = versao + 1", (usuario,))
+            except BaseException:
+                con.execute("ROLLBACK")
+                raise
+            con.execute("COMMIT")
+
+    def adicionar(self, usuario, itens):
+        """Grava uma lista de entradas {"campos", "versao", "ts"} numa única transação."""
+        linhas = [(usuario, *_linha(item)) for item in itens]
+        if not linhas:
+            return
+        with self._transacao(usuario) as con:
+            con.executemany("INSERT INTO historico (usuario, ts, versao, genero, tema, campos) "
+                            "VALUES (?, ?, ?, ?, ?, ?)", linhas)
+
+    def versao(self, usuario):
+        """Contador que muda a cada escrita no histórico do usuário (chave de cache das exportações)."""
+        with self._conexao() as con:
+            linha = con.execute("SELECT versao FROM versoes WHERE usuario = ?", (usuario,)).fetchone()
+        return linha[0] if linha else 0
+
+    def _filtro(self, usuario, genero, tema):
+        sql, params = "usuario = ?", [usuario]
+        if genero:
+            sql += " AND genero = ?"
+            params.append(genero)
+        if tema:
+            sql += " AND tema = ?"
+            params.append(tema)
+        return sql, params
+
+    def contar(self, usuario, genero=None, tema=None):
+        sql, params = self._filtro(usuario, genero, tema)
+        with self._conexao() as con:
+            return con.execute(f"SELECT COUNT(*) FROM historico WHERE {sql}", params).fetchone()[0]
+
+    def generos(self, usuario):
+        """Gêneros distintos do histórico do usuário (lidos do índice por gênero)."""
+        with self._conexao() as con:
+            linhas = con.execute("SELECT DISTINCT genero FROM historico WHERE usuario = ? AND genero != '' "
+                                 "ORDER BY genero", (usuario,)).fetchall()
+        return [g for (g,) in linhas]
+
+    def pagina(self, usuario, pagina=0, por_pagina=POR_PAGINA, genero=None, tema=None):
+        """Entradas da página `pagina` (0 = mais recentes), da mais nova para a mais antiga."""
+        sql, params = self._filtro(usuario, genero, tema)
+        with self._conexao() as con:
+            linhas = con.execute(f"SELECT id, ts, versao, campos FROM historico WHERE {sql} "
+                                 "ORDER BY ts DESC, id DESC LIMIT ? OFFSET ?",
+                                 (*params, por_pagina, pagina * por_pagina)).fetchall()
+        return [_item(linha) for linha in linhas]
+
+    def todos(self, usuario, lote=500):
+        """
+        Itera por todas as entradas do usuário (mais novas primeiro), lendo
+        `lote` linhas por vez. Cada lote pega uma conexão só durante a sua
+        consulta e continua a partir do último (ts, id) lido, então um
+        gerador lento ou abandonado não prende uma conexão do pool.
+        """
+        sql = "SELECT id, ts, versao, campos FROM historico WHERE usuario = ? "
+        ordem = "ORDER BY ts DESC, id DESC LIMIT ?"
+        with self._conexao() as con:
+            linhas = con.execute(sql + ordem, (usuario, lote)).fetchall()
+        while linhas:
+            for linha in linhas:
+                yield _item(linha)
+            if len(linhas) < lote:
+                return
+            id_, ts = linhas[-1][:2]
+            with self._conexao() as con:
+                linhas = con.execute(sql + "AND (ts < ? OR (ts = ? AND id < ?)) " + ordem,
+                                     (usuario, ts, ts, id_, lote)).fetchall()
+
+    def limpar(self, usuario):
+        with self._transacao(usuario) as con:
+            con.execute("DELETE FROM historico WHERE usuario = ?", (usuario,))
+
+    def fechar(self):
+        while not self._pool.empty():
+            self._pool.get_nowait().close()
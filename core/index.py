@@ -0,0 +1,61 @@
+"""
+Índices pré-calculados sobre `core.dados`.
+
+Construídos uma única vez por carga do dataset para que a UI não precise
+percorrer os catálogos, montar sets ou reordenar listas a cada rerun.
+"""
+
+# Catálogos no formato {categoria: [[nome, descrição], ...]} ou {categoria: [nome, ...]}
+CATALOGOS_CATEGORIZADOS = (
+    "tipo_de_gravacao", "influencia_estetica", "vibe_emocional", "publico",
+    "tom", "narrador", "metatags", "tipo_vocal",
+)
+
+def nome_item(item):
+    """Retorna o nome de um item de catálogo ([nome, desc] ou apenas nome)."""
+    return item[0] if isinstance(item, (list, tuple)) else item
+
+class DatasetIndex:
+    def __init__(self, dados):
+        hierarquia = dados.get("hierarquia", {})
+
+        # Gênero -> Ritmo -> Estrutura
+        self.generos = sorted(hierarquia.keys())
+        self.ritmos = {}
+        self.estruturas = {}
+        unicas = set()
+        for genero, itens in hierarquia.items():
+            self.ritmos[genero] = sorted(item[0] for item in itens)
+            self.estruturas[genero] = {item[0]: item[1] for item in itens if len(item) > 1}
+            unicas.update(self.estruturas[genero].values())
+        self.estruturas_unicas = sorted(unicas)
+
+        # Opções prontas para os selectboxes (com a opção vazia no início)
+        self.opcoes_generos = [""] + self.generos
+        self.opcoes_ritmos = {g: [""] + r for g, r in self.ritmos.items()}
+        self.opcoes_estruturas = [""] + self.estruturas_unicas
+
+        # Categorias ordenadas, item -> categoria e categoria -> nomes por catálogo
+        self.categorias = {}
+        self.item_categoria = {}
+        self.itens_categoria = {}
+        for chave in CATALOGOS_CATEGORIZADOS:
+            catalogo = dados.get(chave)
+            if not isinstance(catalogo, dict):
+                continue
+            self.categorias[chave] = sorted(catalogo.keys())
+            mapa = {}
+            nomes_por_cat = {}
+            for cat, itens in catalogo.items():
+                nomes = [nome_item(i) for i in itens]
+                nomes_por_cat[cat] = frozenset(nomes)
+                for nome in nomes:
+                    mapa[nome] = cat
+            self.item_categoria[chave] = mapa
+            self.itens_categoria[chave] = nomes_por_cat
+
+    def ritmos_de(self, genero):
+        return self.ritmos.get(genero, [])
+
+    def estrutura_de(self, genero, ritmo):
+        return self.estruturas.get(genero, {}).get(ritmo, "")
@@ -0,0 +1,354 @@
+"""
+Envio dos prompts gerados a um endpoint compatível com a API da OpenAI
+(`POST {url}/chat/completions`).
+
+Etapa opcional do pipeline, só com a stdlib: cliente HTTP/1.1 asyncio com
+pool de conexões keep-alive, concorrência limitada, novas tentativas com
+backoff exponencial e jitter (erros de conexão, 429 e 5xx, respeitando o
+Retry-After) e respostas em streaming (SSE). Com streaming, uma nova
+tentativa só acontece antes do primeiro trecho recebido. Com --validar, a
+resposta é conferida contra o contrato de saída (core.output) enquanto
+chega e uma resposta fora do formato é interrompida e pedida de novo.
+
+Uso (entrada no formato do core.cli: um dicionário de campos por linha):
+    python -m core.llm entrada.jsonl -o respostas.jsonl --url http://127.0.0.1:8766/v1 --concorrencia 16
+A chave da API vem de SUNO_MAESTRO_LLM_KEY (ou OPENAI_API_KEY).
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import ssl
+import sys
+import time
+from collections import namedtuple
+from contextlib import aclosing
+from urllib.parse import urlsplit
+
+from core.output import ViolacaoSaida, validar_stream
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+MODELO_PADRAO = os.environ.get("SUNO_MAESTRO_LLM_MODELO", "gpt-4o-mini")
+# Status que valem uma nova tentativa
+STATUS_REPETIVEIS = {408, 409, 429, 500, 502, 503, 504}
+
+# `saida` só é preenchida com validação (SaidaModelo de core.output)
+Resultado = namedtuple("Resultado", "indice texto erro segundos saida", defaults=(None,))
+
+class ErroLLM(Exception):
+    def __init__(self, mensagem, status=None, repetivel=False, retry_after=None):
+        super().__init__(mensagem)
+        self.status = status
+        self.repetivel = repetivel
+        self.retry_after = retry_after
+
+class PoolConexoes:
+    """
+    Conexões keep-alive para um host, no máximo `max_conexoes` abertas ao
+    mesmo tempo. Pertence a um único event loop.
+    """
+
+    def __init__(self, host, porta, contexto_ssl=None, max_conexoes=8):
+        self.host, self.porta, self.ssl = host, porta, contexto_ssl
+        self.max_conexoes = max_conexoes
+        self._livres = []
+        self._limite = None
+
+    async def obter(self):
+        if self._limite is None:
+            self._limite = asyncio.Semaphore(self.max_conexoes)
+        await self._limite.acquire()
+        try:
+            while self._livres:
+                reader, writer = self._livres.pop()
+                if not (writer.is_closing() or reader.at_eof()):
+                    return reader, writer
+                writer.close()
+            return await asyncio.open_connection(self.host, self.porta, ssl=self.ssl)
+        except BaseException:
+            self._limite.release()
+            raise
+
+    def devolver(self, conexao, reutilizar):
+        """Devolve a conexão ao pool (ou a fecha, se a resposta não foi lida até o fim)."""
+        if reutilizar and not conexao[1].is_closing():
+            self._livres.append(conexao)
+        else:
+            conexao[1].close()
+        self._limite.release()
+
+    async def fechar(self):
+        """Fecha as conexões ociosas e espera o fim de cada uma."""
+        while self._livres:
+            writer = self._livres.pop()[1]
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except OSError:
+                pass
+
+async def _ler_cabecalho(reader):
+    linhas = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(linhas[0].split(" ", 2)[1])
+    cabecalhos = {}
+    for linha in linhas[1:]:
+        if linha:
+            nome, _, valor = linha.partition(":")
+            cabecalhos[nome.strip().lower()] = valor.strip()
+    return status, cabecalhos
+
+async def _ler_corpo(reader, cabecalhos):
+    """Blocos do corpo da resposta (chunked, Content-Length ou até o fim da conexão)."""
+    if "chunked" in cabecalhos.get("transfer-encoding", "").lower():
+        while True:
+            tamanho = int((await reader.readuntil(b"\r\n")).split(b";")[0], 16)
+            if tamanho == 0:
+                while await reader.readuntil(b"\r\n") != b"\r\n":
+                    pass  # trailers
+                return
+            yield await reader.readexactly(tamanho)
+            await reader.readexactly(2)
+    elif "content-length" in cabecalhos:
+        restante = int(cabecalhos["content-length"])
+        while restante:
+            bloco = await reader.read(min(restante, 65536))
+            if not bloco:
+                raise asyncio.IncompleteReadError(b"", restante)
+            restante -= len(bloco)
+            yield bloco
+    else:
+        while bloco := await reader.read(65536):
+            yield bloco
+
+def _retry_after(valor):
+    """Segundos do cabeçalho Retry-After (a forma com data HTTP é ignorada)."""
+    try:
+        return max(0.0, float(valor)) if valor else None
+    except ValueError:
+        return None
+
+def _eventos_sse(bloco, pendente):
+    """Linhas `data:` completas em `pendente + bloco`; retorna (dados, resto)."""
+    linhas = (pendente + bloco).split(b"\n")
+    dados = [l[5:].strip() for l in linhas[:-1] if l.startswith(b"data:")]
+    return dados, linhas[-1]
+
+class ClienteLLM:
+    def __init__(self, url_base, modelo=MODELO_PADRAO, chave_api=None, max_conexoes=8, tentativas=4,
+                 backoff_base=0.5, backoff_max=8.0, timeout=120.0, parametros=None):
+        """
+        `url_base` é a raiz da API (ex.: https://api.openai.com/v1). `timeout`
+        vale para cada leitura (conexão, cabeçalhos e cada trecho do stream).
+        `parametros` são campos extras do corpo (temperature, max_tokens...).
+        """
+        url = urlsplit(url_base)
+        https = url.scheme == "https"
+        self.modelo = modelo
+        self.chave_api = chave_api
+        self.tentativas = tentativas
+        self.backoff_base, self.backoff_max = backoff_base, backoff_max
+        self.timeout = timeout
+        self.parametros = parametros or {}
+        self._host = url.hostname
+        self._caminho = url.path.rstrip("/") + "/chat/completions"
+        self._pool = PoolConexoes(url.hostname, url.port or (443 if https else 80),
+                                  ssl.create_default_context() if https else None, max_conexoes)
+        self.contadores = dict.fromkeys(("requisicoes", "novas_tentativas", "violacoes", "falhas"), 0)
+
+    def _requisicao(self, prompt, stream):
+        corpo = json.dumps({"model": self.modelo, "messages": [{"role": "user", "content": prompt}],
+                            "stream": stream, **self.parametros}, ensure_ascii=False).encode("utf-8")
+        cabecalhos = [f"POST {self._caminho} HTTP/1.1", f"Host: {self._host}",
+                      "Content-Type: application/json", f"Content-Length: {len(corpo)}",
+                      f"Accept: {'text/event-stream' if stream else 'application/json'}"]
+        if self.chave_api:
+            cabecalhos.append(f"Authorization: Bearer {self.chave_api}")
+        return ("\r\n".join(cabecalhos) + "\r\n\r\n").encode("latin-1") + corpo
+
+    def _espera(self, tentativa, retry_after):
+        """Backoff exponencial com jitter completo; nunca menos que o Retry-After do servidor."""
+        espera = random.uniform(0, min(self.backoff_max, self.backoff_base * 2 ** tentativa))
+        return max(espera, retry_after or 0)
+
+    async def _uma_vez(self, prompt, stream):
+        """Uma requisição: gera os trechos de texto da resposta."""
+        self.contadores["requisicoes"] += 1
+        try:
+            conexao = await asyncio.wait_for(self._pool.obter(), self.timeout)
+        except (OSError, asyncio.TimeoutError) as e:
+            raise ErroLLM(f"falha ao conectar: {e!r}", repetivel=True) from None
+        reader, writer = conexao
+        reutilizar = False
+        try:
+            writer.write(self._requisicao(prompt, stream))
+            await writer.drain()
+            status, cabecalhos = await asyncio.wait_for(_ler_cabecalho(reader), self.timeout)
+            corpo = _ler_corpo(reader, cabecalhos)
+            if status != 200:
+                erro = b"".join([b async for b in corpo])[:500].decode("utf-8", "replace")
+                raise ErroLLM(f"HTTP {status}: {erro}", status, status in STATUS_REPETIVEIS,
+                              _retry_after(cabecalhos.get("retry-after")))
+            if stream:
+                pendente = b""
+                while True:
+                    try:
+                        bloco = await asyncio.wait_for(corpo.__anext__(), self.timeout)
+                    except StopAsyncIteration:
+                        break
+                    dados, pendente = _eventos_sse(bloco, pendente)
+                    for dado in dados:
+                        if dado == b"[DONE]":
+                            continue
+                        escolhas = json.loads(dado).get("choices") or [{}]
+                        texto = (escolhas[0].get("delta") or {}).get("content")
+                        if texto:
+                            yield texto
+            else:
+                resposta = json.loads(b"".join([b async for b in corpo]))
+                yield resposta["choices"][0]["message"]["content"] or ""
+            reutilizar = cabecalhos.get("connection", "").lower() != "close" and (
+                "content-length" in cabecalhos or "chunked" in cabecalhos.get("transfer-encoding", "").lower())
+        except (OSError, asyncio.IncompleteReadError, asyncio.LimitOverrunError, asyncio.TimeoutError) as e:
+            raise ErroLLM(f"falha na conexão: {e!r}", repetivel=True) from None
+        except (ValueError, KeyError, IndexError) as e:
+            raise ErroLLM(f"resposta inválida: {e!r}") from None
+        finally:
+            self._pool.devolver(conexao, reutilizar)
+
+    async def stream(self, prompt):
+        """
+        Trechos da resposta conforme chegam. Falhas antes do primeiro trecho
+        são repetidas; depois dele o erro é propagado (o texto parcial já foi
+        entregue). Interromper a iteração fecha a conexão.
+        """
+        for tentativa in range(self.tentativas):
+            recebeu = False
+            try:
+                # aclosing: se o consumidor parar no meio, a conexão é liberada na hora
+                async with aclosing(self._uma_vez(prompt, stream=True)) as trechos:
+                    async for trecho in trechos:
+                        recebeu = True
+                        yield trecho
+                return
+            except ErroLLM as e:
+                if recebeu or not e.repetivel or tentativa == self.tentativas - 1:
+                    self.contadores["falhas"] += 1
+                    raise
+                self.contadores["novas_tentativas"] += 1
+                await asyncio.sleep(self._espera(tentativa, e.retry_after))
+
+    async def completar(self, prompt, stream=True):
+        """Texto completo da resposta (via streaming ou numa única resposta JSON)."""
+        if stream:
+            return "".join([t async for t in self.stream(prompt)])
+        for tentativa in range(self.tentativas):
+            try:
+                return "".join([t async for t in self._uma_vez(prompt, stream=False)])
+            except ErroLLM as e:
+                if not e.repetivel or tentativa == self.tentativas - 1:
+                    self.contadores["falhas"] += 1
+                    raise
+                self.contadores["novas_tentativas"] += 1
+                await asyncio.sleep(self._espera(tentativa, e.retry_after))
+
+    async def compor(self, prompt, tentativas=None):
+        """
+        SaidaModelo da resposta, validada enquanto chega. Numa violação do
+        contrato de saída a requisição é interrompida na hora e refeita (sem
+        backoff: o servidor respondeu), até `tentativas` vezes.
+        """
+        tentativas = tentativas or self.tentativas
+        for tentativa in range(tentativas):
+            try:
+                return await validar_stream(self.stream(prompt))
+            except ViolacaoSaida:
+                self.contadores["violacoes"] += 1
+                if tentativa == tentativas - 1:
+                    self.contadores["falhas"] += 1
+                    raise
+
+    async def fechar(self):
+        await self._pool.fechar()
+
+async def despachar(cliente, prompts, concorrencia=8, ao_concluir=None, validar=False):
+    """
+    Envia `prompts` com no máximo `concorrencia` requisições em voo e
+    retorna um Resultado por prompt, na ordem de entrada. Erros não
+    interrompem o lote: ficam em Resultado.erro. `ao_concluir(resultado)`
+    é chamado assim que cada um termina. Com `validar`, usa
+    ClienteLLM.compor e preenche Resultado.saida.
+    """
+    limite = asyncio.Semaphore(concorrencia)
+
+    async def enviar(indice, prompt):
+        async with limite:
+            inicio = time.perf_counter()
+            texto = saida = erro = None
+            try:
+                if validar:
+                    saida = await cliente.compor(prompt)
+                    texto = saida.texto
+                else:
+                    texto = await cliente.completar(prompt)
+            except (ErroLLM, ViolacaoSaida) as e:
+                erro = str(e)
+            resultado = Resultado(indice, texto, erro, time.perf_counter() - inicio, saida)
+            if ao_concluir:
+                ao_concluir(resultado)
+            return resultado
+
+    return await asyncio.gather(*(enviar(i, p) for i, p in enumerate(prompts)))
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera prompts a partir de um JSONL de campos e os envia a uma LLM.")
+    parser.add_argument("entrada", help="Arquivo JSONL com os campos ('-' para stdin)")
+    parser.add_argument("-o", "--saida", default="-", help="JSONL de respostas ('-' para stdout)")
+    parser.add_argument("--url", default=os.environ.get("SUNO_MAESTRO_LLM_URL", "https://api.openai.com/v1"))
+    parser.add_argument("--modelo", default=MODELO_PADRAO)
+    parser.add_argument("-c", "--concorrencia", type=int, default=8)
+    parser.add_argument("--tentativas", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--validar", action="store_true",
+                        help="Valida o formato da resposta durante o stream e grava título, seções e prompt do Suno")
+    args = parser.parse_args(argv)
+
+    from core.generator import SunoMaestroCore
+
+    entrada = sys.stdin if args.entrada == "-" else open(args.entrada, "r", encoding="utf-8")
+    with entrada:
+        lista_campos = [json.loads(l) for l in entrada if l.strip()]
+    prompts = SunoMaestroCore(base_path=ROOT).gerar_prompts(lista_campos)
+
+    chave = os.environ.get("SUNO_MAESTRO_LLM_KEY") or os.environ.get("OPENAI_API_KEY")
+    cliente = ClienteLLM(args.url, args.modelo, chave, max_conexoes=args.concorrencia,
+                         tentativas=args.tentativas, timeout=args.timeout)
+    saida = sys.stdout if args.saida == "-" else open(args.saida, "w", encoding="utf-8")
+
+    def gravar(r):
+        registro = {"linha": r.indice + 1, "resposta": r.texto, "erro": r.erro, "segundos": round(r.segundos, 3)}
+        if r.saida:
+            registro.update(titulo=r.saida.titulo, prompt_suno=r.saida.prompt_suno,
+                            secoes=[s._asdict() for s in r.saida.secoes], avisos=r.saida.avisos)
+        saida.write(json.dumps(registro, ensure_ascii=False) + "\n")
+
+    async def executar():
+        try:
+            return await despachar(cliente, prompts, args.concorrencia, ao_concluir=gravar, validar=args.validar)
+        finally:
+            await cliente.fechar()
+
+    inicio = time.perf_counter()
+    try:
+        resultados = asyncio.run(executar())
+    finally:
+        if saida is not sys.stdout: saida.close()
+    total = time.perf_counter() - inicio
+    erros = sum(1 for r in resultados if r.erro)
+    print(f"{len(resultados)} prompts enviados em {total:.1f} s ({len(resultados) / total:.1f}/s), "
+          f"{erros} com erro, {cliente.contadores['novas_tentativas']} novas tentativas, "
+          f"{cliente.contadores['violacoes']} respostas fora do formato.", file=sys.stderr)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,191 @@
+"""
+Leitura incremental da resposta do modelo e validação do contrato de saída
+definido no template (OUTPUT ORDER e prompt_for_suno_5):
+
+    # Title               uma linha (ou o valor na própria linha: # Title: ...)
+    ─────────────
+    # Lyrics              seções, cada uma iniciada por uma marcação
+                          instrumental [Seção: descrição] de até 16 palavras
+    ─────────────
+    # Prompt for Suno     texto corrido, sem marcadores, 3 a 6 frases,
+                          no máximo 1000 caracteres
+
+O ParserSaida recebe o texto em trechos (como chegam do stream) e valida
+cada linha assim que ela se completa; violações levantam ViolacaoSaida na
+hora, inclusive no meio de uma linha quando já é possível decidir (marcação
+longa demais, prompt acima do limite), para que uma nova tentativa comece
+sem esperar o fim da resposta. As linhas separadoras são opcionais.
+
+O template só *prefere* marcações de 9 a 12 palavras (os próprios exemplos
+dele têm 5 a 8): fora dessa faixa, até o máximo, a marcação é aceita e
+registrada em SaidaModelo.avisos.
+"""
+import re
+from collections import namedtuple
+from contextlib import aclosing
+
+# Seções na ordem exigida -> cabeçalho
+CABECALHOS = {"titulo": "# Title", "letra": "# Lyrics", "prompt_suno": "# Prompt for Suno"}
+ORDEM_SECOES = tuple(CABECALHOS)
+_SECAO_DO_CABECALHO = {c.lower(): s for s, c in CABECALHOS.items()}
+PALAVRAS_MARCACAO_PREFERIDAS = (9, 12)
+MAX_PALAVRAS_MARCACAO = 16
+MAX_CARACTERES_SUNO = 1000
+FRASES_SUNO = (3, 6)
+
+SaidaModelo = namedtuple("SaidaModelo", "titulo secoes prompt_suno texto avisos")
+SecaoLetra = namedtuple("SecaoLetra", "nome marcacao versos")
+
+_SEPARADOR = re.compile(r"^[─━—=\-_]{3,}$")
+_MARCACAO = re.compile(r"^\[([^\]:]+):\s*([^\]]*)\]$")
+_MARCADOR_LISTA = re.compile(r"^(?:[-*•]\s|\d+[.)]\s)")
+_FIM_FRASE = re.compile(r"[.!?](?:\s|$)")
+
+class ViolacaoSaida(ValueError):
+    def __init__(self, secao, mensagem, linha):
+        super().__init__(f"{secao or 'início'} (linha {linha}): {mensagem}")
+        self.secao = secao
+        self.linha = linha
+
+class ParserSaida:
+    def __init__(self):
+        self.secao = None
+        self.n_linha = 0
+        self.titulo = None
+        self.secoes = []
+        self._suno = []
+        self._caracteres_suno = 0
+        self._pendente = ""
+        self._texto = []
+        self.avisos = []
+
+    def _violacao(self, mensagem):
+        raise ViolacaoSaida(self.secao, mensagem, self.n_linha + 1)
+
+    def alimentar(self, trecho):
+        """Consome um trecho do stream; levanta ViolacaoSaida assim que o contrato é quebrado."""
+        self._texto.append(trecho)
+        linhas = (self._pendente + trecho).split("\n")
+        self._pendente = linhas.pop()
+        for linha in linhas:
+            self._linha(linha.rstrip("\r"))
+            self.n_linha += 1
+        if self._pendente:
+            self._linha_parcial(self._pendente)
+
+    def _linha_parcial(self, parcial):
+        """Verificações que não precisam esperar o fim da linha."""
+        if self.secao == "letra" and parcial.lstrip().startswith("["):
+            descricao = parcial.partition(":")[2]
+            if len(descricao.split()) > MAX_PALAVRAS_MARCACAO:
+                self._violacao(f"marcação instrumental com mais de {MAX_PALAVRAS_MARCACAO} palavras")
+        elif self.secao == "prompt_suno":
+            self._checar_tamanho_suno(len(parcial.strip()) + (1 if self._suno else 0))
+
+    def _checar_tamanho_suno(self, extra=0):
+        if self._caracteres_suno + extra > MAX_CARACTERES_SUNO:
+            self._violacao(f"prompt do Suno com mais de {MAX_CARACTERES_SUNO} caracteres")
+
+    def _linha(self, linha):
+        texto = linha.strip()
+        if texto.startswith("#"):
+            # Aceita o valor na linha do cabeçalho: "# Title: Luz da Estrada"
+            cabecalho, _, valor = texto.partition(":")
+            secao = _SECAO_DO_CABECALHO.get(cabecalho.strip().lower())
+            if secao:
+                self._abrir(secao)
+                if valor.strip():
+                    self._conteudo(valor.strip())
+                return
+        if not texto or _SEPARADOR.match(texto):
+            if texto and self.secao is None:
+                self._violacao("separador antes de # Title")
+            return
+        self._conteudo(texto)
+
+    def _conteudo(self, texto):
+        if self.secao is None:
+            self._violacao("texto antes de # Title")
+        elif self.secao == "titulo":
+            if self.titulo is not None:
+                self._violacao("o título deve ter uma única linha")
+            self.titulo = texto
+        elif self.secao == "letra":
+            self._linha_letra(texto)
+        else:
+            self._linha_suno(texto)
+
+    def _proxima(self):
+        """Seção que deve vir depois da atual (None depois da última)."""
+        indice = ORDEM_SECOES.index(self.secao) + 1 if self.secao else 0
+        return ORDEM_SECOES[indice] if indice < len(ORDEM_SECOES) else None
+
+    def _abrir(self, secao):
+        esperada = self._proxima()
+        if secao != esperada:
+            self._violacao(f"{CABECALHOS[secao]} fora de ordem"
+                           + (f" (esperado {CABECALHOS[esperada]})" if esperada else ""))
+        if self.secao == "titulo" and not self.titulo:
+            self._violacao("título vazio")
+        if self.secao == "letra" and not self.secoes:
+            self._violacao("letra sem seções")
+        self.secao = secao
+
+    def _linha_letra(self, texto):
+        if texto.startswith("["):
+            m = _MARCACAO.match(texto)
+            if not m:
+                self._violacao(f"marcação sem descrição instrumental: {texto}")
+            palavras = len(m.group(2).split())
+            minimo, preferido = PALAVRAS_MARCACAO_PREFERIDAS
+            if palavras > MAX_PALAVRAS_MARCACAO:
+                self._violacao(f"marcação instrumental com {palavras} palavras (máximo {MAX_PALAVRAS_MARCACAO})")
+            if not minimo <= palavras <= preferido:
+                self.avisos.append(f"linha {self.n_linha + 1}: marcação instrumental com {palavras} palavras "
+                                   f"(preferido {minimo}–{preferido})")
+            self.secoes.append(SecaoLetra(m.group(1).strip(), m.group(2).strip(), []))
+        elif not self.secoes:
+            self._violacao("versos antes da primeira marcação instrumental")
+        else:
+            self.secoes[-1].versos.append(texto)
+
+    def _linha_suno(self, texto):
+        if _MARCADOR_LISTA.match(texto):
+            self._violacao("o prompt do Suno deve ser texto corrido, sem marcadores")
+        # Quebras de linha contam como um espaço entre as partes
+        self._caracteres_suno += len(texto) + (1 if self._suno else 0)
+        self._suno.append(texto)
+        self._checar_tamanho_suno()
+
+    def finalizar(self):
+        """Processa o resto do texto, confere o que só pode ser visto no fim e retorna a SaidaModelo."""
+        if self._pendente:
+            pendente, self._pendente = self._pendente, ""
+            self._linha(pendente)
+            self.n_linha += 1
+        faltando = self._proxima()
+        if faltando:
+            self._violacao(f"resposta terminou sem {CABECALHOS[faltando]}")
+        prompt_suno = " ".join(self._suno)
+        frases = len(_FIM_FRASE.findall(prompt_suno))
+        if not FRASES_SUNO[0] <= frases <= FRASES_SUNO[1]:
+            self._violacao(f"prompt do Suno com {frases} frases (esperado {FRASES_SUNO[0]}–{FRASES_SUNO[1]})")
+        return SaidaModelo(self.titulo, self.secoes, prompt_suno, "".join(self._texto), self.avisos)
+
+def validar(texto):
+    """Valida uma resposta completa e retorna a SaidaModelo (ou levanta ViolacaoSaida)."""
+    parser = ParserSaida()
+    parser.alimentar(texto)
+    return parser.finalizar()
+
+async def validar_stream(trechos):
+    """
+    Consome um iterável assíncrono de trechos (ex.: ClienteLLM.stream),
+    validando conforme chegam. Numa violação o stream é fechado na hora
+    (liberando a conexão) e a ViolacaoSaida é propagada.
+    """
+    parser = ParserSaida()
+    async with aclosing(trechos):
+        async for trecho in trechos:
+            parser.alimentar(trecho)
+    return parser.finalizar()
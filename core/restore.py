@@ -0,0 +1,137 @@
+"""
+Restauração de campos a partir do texto de um prompt gerado.
+
+Prompts gerados com `incluir_spec` trazem no fim a linha
+`# suno-maestro-spec: {json}` (core.generator.bloco_spec), lida de volta sem
+perdas. Prompts antigos, sem o bloco, passam por um único scanner
+pré-compilado sobre a seção USER_INPUTS, em uma só passada pelo texto.
+A importação aceita esses .txt, o ZIP e o JSONL exportados pelo histórico
+(core.export), preservando a data original de cada entrada.
+"""
+import io
+import json
+import math
+import re
+import time
+import zipfile
+
+from core.generator import MARCADOR_SPEC
+from core.history import novo_item
+from core.spec import AUTOMATIC_INPUT, CAMPOS_PROMPT
+
+# Maior timestamp aceito na importação (fim de 2107, o limite das datas no ZIP)
+TS_MAXIMO = 4354819199.0
+
+# Chave no texto do prompt -> campo da UI
+CHAVES_PROMPT = {
+    "primary_genre": "genero", "specific_style": "ritmo",
+    "recording_aesthetic": "tipo_de_gravacao", "artistic_influence": "influencia_estetica",
+    "emotional_vibe": "vibe_emocional", "external_refs": "referencia",
+    "language": "idioma", "topic": "tema", "core_message": "mensagem",
+    "keywords": "palavras_chave", "target_audience": "publico",
+    "narrator_perspective": "narrador", "structure_format": "estrutura",
+    "lyrical_tone": "tom",
+    "male_vocal_specs": "vocal_masculino",
+    "female_vocal_specs": "vocal_feminino",
+}
+
+_SCANNER = re.compile(r'^[ \t]*(%s):[ \t]*"(.*)"[ \t]*$' % "|".join(CHAVES_PROMPT), re.MULTILINE)
+_FIM_USER_INPUTS = "AUTOMATIC_INPUTS:"
+
+def ler_spec(texto):
+    """Campos do bloco de spec embutido, ou None se o texto não tiver um bloco válido."""
+    inicio = texto.rfind(MARCADOR_SPEC)
+    if inicio < 0:
+        return None
+    inicio += len(MARCADOR_SPEC)
+    fim = texto.find("\n", inicio)
+    try:
+        spec = json.loads(texto[inicio:fim if fim >= 0 else len(texto)])
+    except ValueError:
+        return None
+    campos = spec.get("campos") if isinstance(spec, dict) else None
+    if not isinstance(campos, dict):
+        return None
+    return {k: v for k, v in campos.items() if k in CAMPOS_PROMPT and isinstance(v, str) and v}
+
+def escanear(texto):
+    """Campos preenchidos lidos das linhas `chave: "valor"` da seção USER_INPUTS (prompts sem spec)."""
+    fim = texto.find(_FIM_USER_INPUTS)
+    campos = {}
+    for m in _SCANNER.finditer(texto, 0, fim if fim >= 0 else len(texto)):
+        campo, valor = CHAVES_PROMPT[m.group(1)], m.group(2).strip()
+        if not valor or AUTOMATIC_INPUT in valor or valor.lower() == "none":
+            continue
+        if campo == "vibe_emocional":
+            # Versões antigas gravavam a lista como repr: ['a', 'b']
+            limpo = valor.translate({ord(c): None for c in "[]'\""})
+            valor = ", ".join(v.strip() for v in limpo.split(",") if v.strip())
+        campos[campo] = valor
+    return campos
+
+def extrair_campos(texto):
+    """Spec compacta ({campo: texto}) recuperada de um prompt, com ou sem bloco de spec."""
+    campos = ler_spec(texto)
+    return campos if campos is not None else escanear(texto)
+
+def _ts_valido(ts, padrao):
+    """`ts` se for uma data plausível (depois de 1970, até TS_MAXIMO); senão `padrao`."""
+    return ts if math.isfinite(ts) and 0 < ts <= TS_MAXIMO else padrao
+
+def _importar_jsonl(nome, conteudo, itens, ignorados):
+    """
+    Linhas {"ts", "campos", ...} da exportação JSONL (gravada do mais novo para
+    o mais antigo). Um ts fora da faixa vira o horário da importação, como nos .txt.
+    """
+    lidos = []
+    agora = time.time()
+    for n, linha in enumerate(conteudo.decode("utf-8-sig", "replace").splitlines(), 1):
+        if not linha.strip():
+            continue
+        try:
+            registro = json.loads(linha)
+            campos = {k: v for k, v in registro["campos"].items() if k in CAMPOS_PROMPT and v}
+            ts = _ts_valido(float(registro["ts"]), agora)
+        except (ValueError, TypeError, KeyError, AttributeError):
+            campos = None
+        if campos:
+            lidos.append(novo_item(campos, ts))
+        else:
+            ignorados.append(f"{nome}:{n}")
+    itens.extend(reversed(lidos))
+
+def importar_arquivos(arquivos):
+    """
+    Converte prompts salvos em entradas de histórico. `arquivos` é um iterável
+    de (nome, bytes) com .txt, .zip ou .jsonl (as exportações do histórico).
+    Retorna (itens, ignorados), com os itens do mais antigo para o mais novo.
+    """
+    itens, ignorados = [], []
+
+    def adicionar(nome, conteudo, ts):
+        try:
+            campos = extrair_campos(conteudo.decode("utf-8-sig"))
+        except UnicodeDecodeError:
+            campos = None
+        if campos:
+            itens.append(novo_item(campos, ts))
+        else:
+            ignorados.append(nome)
+
+    for nome, conteudo in arquivos:
+        if nome.lower().endswith(".jsonl"):
+            _importar_jsonl(nome, conteudo, itens, ignorados)
+        elif nome.lower().endswith(".zip"):
+            try:
+                with zipfile.ZipFile(io.BytesIO(conteudo)) as zip_file:
+                    # A exportação grava do mais novo para o mais antigo, com a data
+                    # de cada entrada em date_time
+                    for info in reversed(zip_file.infolist()):
+                        if info.filename.lower().endswith(".txt"):
+                            adicionar(f"{nome}/{info.filename}", zip_file.read(info),
+                                      time.mktime(info.date_time + (0, 0, -1)))
+            except zipfile.BadZipFile:
+                ignorados.append(nome)
+        else:
+            adicionar(nome, conteudo, time.time())
+    return itens, ignorados
@@ -0,0 +1,234 @@
+"""
+Sorteio vetorizado (NumPy) de configurações completas de prompt.
+
+Cada catálogo é achatado uma vez em arrays (nomes, offset e quantidade de
+itens por categoria), e os sorteios de N configurações são feitos de uma vez
+sobre esses arrays, com um gerador explícito (`seed`) para reprodutibilidade.
+As regras replicam os callbacks de aleatório da UI:
+  - gênero/ritmo: gênero uniforme, ritmo uniforme dentro dele (com a estrutura);
+  - tags (tom, influência, vocais): 1 a 4 categorias distintas, 1 item de cada;
+  - campos hierárquicos: 1 categoria e 1 item;
+  - vibes: 3 a 5 sorteios de categoria + item, sem repetir vibes.
+Se o dataset tiver a tabela de afinidade (core.affinity), o sorteio passa a
+ser ponderado pela compatibilidade entre gênero e atributos.
+
+Uso (gera specs para o core.cli):
+    python -m core.sampler -n 10000 --seed 42 > specs.jsonl
+"""
+import argparse
+import json
+import os
+import sys
+
+import numpy as np
+
+from core import affinity
+from core.generator import SunoMaestroCore
+from core.index import nome_item
+
+CAMPOS_TAGS = {"tom": "tom", "influencia_estetica": "influencia_estetica",
+               "vocal_masculino": "tipo_vocal", "vocal_feminino": "tipo_vocal"}
+CAMPOS_HIER = ("publico", "tipo_de_gravacao", "narrador")
+MAX_CATEGORIAS_TAGS = 4
+FAIXA_VIBES = (3, 5)
+
+class TabelaCatalogo:
+    """Catálogo {categoria: [itens]} achatado em arrays; categorias vazias são descartadas."""
+
+    def __init__(self, catalogo):
+        self.categorias, nomes, extras, offsets, contagens = [], [], [], [], []
+        for cat, itens in (catalogo or {}).items():
+            validos = [i for i in itens if i]
+            if not validos:
+                continue
+            self.categorias.append(cat)
+            offsets.append(len(nomes))
+            contagens.append(len(validos))
+            for item in validos:
+                nomes.append(nome_item(item))
+                extras.append(item[1] if isinstance(item, list) and len(item) > 1 else "")
+        self.nomes = np.array(nomes, dtype=object)
+        self.extras = np.array(extras, dtype=object)
+        self.offsets = np.array(offsets, dtype=np.int64)
+        self.contagens = np.array(contagens, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.categorias)
+
+    def itens(self, rng, cats):
+        """Para cada índice de categoria em `cats` (qualquer shape), sorteia um item uniforme."""
+        return self.offsets[cats] + (rng.random(cats.shape) * self.contagens[cats]).astype(np.int64)
+
+    def categorias_de(self, idx):
+        """Índice da categoria de cada item em `idx`."""
+        return np.searchsorted(self.offsets, idx, side="right") - 1
+
+def gerador(seed=None):
+    """Gerador NumPy a partir de uma seed (ou reaproveita um Generator já criado)."""
+    return seed if isinstance(seed, np.random.Generator) else np.random.default_rng(seed)
+
+def sortear_uniforme(tabela, n, rng):
+    """Índices (n,) de itens: categoria uniforme e item uniforme dentro dela."""
+    return tabela.itens(rng, rng.integers(0, len(tabela), n))
+
+def sortear_tags(tabela, n, rng, max_categorias=MAX_CATEGORIAS_TAGS):
+    """n strings "tag1, tag2": de 1 a `max_categorias` categorias distintas, 1 item de cada."""
+    if not len(tabela):
+        return [""] * n
+    m = min(max_categorias, len(tabela))
+    k = rng.integers(1, m + 1, n)
+    # Permutação aleatória por linha: as m primeiras colunas são categorias distintas
+    cats = np.argsort(rng.random((n, len(tabela))), axis=1)[:, :m]
+    nomes = tabela.nomes[tabela.itens(rng, cats)]
+    return [", ".join(linha[:ki]) for linha, ki in zip(nomes.tolist(), k.tolist())]
+
+def sortear_vibes(tabela, n, rng, faixa=FAIXA_VIBES):
+    """n listas com 3 a 5 vibes sorteadas (repetições descartadas, ordem preservada)."""
+    if not len(tabela):
+        return [[] for _ in range(n)]
+    minimo, maximo = faixa
+    k = rng.integers(minimo, maximo + 1, n)
+    nomes = tabela.nomes[tabela.itens(rng, rng.integers(0, len(tabela), (n, maximo)))]
+    return [list(dict.fromkeys(linha[:ki])) for linha, ki in zip(nomes.tolist(), k.tolist())]
+
+def sortear_hier(tabela, n, rng):
+    """n nomes sorteados (categoria + item), ou "" se o catálogo estiver vazio."""
+    if not len(tabela):
+        return [""] * n
+    return tabela.nomes[sortear_uniforme(tabela, n, rng)].tolist()
+
+def sortear_com_categoria(tabela, n, rng):
+    """n pares (categoria, índice do item) sorteados uniformemente."""
+    idx = sortear_uniforme(tabela, n, rng)
+    categorias = np.array(tabela.categorias, dtype=object)
+    return list(zip(categorias[tabela.categorias_de(idx)].tolist(), idx.tolist()))
+
+class Amostrador:
+    def __init__(self, dados):
+        self.hierarquia = TabelaCatalogo(dados.get("hierarquia"))
+        self.tabelas = {cat: TabelaCatalogo(dados.get(cat))
+                        for cat in set(CAMPOS_TAGS.values()) | set(CAMPOS_HIER) | {"vibe_emocional"}}
+        self.afinidade = None
+        if dados.get("afinidade") and len(self.hierarquia):
+            tabelas = {cat: t for cat, t in self.tabelas.items() if len(t)}
+            self.afinidade = affinity.MatrizAfinidade(dados["afinidade"], self.hierarquia.categorias, tabelas)
+
+    def amostrar(self, n, seed=None, afinidade=True):
+        """
+        Sorteia `n` configurações completas e retorna uma lista de dicionários de campos.
+        Com `afinidade` (e a tabela presente no dataset) usa o sorteio ponderado.
+        """
+        rng = gerador(seed)
+        if afinidade and self.afinidade is not None:
+            colunas = self._amostrar_ponderado(n, rng)
+        else:
+            colunas = self._amostrar_uniforme(n, rng)
+        chaves = list(colunas)
+        return [dict(zip(chaves, linha)) for linha in zip(*colunas.values())]
+
+    def estruturas(self, n, seed=None, genero=None):
+        """
+        Sorteia `n` estruturas como em `amostrar` (a do ritmo sorteado), entre
+        os ritmos que têm estrutura. Com `genero` o sorteio fica restrito aos
+        ritmos dele (se algum tiver estrutura). Retorna "" sem candidatos.
+        """
+        hier = self.hierarquia
+        candidatos = np.flatnonzero(hier.extras.astype(bool)) if len(hier) else np.array([], dtype=np.int64)
+        if genero in hier.categorias:
+            g = hier.categorias.index(genero)
+            do_genero = candidatos[hier.categorias_de(candidatos) == g]
+            if len(do_genero):
+                candidatos = do_genero
+        if not len(candidatos):
+            return [""] * n
+        return hier.extras[gerador(seed).choice(candidatos, n)].tolist()
+
+    def _amostrar_uniforme(self, n, rng):
+        colunas = {}
+        if len(self.hierarquia):
+            idx = sortear_uniforme(self.hierarquia, n, rng)
+            generos = np.array(self.hierarquia.categorias, dtype=object)
+            colunas["genero"] = generos[self.hierarquia.categorias_de(idx)].tolist()
+            colunas["ritmo"] = self.hierarquia.nomes[idx].tolist()
+            colunas["estrutura"] = self.hierarquia.extras[idx].tolist()
+        else:
+            colunas["genero"] = colunas["ritmo"] = colunas["estrutura"] = [""] * n
+
+        for campo, catalogo in CAMPOS_TAGS.items():
+            colunas[campo] = sortear_tags(self.tabelas[catalogo], n, rng)
+        for campo in CAMPOS_HIER:
+            colunas[campo] = sortear_hier(self.tabelas[campo], n, rng)
+        colunas["vibe_emocional"] = sortear_vibes(self.tabelas["vibe_emocional"], n, rng)
+        return colunas
+
+    def _campos_por_catalogo(self):
+        """(campo, catálogo) de todos os campos sorteados a partir de catálogos não vazios."""
+        pares = list(CAMPOS_TAGS.items()) + [(c, c) for c in CAMPOS_HIER] + [("vibe_emocional", "vibe_emocional")]
+        return [(campo, cat) for campo, cat in pares if len(self.tabelas[cat])]
+
+    @staticmethod
+    def _sorteios(campo, tabela):
+        """Quantidades possíveis de itens sorteados para o campo (todas igualmente prováveis)."""
+        if campo in CAMPOS_TAGS:
+            return range(1, min(MAX_CATEGORIAS_TAGS, len(tabela)) + 1)
+        if campo == "vibe_emocional":
+            return range(FAIXA_VIBES[0], FAIXA_VIBES[1] + 1)
+        return (1,)
+
+    def _amostrar_ponderado(self, n, rng):
+        matriz, hier = self.afinidade, self.hierarquia
+        campos = self._campos_por_catalogo()
+
+        # 1. Gênero pela marginal: base uniforme × Π E_k[Z_campo(gênero)^k] (ver core.affinity)
+        marginal = np.ones(len(hier))
+        for campo, catalogo in campos:
+            tabela = self.tabelas[catalogo]
+            z = matriz.normalizador(catalogo, affinity.probabilidade_base(tabela))
+            marginal *= affinity.media_potencias(z, self._sorteios(campo, tabela))
+        g = np.searchsorted(np.cumsum(marginal), rng.random(n) * marginal.sum(), side="right")
+        g = np.minimum(g, len(hier) - 1)
+        ritmo = hier.itens(rng, g)
+
+        colunas = {
+            "genero": np.array(hier.categorias, dtype=object)[g].tolist(),
+            "ritmo": hier.nomes[ritmo].tolist(),
+            "estrutura": hier.extras[ritmo].tolist(),
+        }
+        for campo in (*CAMPOS_TAGS, *CAMPOS_HIER):
+            colunas[campo] = [""] * n
+        colunas["vibe_emocional"] = [[] for _ in range(n)]
+
+        # 2. Atributos condicionados ao gênero, em lote por gênero
+        for gi in np.unique(g).tolist():
+            linhas = np.flatnonzero(g == gi)
+            for campo, catalogo in campos:
+                tabela = self.tabelas[catalogo]
+                w = matriz.pesos(catalogo, gi, len(tabela.nomes))
+                if campo in CAMPOS_TAGS:
+                    valores = affinity.sortear_tags(tabela, w, rng, len(linhas), MAX_CATEGORIAS_TAGS)
+                elif campo == "vibe_emocional":
+                    minimo, maximo = FAIXA_VIBES
+                    k = rng.integers(minimo, maximo + 1, len(linhas))
+                    idx = affinity.sortear_itens(tabela, w, rng, (len(linhas), maximo))
+                    valores = [list(dict.fromkeys(tabela.nomes[i] for i in linha[:ki] if i >= 0))
+                               for linha, ki in zip(idx.tolist(), k.tolist())]
+                else:
+                    idx = affinity.sortear_itens(tabela, w, rng, len(linhas))
+                    valores = [tabela.nomes[i] if i >= 0 else "" for i in idx.tolist()]
+                coluna = colunas[campo]
+                for linha, valor in zip(linhas.tolist(), valores):
+                    coluna[linha] = valor
+        return colunas
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Sorteia configurações de prompt em JSONL.")
+    parser.add_argument("-n", type=int, default=1000, help="Quantidade de configurações")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    core = SunoMaestroCore(base_path=os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    for campos in core.amostrador.amostrar(args.n, seed=args.seed):
+        sys.stdout.write(json.dumps(campos, ensure_ascii=False) + "\n")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Busca textual sobre todos os catálogos (nomes e descrições).
+
+O índice é montado uma vez por carga do dataset: cada item vira uma entrada
+(catálogo, categoria, nome, descrição) com o texto normalizado sem acentos.
+As consultas combinam um índice de prefixos (palavras ordenadas + bisect) com
+um índice de trigramas, que tolera erros de digitação.
+"""
+import unicodedata
+from bisect import bisect_left
+from collections import defaultdict, namedtuple
+
+from core.index import nome_item
+
+# Catálogos pesquisáveis e o rótulo exibido na UI
+CATALOGOS_BUSCA = {
+    "hierarquia": "Ritmo",
+    "tipo_de_gravacao": "Tipo de Gravação",
+    "influencia_estetica": "Influência Estética",
+    "vibe_emocional": "Vibe",
+    "publico": "Público",
+    "tom": "Tom Lírico",
+    "narrador": "Narrador",
+    "metatags": "Estrutura",
+    "tipo_vocal": "Vocal",
+}
+
+Resultado = namedtuple("Resultado", "catalogo categoria nome descricao")
+
+_PESO_NOME, _PESO_DESC = 2.0, 1.0
+# Fração mínima de trigramas da palavra buscada que precisa bater
+_LIMIAR_TRIGRAMAS = 0.5
+
+def normalizar(texto):
+    """Minúsculas, sem acentos e só com letras/dígitos separados por espaço."""
+    decomposto = unicodedata.normalize("NFKD", texto)
+    sem_acento = "".join(c for c in decomposto if not unicodedata.combining(c))
+    return "".join(c if c.isalnum() else " " for c in sem_acento.casefold())
+
+def _trigramas(palavra):
+    p = f" {palavra} "
+    return {p[i:i + 3] for i in range(len(p) - 2)}
+
+class IndiceBusca:
+    def __init__(self, dados):
+        self.entradas = []
+        # Por campo (0 = nome, 1 = descrição): palavra -> ids e trigrama -> ids
+        self._palavras = ({}, {})
+        self._trigramas = (defaultdict(set), defaultdict(set))
+
+        for catalogo in CATALOGOS_BUSCA:
+            conteudo = dados.get(catalogo)
+            if not isinstance(conteudo, dict):
+                continue
+            for categoria, itens in conteudo.items():
+                for item in itens:
+                    nome = nome_item(item)
+                    if catalogo == "hierarquia":
+                        # Em hierarquia o 2º campo é a estrutura; o gênero descreve melhor o ritmo
+                        descricao = categoria
+                    else:
+                        descricao = item[1] if isinstance(item, (list, tuple)) and len(item) > 1 else ""
+                    self._adicionar(Resultado(catalogo, categoria, nome, descricao))
+
+        self._ordenadas = tuple(sorted(p) for p in self._palavras)
+        self._trigramas = tuple({t: frozenset(ids) for t, ids in tri.items()} for tri in self._trigramas)
+
+    def _adicionar(self, entrada):
+        id_ = len(self.entradas)
+        self.entradas.append(entrada)
+        for campo, texto in enumerate((entrada.nome, entrada.descricao)):
+            for palavra in normalizar(texto).split():
+                self._palavras[campo].setdefault(palavra, set()).add(id_)
+                for tri in _trigramas(palavra):
+                    self._trigramas[campo][tri].add(id_)
+
+    def _por_prefixo(self, campo, termo):
+        palavras, ordenadas = self._palavras[campo], self._ordenadas[campo]
+        ids = set()
+        i = bisect_left(ordenadas, termo)
+        while i < len(ordenadas) and ordenadas[i].startswith(termo):
+            ids |= palavras[ordenadas[i]]
+            i += 1
+        return ids
+
+    def _por_trigramas(self, campo, termo):
+        """Retorna {id: fração de trigramas do termo presentes na entrada}."""
+        tris = _trigramas(termo)
+        contagem = defaultdict(int)
+        indice = self._trigramas[campo]
+        for tri in tris:
+            for id_ in indice.get(tri, ()):
+                contagem[id_] += 1
+        minimo = _LIMIAR_TRIGRAMAS * len(tris)
+        return {id_: n / len(tris) for id_, n in contagem.items() if n >= minimo}
+
+    def _pontuar_termo(self, termo):
+        """Pontuação de cada entrada que casa com o termo (prefixo vale mais que trigrama)."""
+        pontos = defaultdict(float)
+        for campo, peso in ((0, _PESO_NOME), (1, _PESO_DESC)):
+            prefixo = self._por_prefixo(campo, termo)
+            for id_ in prefixo:
+                pontos[id_] += 2 * peso
+            if len(termo) >= 3:
+                for id_, fracao in self._por_trigramas(campo, termo).items():
+                    if id_ not in prefixo:
+                        pontos[id_] += fracao * peso
+        return pontos
+
+    def buscar(self, consulta, limite=20):
+        """Retorna até `limite` Resultados que casam com todas as palavras da consulta."""
+        termos = normalizar(consulta).split()
+        if not termos:
+            return []
+
+        total = None
+        for termo in termos:
+            pontos = self._pontuar_termo(termo)
+            if total is None:
+                total = pontos
+            else:
+                total = {id_: total[id_] + p for id_, p in pontos.items() if id_ in total}
+            if not total:
+                return []
+
+        melhores = sorted(total.items(), key=lambda par: (-par[1], self.entradas[par[0]].nome))
+        return [self.entradas[id_] for id_, _ in melhores[:limite]]
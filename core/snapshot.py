@@ -0,0 +1,132 @@
+"""
+Snapshot binário do dataset para cold start rápido.
+
+`construir` junta, valida e serializa (marshal) todos os catálogos num único
+arquivo, junto com a assinatura (mtime, tamanho, sha256) de cada JSON de
+origem e um hash combinado do conteúdo. `carregar` devolve os dados do
+snapshot somente se todos os JSONs ainda batem com ele; caso contrário
+retorna None e o chamador volta a ler os JSONs.
+
+Uso (passo de build):
+    python -m core.snapshot            # gera dataset/dataset.snapshot
+"""
+import argparse
+import hashlib
+import json
+import marshal
+import os
+import sys
+
+from core.dataset import ARQUIVOS_MAP, validar_catalogo
+
+NOME_ARQUIVO = "dataset.snapshot"
+_MAGIC = b"SMSNAP\x00\x01"
+# marshal muda entre versões do Python: o snapshot só vale para a mesma versão
+_COMPATIBILIDADE = (marshal.version, sys.version_info[:2])
+
+class SnapshotInvalido(ValueError):
+    """O dataset não passou na validação e o snapshot não foi gerado."""
+
+def _assinatura(caminho, conteudo=None):
+    if conteudo is None:
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+    st_arq = os.stat(caminho)
+    return (st_arq.st_mtime_ns, st_arq.st_size, hashlib.sha256(conteudo).hexdigest())
+
+def hash_combinado(assinaturas):
+    """Hash único do dataset a partir dos sha256 de cada arquivo (ordem por chave)."""
+    h = hashlib.sha256()
+    for chave in sorted(assinaturas):
+        h.update(chave.encode("utf-8"))
+        h.update(assinaturas[chave][2].encode("ascii"))
+    return h.hexdigest()
+
+def construir(dataset_dir, arquivos_map, destino=None):
+    """Gera o snapshot e retorna o hash combinado. Levanta SnapshotInvalido se houver erros."""
+    destino = destino or os.path.join(dataset_dir, NOME_ARQUIVO)
+    arquivos, erros = {}, []
+    for chave, nome in arquivos_map.items():
+        caminho = os.path.join(dataset_dir, nome)
+        try:
+            with open(caminho, "rb") as f:
+                conteudo = f.read()
+            dados = json.loads(conteudo)
+        except FileNotFoundError:
+            erros.append(f"{chave}: arquivo não encontrado ({nome})")
+            continue
+        except (json.JSONDecodeError, UnicodeDecodeError) as e:
+            erros.append(f"{chave}: JSON inválido em {nome} ({e})")
+            continue
+        erros.extend(validar_catalogo(chave, dados))
+        arquivos[chave] = (_assinatura(caminho, conteudo), dados)
+
+    if erros:
+        raise SnapshotInvalido("\n".join(erros))
+
+    combinado = hash_combinado({k: a for k, (a, _) in arquivos.items()})
+    payload = marshal.dumps({
+        "compatibilidade": _COMPATIBILIDADE,
+        "hash": combinado,
+        "arquivos": arquivos,
+    })
+    # Escrita atômica para que leitores nunca vejam um arquivo pela metade
+    temporario = f"{destino}.tmp"
+    with open(temporario, "wb") as f:
+        f.write(_MAGIC)
+        f.write(payload)
+    os.replace(temporario, destino)
+    return combinado
+
+def carregar(caminho, dataset_dir, arquivos_map):
+    """
+    Retorna {chave: (assinatura, dados)} se o snapshot existe, é compatível e
+    está em dia com todos os JSONs de `arquivos_map`; senão retorna None.
+    Arquivos com mtime/tamanho diferentes são re-hasheados antes de invalidar.
+    """
+    try:
+        with open(caminho, "rb") as f:
+            conteudo = f.read()
+        if not conteudo.startswith(_MAGIC):
+            return None
+        # marshal.loads sobre os bytes já lidos: marshal.load(f) lê em pedaços e é ~10x mais lento
+        snapshot = marshal.loads(memoryview(conteudo)[len(_MAGIC):])
+    except (FileNotFoundError, EOFError, ValueError, TypeError):
+        return None
+
+    if snapshot.get("compatibilidade") != _COMPATIBILIDADE:
+        return None
+    arquivos = snapshot["arquivos"]
+    if set(arquivos) != set(arquivos_map):
+        return None
+
+    for chave, nome in arquivos_map.items():
+        assinatura, _ = arquivos[chave]
+        caminho_json = os.path.join(dataset_dir, nome)
+        try:
+            st_arq = os.stat(caminho_json)
+        except FileNotFoundError:
+            return None
+        if (st_arq.st_mtime_ns, st_arq.st_size) == assinatura[:2]:
+            continue
+        atual = _assinatura(caminho_json)
+        if atual[2] != assinatura[2]:
+            return None
+        # Mesmo conteúdo (ex.: checkout novo mudou o mtime): adota a assinatura atual
+        arquivos[chave] = (atual, arquivos[chave][1])
+    return arquivos
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Gera o snapshot binário do dataset.")
+    parser.add_argument("-o", "--saida", default=None, help=f"Destino (padrão: dataset/{NOME_ARQUIVO})")
+    args = parser.parse_args(argv)
+
+    dataset_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dataset")
+    try:
+        combinado = construir(dataset_dir, ARQUIVOS_MAP, args.saida)
+    except SnapshotInvalido as e:
+        parser.exit(1, f"Dataset inválido, snapshot não gerado:\n{e}\n")
+    print(f"Snapshot gerado ({combinado[:12]}).")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Spec tipada dos campos de um prompt.
+
+`PromptSpec` é a forma canônica do que a UI coleta: cada campo já
+normalizado como o texto que vai no prompt (listas unidas por vírgula,
+campos vazios como None). É imutável e hashable, e por isso serve de chave
+para o cache de renderização de core.generator. A codificação canônica é o
+JSON compacto dos campos preenchidos na ordem de CAMPOS_PROMPT (o mesmo do
+bloco de spec), e `digest` é o seu SHA-256, estável entre processos.
+"""
+import hashlib
+import json
+
+AUTOMATIC_INPUT = "AUTOMATIC_INPUT"
+# Campos de entrada do prompt (as chaves que a UI coleta em `campos`)
+CAMPOS_PROMPT = ("genero", "ritmo", "estrutura", "tipo_de_gravacao", "influencia_estetica",
+                 "vibe_emocional", "referencia", "idioma", "tema", "mensagem", "palavras_chave",
+                 "publico", "narrador", "tom", "vocal_masculino", "vocal_feminino")
+_INDICE_CAMPO = {k: i for i, k in enumerate(CAMPOS_PROMPT)}
+
+def normalizar_valor(v):
+    """Converte listas e valores vazios/None para o texto usado no prompt."""
+    if v.__class__ is str:
+        return v.strip() or AUTOMATIC_INPUT
+    if isinstance(v, list):
+        return ", ".join([i for i in v if i]).strip() or AUTOMATIC_INPUT
+    if not v:
+        return AUTOMATIC_INPUT
+    return str(v).strip() or AUTOMATIC_INPUT
+
+class PromptSpec:
+    """
+    Campos normalizados de um prompt. Aceita qualquer mapeamento com `.get`
+    (dict da UI, spec compacta do histórico ou outra PromptSpec). Duas specs
+    com o mesmo texto final em todos os campos são iguais e têm o mesmo hash.
+    """
+    # Valores numa única tupla (na ordem de CAMPOS_PROMPT); cada campo é uma propriedade
+    __slots__ = ("_valores", "_hash", "_digest")
+
+    def __init__(self, campos=None):
+        get = (campos or {}).get
+        valores = []
+        for k in CAMPOS_PROMPT:
+            v = get(k)
+            # Atalho para o caso comum (texto), sem passar por normalizar_valor
+            v = (v.strip() if v.__class__ is str else normalizar_valor(v)) or AUTOMATIC_INPUT
+            valores.append(None if v == AUTOMATIC_INPUT else v)
+        valores = tuple(valores)
+        definir = object.__setattr__
+        definir(self, "_valores", valores)
+        definir(self, "_hash", hash(valores))
+        definir(self, "_digest", None)
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("PromptSpec é imutável")
+
+    __delattr__ = __setattr__
+
+    def __eq__(self, outro):
+        if not isinstance(outro, PromptSpec):
+            return NotImplemented
+        return self._hash == outro._hash and self._valores == outro._valores
+
+    def __hash__(self):
+        return self._hash
+
+    def __repr__(self):
+        return f"PromptSpec({self.campos()!r})"
+
+    def __reduce__(self):
+        return PromptSpec, (self.campos(),)
+
+    def get(self, campo, padrao=None):
+        """Texto normalizado do campo, ou `padrao` se não estiver preenchido."""
+        i = _INDICE_CAMPO.get(campo)
+        val = None if i is None else self._valores[i]
+        return padrao if val is None else val
+
+    def campos(self):
+        """Forma compacta: {campo: texto} só com os campos preenchidos, na ordem de CAMPOS_PROMPT."""
+        return {k: v for k, v in zip(CAMPOS_PROMPT, self._valores) if v is not None}
+
+    def codificar(self):
+        """Codificação canônica (JSON compacto dos campos preenchidos)."""
+        return json.dumps(self.campos(), ensure_ascii=False, separators=(",", ":"))
+
+    @property
+    def digest(self):
+        """SHA-256 (hex) da codificação canônica: o mesmo em qualquer processo."""
+        if self._digest is None:
+            object.__setattr__(self, "_digest", hashlib.sha256(self.codificar().encode("utf-8")).hexdigest())
+        return self._digest
+
+# Acesso por atributo a cada campo: spec.genero, spec.tom...
+for _i, _campo in enumerate(CAMPOS_PROMPT):
+    setattr(PromptSpec, _campo, property(lambda spec, i=_i: spec._valores[i]))
+del _i, _campo
+
+def como_spec(campos):
+    """`campos` como PromptSpec, sem reconstruir se já for uma."""
+    return campos if isinstance(campos, PromptSpec) else PromptSpec(campos)
+
+def normalizar_campos(campos):
+    """
+    Forma compacta dos campos: apenas os preenchidos, já como o texto que vai
+    no prompt. Renderizar a spec gera o mesmo prompt que os campos originais.
+    """
+    return como_spec(campos).campos()
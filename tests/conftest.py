@@ -0,0 +1,17 @@
+import os
+
+import pytest
+
+from core.generator import SunoMaestroCore
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+@pytest.fixture(scope="session")
+def core():
+    """Core sobre o dataset do repositório, carregado uma vez para a sessão de testes."""
+    return SunoMaestroCore(base_path=ROOT)
+
+@pytest.fixture(scope="session")
+def amostras(core):
+    """Configurações sorteadas (seed fixa) usadas como entrada em vários testes."""
+    return core.amostrador.amostrar(200, seed=7)
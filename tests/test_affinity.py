@@ -0,0 +1,65 @@
+import numpy as np
+
+from core import affinity
+from core.sampler import Amostrador, TabelaCatalogo
+
+def _dados_sinteticos():
+    tom = {f"Cat{c}": [[f"T{c}{i}", ""] for i in range(3)] for c in "ABCDE"}
+    return {
+        "hierarquia": {"G1": [["R1", "[Intro]"]], "G2": [["R2", "[Verse]"]]},
+        "tom": tom,
+        "publico": {"P": [["Jovens", ""], ["Adultos", ""]]},
+        "afinidade": {"G1": {"tom": {"CatA": 0, "TB0": 0, "CatC": 5}, "publico": {"Adultos": 0}}},
+    }
+
+def test_peso_zero_proibe_a_combinacao():
+    amostras = Amostrador(_dados_sinteticos()).amostrar(3000, seed=0)
+    g1 = [c for c in amostras if c["genero"] == "G1"]
+    assert g1 and any(c["genero"] == "G2" for c in amostras)
+    for campos in g1:
+        tags = campos["tom"].split(", ")
+        assert not any(t.startswith("TA") or t == "TB0" for t in tags)
+        assert campos["publico"] == "Jovens"
+    # Sem a regra (G2) os itens proibidos em G1 aparecem
+    g2_tags = {t for c in amostras if c["genero"] == "G2" for t in c["tom"].split(", ")}
+    assert "TB0" in g2_tags and any(t.startswith("TA") for t in g2_tags)
+
+def test_gumbel_top_k_sorteia_categorias_distintas():
+    tabela = TabelaCatalogo(_dados_sinteticos()["tom"])
+    w = np.ones(len(tabela.nomes))
+    w[tabela.offsets[0]:tabela.offsets[0] + tabela.contagens[0]] = 0  # CatA proibida
+    linhas = affinity.sortear_tags(tabela, w, np.random.default_rng(3), 2000, max_categorias=4)
+    tamanhos = set()
+    for linha in linhas:
+        tags = linha.split(", ")
+        categorias = [t[1] for t in tags]
+        assert len(set(categorias)) == len(categorias)
+        assert "A" not in categorias
+        tamanhos.add(len(tags))
+    assert tamanhos == {1, 2, 3, 4}
+
+def test_csr_guarda_so_pesos_diferentes_de_um():
+    dados = _dados_sinteticos()
+    tabela = TabelaCatalogo(dados["tom"])
+    matriz = affinity.MatrizAfinidade(dados["afinidade"], ["G1", "G2"], {"tom": tabela})
+    indptr, indices, pesos = matriz._csr["tom"]
+    # G1: 3 itens de CatA (0), TB0 (0) e 3 de CatC (5); G2 sem regras
+    assert indptr.tolist() == [0, 7, 7]
+    assert sorted(pesos.tolist()) == [0, 0, 0, 0, 5, 5, 5]
+    assert matriz.pesos("tom", 1, len(tabela.nomes)).tolist() == [1.0] * len(tabela.nomes)
+    base = affinity.probabilidade_base(tabela)
+    z = matriz.normalizador("tom", base)
+    assert np.allclose(z, [(base * matriz.pesos("tom", g, len(base))).sum() for g in (0, 1)])
+
+def test_media_potencias_pelos_sorteios():
+    z = np.array([0.5, 1.0])
+    assert np.allclose(affinity.media_potencias(z, (1,)), z)
+    assert np.allclose(affinity.media_potencias(z, range(3, 6)), [(0.125 + 0.0625 + 0.03125) / 3, 1.0])
+
+def test_marginal_do_genero_segue_os_pesos():
+    dados = _dados_sinteticos()
+    dados["afinidade"] = {"G1": {"publico": {"Adultos": 0}}}
+    amostras = Amostrador(dados).amostrar(20000, seed=4)
+    # Z(G1) = 0.5 e Z(G2) = 1 no único campo com regra: P(G1) = 0.5 / 1.5
+    frequencia = sum(c["genero"] == "G1" for c in amostras) / len(amostras)
+    assert abs(frequencia - 1 / 3) < 0.015
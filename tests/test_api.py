@@ -0,0 +1,111 @@
+import asyncio
+import json
+import socket
+
+import pytest
+
+from core.api import MAX_LOTE, ApiMaestro, ErroHTTP, servir
+from core.spec import PromptSpec
+
+@pytest.fixture(scope="module")
+def api(core):
+    api = ApiMaestro(core, threads=1)
+    yield api
+    api.executor.shutdown()
+
+def _post(api, alvo, corpo):
+    return json.loads(api.despachar("POST", alvo, json.dumps(corpo).encode("utf-8")))
+
+def _status(api, metodo, alvo, corpo=b""):
+    with pytest.raises(ErroHTTP) as erro:
+        api.despachar(metodo, alvo, corpo)
+    return erro.value.status
+
+def test_prompt_e_lote_iguais_ao_core(api, core, amostras):
+    campos = amostras[0]
+    resposta = _post(api, "/prompt", {"campos": campos})
+    assert resposta == {"prompt": core.gerar_prompt(campos), "digest": PromptSpec(campos).digest}
+    assert _post(api, "/prompt", dict(campos, incluir_spec=True))["prompt"] == core.gerar_prompt(campos, incluir_spec=True)
+    assert _post(api, "/prompts/", {"itens": amostras[:20]}) == {"prompts": core.gerar_prompts(amostras[:20])}
+
+def test_catalogos_aleatorio_e_saude(api, core):
+    assert json.loads(api.despachar("GET", "/catalogos", b"")) == {k: len(v) for k, v in core.dados.items()}
+    assert json.loads(api.despachar("GET", "/catalogos/tom", b"")) == core.dados["tom"]
+    itens = json.loads(api.despachar("GET", "/aleatorio?n=5&seed=3&afinidade=0", b""))["itens"]
+    assert itens == core.amostrador.amostrar(5, seed=3, afinidade=False)
+    assert json.loads(api.despachar("GET", "/saude", b""))["ok"] is True
+    assert api.em_thread("/prompts?x=1") and not api.em_thread("/prompt")
+
+def test_erros_de_rota_e_metodo(api):
+    assert _status(api, "GET", "/nada") == 404
+    assert _status(api, "GET", "/catalogos/nao_existe") == 404
+    assert _status(api, "GET", "/catalogosx") == 404
+    assert _status(api, "POST", "/catalogos") == 405
+    assert _status(api, "GET", "/prompt") == 405
+    assert _status(api, "POST", "/aleatorio") == 405
+
+@pytest.mark.parametrize("alvo, corpo, status", [
+    ("/prompt", b"{quebrado", 400),
+    ("/prompt", b"[1, 2]", 400),
+    ("/prompt", b'{"campos": ["Samba"]}', 400),
+    ("/prompt", b'{"campos": {"genero": 1}}', 400),
+    ("/prompt", b'{"campos": {"vibe_emocional": ["Alegre", {"x": 1}]}}', 400),
+    ("/prompts", b'{"itens": {"genero": "Samba"}}', 400),
+    ("/prompts", b'{"itens": [{"tema": "ok"}, {"tema": 3.5}]}', 400),
+    ("/prompts", json.dumps({"itens": [{}] * (MAX_LOTE + 1)}).encode(), 413),
+])
+def test_corpos_invalidos(api, alvo, corpo, status):
+    assert _status(api, "POST", alvo, corpo) == status
+
+def test_validacao_aponta_o_campo(api):
+    with pytest.raises(ErroHTTP, match=r"itens\[1\]\.tema"):
+        api.despachar("POST", "/prompts", b'{"itens": [{"tema": "ok"}, {"tema": 3.5}]}')
+
+@pytest.mark.parametrize("query", ["n=0", "n=abc", "n=2&seed=x", "n=100000"])
+def test_aleatorio_parametros_invalidos(api, query):
+    assert _status(api, "GET", f"/aleatorio?{query}") == 400
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+async def _ler_resposta(reader):
+    cabecalho = await reader.readuntil(b"\r\n\r\n")
+    linhas = cabecalho.decode("latin-1").split("\r\n")
+    cabecalhos = dict(l.lower().split(": ", 1) for l in linhas[1:] if l)
+    corpo = await reader.readexactly(int(cabecalhos["content-length"]))
+    return int(linhas[0].split(" ")[1]), cabecalhos, json.loads(corpo)
+
+def test_servidor_keep_alive(core, amostras):
+    """Várias requisições (inclusive com erro) na mesma conexão, e 411 para corpo chunked."""
+    async def rodar():
+        porta = _porta_livre()
+        pronto = asyncio.Event()
+        servidor = asyncio.create_task(servir(core, "127.0.0.1", porta, pronto))
+        await pronto.wait()
+        try:
+            reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+            respostas = []
+            for metodo, alvo, corpo in [("POST", "/prompts", {"itens": amostras[:3]}),
+                                        ("POST", "/prompt", {"campos": {"tema": 1}}),
+                                        ("GET", "/saude", None)]:
+                dados = json.dumps(corpo).encode() if corpo is not None else b""
+                writer.write(f"{metodo} {alvo} HTTP/1.1\r\nContent-Length: {len(dados)}\r\n\r\n".encode() + dados)
+                respostas.append(await _ler_resposta(reader))
+            writer.close()
+
+            reader, writer = await asyncio.open_connection("127.0.0.1", porta)
+            writer.write(b"POST /prompt HTTP/1.1\r\nTransfer-Encoding: chunked\r\n\r\n")
+            respostas.append(await _ler_resposta(reader))
+            writer.close()
+            return respostas
+        finally:
+            servidor.cancel()
+
+    lote, invalido, saude, chunked = asyncio.run(rodar())
+    assert lote[0] == 200 and lote[2]["prompts"] == core.gerar_prompts(amostras[:3])
+    assert lote[1]["connection"] == "keep-alive"
+    assert invalido[0] == 400 and "campos.tema" in invalido[2]["erro"]
+    assert saude[0] == 200 and saude[2]["ok"] is True
+    assert chunked[0] == 411 and chunked[1]["connection"] == "close"
@@ -0,0 +1,72 @@
+import sys
+
+from core.cache import CacheRender
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self):
+        return self.agora
+
+def test_lru_por_numero_de_entradas():
+    cache = CacheRender(max_entradas=2, ttl=60)
+    cache.put("a", "A")
+    cache.put("b", "B")
+    assert cache.get("a") == "A"  # "a" passa a ser a mais recente
+    cache.put("c", "C")
+    assert cache.get("b") is None
+    assert cache.get("a") == "A" and cache.get("c") == "C"
+    stats = cache.estatisticas()
+    assert stats["entradas"] == 2 and stats["remocoes_lru"] == 1
+
+def test_limite_de_bytes():
+    textos = {k: k * 1000 for k in "abc"}
+    tamanho = sys.getsizeof(textos["a"])
+    cache = CacheRender(max_entradas=100, max_bytes=2 * tamanho + 10, ttl=60)
+    for chave, texto in textos.items():
+        cache.put(chave, texto)
+    assert cache.get("a") is None
+    assert cache.get("b") == textos["b"] and cache.get("c") == textos["c"]
+    stats = cache.estatisticas()
+    assert stats["bytes"] == 2 * tamanho <= cache.max_bytes
+    assert stats["remocoes_lru"] == 1
+
+def test_texto_maior_que_o_limite_nao_entra():
+    cache = CacheRender(max_bytes=100, ttl=60)
+    cache.put("grande", "x" * 1000)
+    assert cache.get("grande") is None
+    assert cache.estatisticas()["bytes"] == 0
+
+def test_regravar_a_mesma_chave_nao_duplica_bytes():
+    cache = CacheRender(ttl=60)
+    cache.put("a", "x" * 100)
+    cache.put("a", "y" * 100)
+    assert cache.get("a") == "y" * 100
+    assert cache.estatisticas()["bytes"] == sys.getsizeof("y" * 100)
+
+def test_ttl():
+    relogio = Relogio()
+    cache = CacheRender(ttl=10, relogio=relogio)
+    cache.put("a", "A")
+    relogio.agora = 5
+    cache.put("b", "B")
+    relogio.agora = 9.9
+    assert cache.get("a") == "A"  # acertar não renova o prazo
+    relogio.agora = 10
+    assert cache.get("a") is None
+    assert cache.estatisticas()["remocoes_ttl"] == 1
+    relogio.agora = 15
+    assert cache.limpar_expirados() == 1
+    assert cache.estatisticas()["entradas"] == 0
+
+def test_obter_renderiza_so_nas_falhas():
+    cache = CacheRender(ttl=60)
+    chamadas = []
+    renderizar = lambda chave: chamadas.append(chave) or chave.upper()
+    assert [cache.obter(k, renderizar) for k in "abab"] == ["A", "B", "A", "B"]
+    assert chamadas == ["a", "b"]
+    stats = cache.estatisticas()
+    assert (stats["acertos"], stats["falhas"], stats["taxa_acerto"]) == (2, 2, 0.5)
+    cache.limpar()
+    assert cache.get("a") is None and cache.estatisticas()["bytes"] == 0
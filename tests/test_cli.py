@@ -0,0 +1,38 @@
+import io
+import json
+
+import pytest
+
+from core.cli import gerar_em_massa, ler_lotes, main
+from tests.conftest import ROOT
+
+def _entrada(amostras, vazias=False):
+    linhas = [json.dumps(c, ensure_ascii=False) for c in amostras]
+    if vazias:
+        linhas[3:3] = ["", "   "]
+    return io.StringIO("\n".join(linhas) + "\n")
+
+def test_ler_lotes_numera_e_ignora_linhas_vazias():
+    lotes = list(ler_lotes(io.StringIO("a\n\nb\n  \nc\n"), 2))
+    assert lotes == [[(1, "a\n"), (3, "b\n")], [(5, "c\n")]]
+
+def test_pool_preserva_a_ordem_da_entrada(core, amostras):
+    saida = io.StringIO()
+    # Lotes pequenos e poucos workers: muitos lotes em voo, terminando fora de ordem
+    total = gerar_em_massa(_entrada(amostras, vazias=True), saida, workers=2, tamanho_lote=7, base_path=ROOT)
+    linhas = [json.loads(l) for l in saida.getvalue().splitlines()]
+    assert total == len(linhas) == len(amostras)
+    assert [l["prompt"] for l in linhas] == core.gerar_prompts(amostras)
+    assert [l["linha"] for l in linhas] == [n for n in range(1, len(amostras) + 3) if n not in (4, 5)]
+
+def test_linha_invalida_aponta_o_numero(amostras):
+    entrada = io.StringIO(json.dumps(amostras[0]) + "\n[1, 2]\n")
+    with pytest.raises(ValueError, match="Linha 2: esperado um objeto"):
+        gerar_em_massa(entrada, io.StringIO(), workers=1, base_path=ROOT)
+
+def test_main_grava_o_arquivo_de_saida(core, amostras, tmp_path):
+    entrada, saida = tmp_path / "e.jsonl", tmp_path / "s.jsonl"
+    entrada.write_text(_entrada(amostras[:10]).getvalue(), encoding="utf-8")
+    main([str(entrada), "-o", str(saida), "--workers", "1", "--lote", "3"])
+    prompts = [json.loads(l)["prompt"] for l in saida.read_text(encoding="utf-8").splitlines()]
+    assert prompts == core.gerar_prompts(amostras[:10])
@@ -0,0 +1,62 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from core.dataset import ARQUIVOS_MAP
+from core.generator import SunoMaestroCore
+from tests.conftest import ROOT
+
+@pytest.fixture
+def core_copia(tmp_path):
+    """Core sobre uma cópia do dataset, que os testes podem editar."""
+    shutil.copytree(os.path.join(ROOT, "dataset"), tmp_path / "dataset")
+    return SunoMaestroCore(base_path=str(tmp_path))
+
+def _gravar(core, chave, dados):
+    caminho = os.path.join(core.dataset_dir, ARQUIVOS_MAP[chave])
+    anterior = os.stat(caminho).st_mtime_ns
+    if not isinstance(dados, bytes):
+        dados = (dados if isinstance(dados, str) else json.dumps(dados)).encode("utf-8")
+    with open(caminho, "wb") as f:
+        f.write(dados)
+    # Garante um mtime diferente mesmo em sistemas de arquivos com resolução baixa
+    os.utime(caminho, ns=(anterior + 10**9, anterior + 10**9))
+
+def test_recarrega_so_os_catalogos_alterados(core_copia):
+    core = core_copia
+    indice_antes = core.indice
+    tom = dict(core.dados["tom"], Nova=[["Tom Novo", "desc"]])
+    _gravar(core, "tom", tom)
+    assert core.recarregar_alterados() == {"tom"}
+    assert core.dados["tom"] == tom and core.indice is not indice_antes
+    assert core.indice.item_categoria["tom"]["Tom Novo"] == "Nova"
+    assert [r.nome for r in core.busca.buscar("tom novo")] == ["Tom Novo"]
+    assert core.recarregar_alterados() == set()
+
+def test_mesmo_conteudo_ou_json_invalido_mantem_a_versao(core_copia):
+    core = core_copia
+    estado = core.estado
+    with open(os.path.join(core.dataset_dir, ARQUIVOS_MAP["narrador"]), "rb") as f:
+        _gravar(core, "narrador", f.read())
+    assert core.recarregar_alterados() == set() and core.estado is estado
+    _gravar(core, "narrador", "{quebrado")
+    assert core.recarregar_alterados() == set() and core.estado is estado
+
+def test_intervalo_minimo_adia_a_verificacao(core_copia):
+    core = core_copia
+    _gravar(core, "publico", {"Todos": ["Adultos"]})
+    assert core.recarregar_alterados(intervalo_min=3600) == set()
+    assert core.recarregar_alterados() == {"publico"}
+
+def test_fixar_mantem_a_versao_durante_o_rerun(core_copia):
+    core = core_copia
+    fixo = core.fixar()
+    dados, indice, amostrador = fixo.dados, fixo.indice, fixo.amostrador
+    _gravar(core, "publico", {"Todos": ["Adultos"]})
+    core.recarregar_alterados()
+    assert fixo.estado is not core.estado
+    assert fixo.dados is dados and fixo.indice is indice and fixo.amostrador is amostrador
+    assert core.dados["publico"] == {"Todos": ["Adultos"]} and core.amostrador is not amostrador
+    assert {c["publico"] for c in core.amostrador.amostrar(50, seed=0, afinidade=False)} == {"Adultos"}
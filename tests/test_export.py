@@ -0,0 +1,47 @@
+import json
+import os
+import zipfile
+
+import pytest
+
+from core.export import CacheExportacao
+from core.generator import MARCADOR_SPEC
+from core.history import HistoricoSQLite, novo_item
+
+@pytest.fixture
+def historico(tmp_path):
+    h = HistoricoSQLite(str(tmp_path / "h.sqlite3"))
+    h.adicionar("u", [novo_item({"genero": "Samba", "tema": f"t{i}"}, ts=1_700_000_000 + i) for i in range(30)])
+    yield h
+    h.fechar()
+
+def test_zip_tem_um_txt_por_entrada_com_a_spec(core, historico, tmp_path):
+    caminho = CacheExportacao(str(tmp_path / "cache")).arquivo(core, historico, "u", "zip")
+    with zipfile.ZipFile(caminho) as zip_file:
+        nomes = zip_file.namelist()
+        assert len(nomes) == 30 and nomes[0].startswith("30_") and nomes[-1].startswith("01_")
+        assert all(MARCADOR_SPEC in zip_file.read(n).decode("utf-8") for n in nomes)
+
+def test_jsonl_do_mais_novo_ao_mais_antigo(core, historico, tmp_path):
+    caminho = CacheExportacao(str(tmp_path / "cache")).arquivo(core, historico, "u", "jsonl")
+    with open(caminho, encoding="utf-8") as f:
+        linhas = [json.loads(l) for l in f]
+    assert [l["campos"]["tema"] for l in linhas] == [f"t{i}" for i in reversed(range(30))]
+    assert all(l["prompt"] == core.gerar_prompt(l["campos"]) for l in linhas)
+
+def test_cache_por_versao_do_historico(core, historico, tmp_path):
+    cache = CacheExportacao(str(tmp_path / "cache"))
+    primeiro = cache.arquivo(core, historico, "u", "zip")
+    mtime = os.stat(primeiro).st_mtime_ns
+    assert cache.arquivo(core, historico, "u", "zip") == primeiro
+    assert os.stat(primeiro).st_mtime_ns == mtime
+
+    historico.adicionar("u", [novo_item({"tema": "nova"})])
+    segundo = cache.arquivo(core, historico, "u", "zip")
+    assert segundo != primeiro and not os.path.exists(primeiro)
+    assert os.listdir(cache.diretorio) == [os.path.basename(segundo)]
+
+def test_usuario_nao_entra_cru_no_caminho(core, historico, tmp_path):
+    cache = CacheExportacao(str(tmp_path / "cache"))
+    caminho = cache.arquivo(core, historico, "../../fora", "jsonl")
+    assert os.path.dirname(caminho) == cache.diretorio and "fora" not in os.path.basename(caminho)
@@ -0,0 +1,50 @@
+import pytest
+
+from core.history import ErroHistorico, HistoricoSQLite, novo_item
+
+@pytest.fixture
+def historico(tmp_path):
+    h = HistoricoSQLite(str(tmp_path / "h.sqlite3"), timeout_pool=0.2)
+    yield h
+    h.fechar()
+
+def _itens(n, ts=1000.0):
+    # Três entradas por timestamp: força o desempate por id na paginação
+    return [novo_item({"genero": "Samba" if i % 2 else "Rock", "tema": f"t{i}"}, ts=ts + i // 3) for i in range(n)]
+
+def test_paginas_e_filtros(historico):
+    historico.adicionar("u", _itens(25))
+    historico.adicionar("outro", _itens(3))
+    assert historico.contar("u") == 25 and historico.contar("u", genero="Samba") == 12
+    assert historico.generos("u") == ["Rock", "Samba"]
+    pagina = historico.pagina("u", 0, 10)
+    assert [i["campos"]["tema"] for i in pagina[:3]] == ["t24", "t23", "t22"]
+    assert len(historico.pagina("u", 2, 10)) == 5
+
+def test_todos_percorre_em_lotes_na_ordem_das_paginas(historico):
+    historico.adicionar("u", _itens(1234))
+    todos = [i["id"] for i in historico.todos("u", lote=100)]
+    assert todos == [i["id"] for i in historico.pagina("u", 0, 2000)]
+    assert len(set(todos)) == 1234
+
+def test_geradores_abandonados_nao_prendem_conexoes(historico):
+    historico.adicionar("u", _itens(50))
+    geradores = [historico.todos("u", lote=10) for _ in range(8)]
+    for gerador in geradores:
+        next(gerador)
+    assert historico.contar("u") == 50
+
+def test_pool_esgotado_levanta_erro(historico):
+    presas = [historico._pool.get() for _ in range(historico._pool.qsize())]
+    try:
+        with pytest.raises(ErroHistorico, match="nenhuma conexão livre"):
+            historico.contar("u")
+    finally:
+        for con in presas:
+            historico._pool.put(con)
+
+def test_versao_muda_a_cada_escrita(historico):
+    assert historico.versao("u") == 0
+    historico.adicionar("u", _itens(2))
+    historico.limpar("u")
+    assert historico.versao("u") == 2 and historico.contar("u") == 0
@@ -0,0 +1,86 @@
+import asyncio
+import socket
+
+import pytest
+
+from benchmarks.mock_llm import MockLLM, servir
+from core.llm import ClienteLLM, ErroLLM, _eventos_sse, _ler_corpo, despachar
+from core.output import ViolacaoSaida
+
+def test_eventos_sse_divididos_entre_blocos():
+    dados, resto = _eventos_sse(b'data: {"a":1}\n\ndata: {"b"', b"")
+    assert dados == [b'{"a":1}'] and resto == b'data: {"b"'
+    dados, resto = _eventos_sse(b':2}\n\n: comentario\ndata: [DONE]\n\n', resto)
+    assert dados == [b'{"b":2}', b"[DONE]"] and resto == b""
+
+def _corpo(bruto, cabecalhos):
+    async def ler():
+        reader = asyncio.StreamReader()
+        reader.feed_data(bruto)
+        reader.feed_eof()
+        return b"".join([b async for b in _ler_corpo(reader, cabecalhos)])
+    return asyncio.run(ler())
+
+def test_corpo_chunked_content_length_e_ate_o_fim():
+    chunked = b"5\r\nhello\r\n6;ext=1\r\n world\r\n0\r\nX-Trailer: 1\r\n\r\n"
+    assert _corpo(chunked, {"transfer-encoding": "chunked"}) == b"hello world"
+    assert _corpo(b"abcdef", {"content-length": "4"}) == b"abcd"
+    assert _corpo(b"ate o fim", {}) == b"ate o fim"
+    with pytest.raises(asyncio.IncompleteReadError):
+        _corpo(b"ab", {"content-length": "4"})
+
+def _porta_livre():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def _contra_mock(mock, usar, **opcoes):
+    """Roda `usar(cliente)` contra o mock num servidor local; devolve (resultado, cliente)."""
+    async def rodar():
+        porta = _porta_livre()
+        pronto = asyncio.Event()
+        servidor = asyncio.create_task(servir(mock, "127.0.0.1", porta, pronto))
+        await pronto.wait()
+        cliente = ClienteLLM(f"http://127.0.0.1:{porta}/v1", "mock", backoff_base=0.001, **opcoes)
+        try:
+            return await usar(cliente), cliente
+        finally:
+            await cliente.fechar()
+            servidor.cancel()
+    return asyncio.run(rodar())
+
+def test_stream_e_resposta_unica_contra_o_mock():
+    async def usar(cliente):
+        return [await cliente.completar("p", stream=s) for s in (True, False)]
+    (com_stream, sem_stream), cliente = _contra_mock(MockLLM(0, 0, seed=1), usar)
+    for texto in (com_stream, sem_stream):
+        assert texto.startswith("# Title\n") and "# Prompt for Suno\n" in texto
+    assert cliente.contadores["requisicoes"] == 2
+
+def test_novas_tentativas_em_429_e_500():
+    mock = MockLLM(0, 0, taxa_erro=0.3, seed=3)
+    resultados, cliente = _contra_mock(mock, lambda c: despachar(c, ["p"] * 20, 4), tentativas=20)
+    assert all(r.erro is None and r.texto for r in resultados)
+    assert cliente.contadores["novas_tentativas"] == mock.contadores["erros_injetados"] > 0
+
+def test_erro_depois_das_tentativas():
+    async def usar(cliente):
+        with pytest.raises(ErroLLM) as erro:
+            await cliente.completar("p")
+        return erro.value
+    erro, cliente = _contra_mock(MockLLM(0, 0, taxa_erro=1.0, seed=0), usar, tentativas=3)
+    assert erro.status in (429, 500) and erro.repetivel
+    assert cliente.contadores["requisicoes"] == 3 and cliente.contadores["falhas"] == 1
+
+def test_compor_refaz_respostas_fora_do_formato():
+    mock = MockLLM(0, 0, seed=5, taxa_invalida=0.3)
+    resultados, cliente = _contra_mock(mock, lambda c: despachar(c, ["p"] * 20, 4, validar=True), tentativas=20)
+    assert all(r.erro is None and len(r.saida.secoes) == 7 for r in resultados)
+    assert cliente.contadores["violacoes"] == mock.contadores["respostas_invalidas"] > 0
+
+def test_compor_desiste_depois_das_tentativas():
+    async def usar(cliente):
+        with pytest.raises(ViolacaoSaida):
+            await cliente.compor("p", tentativas=2)
+    _, cliente = _contra_mock(MockLLM(0, 0, seed=0, taxa_invalida=1.0), usar)
+    assert cliente.contadores["violacoes"] == 2 and cliente.contadores["falhas"] == 1
@@ -0,0 +1,113 @@
+import asyncio
+import random
+import re
+
+import pytest
+
+from benchmarks.mock_llm import composicao
+from core.generator import PROMPT_TEMPLATE
+from core.output import MAX_CARACTERES_SUNO, ParserSaida, ViolacaoSaida, validar, validar_stream
+
+# Marcações de referência do próprio template (5 a 9 palavras cada)
+EXEMPLOS_TEMPLATE = re.findall(r"^\s*- (\[[^\]]+\])\s*$", PROMPT_TEMPLATE, re.MULTILINE)
+SUNO = ("Warm acoustic pop at ~92 BPM in 4/4, key of D major. Brushed drums keep a relaxed groove. "
+        "An intimate baritone vocal sits front and center with subtle plate reverb.")
+
+def resposta(titulo="Luz da Estrada", marcacoes=EXEMPLOS_TEMPLATE, suno=SUNO, separador="─" * 45):
+    letra = "\n\n".join(f"{m}\nVerso um da seção\nVerso dois da seção" for m in marcacoes)
+    return "\n".join(["# Title", titulo, separador, "# Lyrics", letra, separador, "# Prompt for Suno", suno])
+
+def em_trechos(texto, tamanho):
+    return [texto[i:i + tamanho] for i in range(0, len(texto), tamanho)]
+
+def test_aceita_as_marcacoes_de_referencia_do_template():
+    assert len(EXEMPLOS_TEMPLATE) == 7
+    saida = validar(resposta())
+    assert saida.titulo == "Luz da Estrada"
+    assert [s.nome for s in saida.secoes] == ["Intro", "Verse 1", "Drop", "Pre-Chorus", "Chorus", "Bridge", "Outro"]
+    assert saida.secoes[4].marcacao == "full band, driving rhythm guitar"
+    assert saida.secoes[0].versos == ["Verso um da seção", "Verso dois da seção"]
+    assert saida.prompt_suno == SUNO
+    # Só a do Intro tem 9 palavras; as outras ficam abaixo das 9–12 preferidas: aceitas, com aviso
+    assert len(saida.avisos) == 6
+
+def test_aceita_respostas_do_mock_sem_avisos():
+    rng = random.Random(0)
+    for _ in range(20):
+        saida = validar(composicao(rng))
+        assert len(saida.secoes) == 7 and not saida.avisos
+
+@pytest.mark.parametrize("tamanho", [1, 2, 3, 7, 64])
+def test_stream_em_trechos_igual_ao_texto_inteiro(tamanho):
+    texto = resposta()
+    parser = ParserSaida()
+    for trecho in em_trechos(texto, tamanho):
+        parser.alimentar(trecho)
+    assert parser.finalizar() == validar(texto)
+
+def test_valor_na_linha_do_cabecalho():
+    texto = resposta().replace("# Title\nLuz da Estrada", "# Title: Luz da Estrada")
+    texto = texto.replace("# Prompt for Suno\n", "# Prompt for Suno: ")
+    saida = validar(texto)
+    assert saida.titulo == "Luz da Estrada" and saida.prompt_suno == SUNO
+
+def test_separadores_sao_opcionais_e_linhas_crlf():
+    assert validar(resposta(separador="")).secoes
+    assert validar(resposta().replace("\n", "\r\n")).titulo == "Luz da Estrada"
+
+MARCACAO_LONGA = "[Bridge: " + " ".join(["guitar"] * 17) + "]"
+
+@pytest.mark.parametrize("texto, trecho_erro", [
+    ("Claro! Aqui está:\n" + resposta(), "texto antes de # Title"),
+    (resposta().replace("# Title\n", "# Lyrics\n", 1), "fora de ordem"),
+    (resposta(titulo="Luz\nda Estrada"), "uma única linha"),
+    (resposta(titulo=""), "título vazio"),
+    (resposta(marcacoes=[]), "letra sem seções"),
+    (resposta(marcacoes=["[Chorus]"]), "sem descrição"),
+    (resposta(marcacoes=[MARCACAO_LONGA]), "17 palavras (máximo 16)"),
+    (resposta().replace("# Lyrics\n", "# Lyrics\nVerso solto\n"), "antes da primeira marcação"),
+    (resposta(suno="- Warm pop.\n- Drums. Bass."), "sem marcadores"),
+    (resposta(suno="Warm pop. " * 120), f"mais de {MAX_CARACTERES_SUNO} caracteres"),
+    (resposta(suno="Only one sentence"), "0 frases"),
+    (resposta(suno="One. Two. Three. Four. Five. Six. Seven."), "7 frases"),
+    (resposta().split("# Prompt for Suno")[0], "terminou sem # Prompt for Suno"),
+    (resposta() + "\n# Title\nDe novo", "fora de ordem"),
+])
+def test_rejeita_violacoes(texto, trecho_erro):
+    with pytest.raises(ViolacaoSaida, match=re.escape(trecho_erro)):
+        validar(texto)
+
+def test_marcacao_longa_aborta_antes_do_fim_da_linha():
+    parser = ParserSaida()
+    parser.alimentar("# Title\nLuz\n# Lyrics\n[Intro: " + " ".join(["pad"] * 16))
+    with pytest.raises(ViolacaoSaida) as erro:
+        parser.alimentar(" pad")
+    assert erro.value.secao == "letra" and erro.value.linha == 4
+
+def test_prompt_do_suno_longo_aborta_antes_do_fim_da_linha():
+    parser = ParserSaida()
+    parser.alimentar(resposta(suno=""))
+    parser.alimentar("x" * MAX_CARACTERES_SUNO)
+    with pytest.raises(ViolacaoSaida, match="caracteres"):
+        parser.alimentar("x")
+
+def test_validar_stream_fecha_a_fonte_na_violacao():
+    estado = {"enviados": 0, "fechado": False}
+
+    async def trechos(texto):
+        try:
+            for trecho in em_trechos(texto, 5):
+                estado["enviados"] += 1
+                yield trecho
+        finally:
+            estado["fechado"] = True
+
+    texto = resposta(marcacoes=[MARCACAO_LONGA, *EXEMPLOS_TEMPLATE])
+    with pytest.raises(ViolacaoSaida):
+        asyncio.run(validar_stream(trechos(texto)))
+    assert estado["fechado"]
+    assert estado["enviados"] < len(em_trechos(texto, 5)) / 2
+
+    estado["fechado"] = False
+    assert asyncio.run(validar_stream(trechos(resposta()))).titulo == "Luz da Estrada"
+    assert estado["fechado"]
@@ -0,0 +1,97 @@
+import json
+import os
+import time
+import zipfile
+
+import pytest
+
+from core.export import DATA_MAX_ZIP, DATA_MIN_ZIP, FORMATOS, CacheExportacao, data_zip, escrever_jsonl, escrever_zip
+from core.generator import MARCADOR_SPEC, bloco_spec
+from core.history import HistoricoSQLite, novo_item
+from core.restore import TS_MAXIMO, escanear, extrair_campos, importar_arquivos, ler_spec
+from core.spec import normalizar_campos
+
+def test_bloco_de_spec_ida_e_volta(core, amostras):
+    for campos in amostras:
+        texto = core.gerar_prompt(campos, incluir_spec=True)
+        assert texto.endswith(bloco_spec(campos))
+        assert ler_spec(texto) == normalizar_campos(campos)
+        assert extrair_campos(texto) == normalizar_campos(campos)
+
+def test_scanner_de_prompts_sem_spec(core, amostras):
+    for campos in amostras:
+        texto = core.gerar_prompt(campos)
+        assert MARCADOR_SPEC not in texto and ler_spec(texto) is None
+        assert escanear(texto) == extrair_campos(texto) == normalizar_campos(campos)
+
+def test_bloco_invalido_cai_no_scanner(core):
+    campos = {"genero": "Samba", "tema": "Carnaval", "vibe_emocional": ["Alegre", "Doce"]}
+    texto = core.gerar_prompt(campos) + f"\n{MARCADOR_SPEC}{{quebrado\n"
+    assert ler_spec(texto) is None
+    assert extrair_campos(texto) == normalizar_campos(campos)
+
+def test_scanner_limpa_vibes_gravadas_como_repr():
+    texto = "USER_INPUTS:\n  primary_genre: \"Samba\"\n  emotional_vibe: \"['Alegre', 'Doce']\"\nAUTOMATIC_INPUTS:\n"
+    assert escanear(texto) == {"genero": "Samba", "vibe_emocional": "Alegre, Doce"}
+
+def test_importar_exportacoes_preserva_data_e_ordem(core, tmp_path):
+    historico = HistoricoSQLite(str(tmp_path / "h.sqlite3"))
+    base = 1_700_000_000
+    historico.adicionar("u", [novo_item({"genero": "Samba", "tema": f"t{i}"}, ts=base + i * 3600) for i in range(5)])
+    escrever_zip(core, historico.todos("u"), str(tmp_path / "e.zip"), historico.contar("u"))
+    escrever_jsonl(core, historico.todos("u"), str(tmp_path / "e.jsonl"))
+    historico.fechar()
+
+    for nome in ("e.zip", "e.jsonl"):
+        with open(os.path.join(tmp_path, nome), "rb") as f:
+            itens, ignorados = importar_arquivos([(nome, f.read())])
+        assert not ignorados
+        assert [i["campos"]["tema"] for i in itens] == [f"t{i}" for i in range(5)]
+        assert [round(i["ts"] - base) for i in itens] == [i * 3600 for i in range(5)]
+
+def test_importar_ignora_o_que_nao_reconhece():
+    itens, ignorados = importar_arquivos([("nada.txt", b"texto qualquer"), ("ruim.zip", b"nao e zip"),
+                                          ("e.jsonl", b'{"ts": 1, "campos": {"tema": "x"}}\nlixo\n')])
+    assert [i["campos"] for i in itens] == [{"tema": "x"}]
+    assert ignorados == ["nada.txt", "ruim.zip", "e.jsonl:2"]
+
+def test_datas_fora_da_faixa_do_zip(core, tmp_path):
+    historico = HistoricoSQLite(str(tmp_path / "h.sqlite3"))
+    historico.adicionar("u", [novo_item({"tema": t}, ts=ts) for t, ts in
+                              (("antiga", 86400.0), ("zero", 0.0), ("distante", 5e9), ("atual", 1_700_000_000.0))])
+    escrever_zip(core, historico.todos("u"), str(tmp_path / "e.zip"), historico.contar("u"))
+    historico.fechar()
+
+    with zipfile.ZipFile(tmp_path / "e.zip") as zip_file:
+        # Numerados do mais antigo (01) ao mais novo: zero, antiga, atual, distante
+        datas = sorted((i.filename, i.date_time) for i in zip_file.infolist())
+    assert datas[0][1] == datas[1][1] == DATA_MIN_ZIP and datas[3][1] == DATA_MAX_ZIP
+    assert data_zip(float("inf")) == DATA_MAX_ZIP and data_zip(-1e300) == DATA_MIN_ZIP
+
+    itens, ignorados = importar_arquivos([("e.zip", (tmp_path / "e.zip").read_bytes())])
+    assert not ignorados and [i["campos"]["tema"] for i in itens] == ["zero", "antiga", "atual", "distante"]
+    assert all(0 < i["ts"] <= TS_MAXIMO for i in itens)
+
+def test_jsonl_com_ts_invalido_usa_o_horario_da_importacao():
+    linhas = [{"ts": ts, "campos": {"tema": str(n)}} for n, ts in enumerate(("NaN", -5, 1e300, 1_600_000_000))]
+    antes = time.time()
+    itens, ignorados = importar_arquivos([("e.jsonl", "\n".join(json.dumps(l) for l in linhas).encode())])
+    assert not ignorados and [i["campos"]["tema"] for i in itens] == ["3", "2", "1", "0"]
+    assert itens[0]["ts"] == 1_600_000_000
+    assert all(antes <= i["ts"] <= time.time() for i in itens[1:])
+
+def test_exportacao_com_falha_nao_deixa_arquivo(core, tmp_path):
+    class HistoricoQuebrado:
+        def versao(self, usuario):
+            return 1
+        def contar(self, usuario):
+            return 2
+        def todos(self, usuario):
+            yield novo_item({"tema": "ok"}, ts=1_700_000_000)
+            raise OSError("disco cheio")
+
+    cache = CacheExportacao(str(tmp_path / "cache"))
+    for formato in FORMATOS:
+        with pytest.raises(OSError, match="disco cheio"):
+            cache.arquivo(core, HistoricoQuebrado(), "u", formato)
+    assert os.listdir(cache.diretorio) == []
@@ -0,0 +1,22 @@
+from core.spec import CAMPOS_PROMPT
+
+def test_mesma_seed_mesmo_resultado(core):
+    for afinidade in (True, False):
+        a = core.amostrador.amostrar(300, seed=42, afinidade=afinidade)
+        assert a == core.amostrador.amostrar(300, seed=42, afinidade=afinidade)
+        assert a != core.amostrador.amostrar(300, seed=43, afinidade=afinidade)
+
+def test_campos_sorteados_existem_no_dataset(core):
+    indice = core.indice
+    for campos in core.amostrador.amostrar(300, seed=1):
+        assert set(campos) <= set(CAMPOS_PROMPT)
+        assert campos["ritmo"] in indice.ritmos_de(campos["genero"])
+        assert campos["tom"] and all(t in indice.item_categoria["tom"] for t in campos["tom"].split(", "))
+        assert 1 <= len(campos["vibe_emocional"]) <= 5
+        assert len(set(campos["vibe_emocional"])) == len(campos["vibe_emocional"])
+
+def test_estruturas_seguem_a_seed_e_o_genero(core):
+    assert core.amostrador.estruturas(50, seed=9) == core.amostrador.estruturas(50, seed=9)
+    genero = next(g for g in core.indice.generos if any(core.indice.estrutura_de(g, r) for r in core.indice.ritmos_de(g)))
+    validas = {core.indice.estrutura_de(genero, r) for r in core.indice.ritmos_de(genero)}
+    assert set(core.amostrador.estruturas(100, seed=2, genero=genero)) <= validas - {""}
@@ -0,0 +1,34 @@
+from core.search import IndiceBusca, normalizar
+
+DADOS = {
+    "hierarquia": {"Samba": [["Samba de Roda", "[Intro]"], ["Pagode", "[Verse]"]], "Rock": [["Hard Rock", ""]]},
+    "tom": {"Humor": [["Irônico", "Deboche leve"], ["Melancólico", "Tristeza contida"]]},
+    "vibe_emocional": {"Alegria": ["Eufórico", "Alegre"]},
+    "help": {"x": [["Samba", "fora da busca"]]},
+}
+
+def _nomes(resultados):
+    return [r.nome for r in resultados]
+
+def test_normalizar_remove_acentos_e_pontuacao():
+    assert normalizar("Irônico, MELANCÓLICO!") == "ironico  melancolico "
+
+def test_prefixo_sem_acento_e_catalogos_fora_da_busca():
+    busca = IndiceBusca(DADOS)
+    assert _nomes(busca.buscar("ironi")) == ["Irônico"]
+    assert {r.catalogo for r in busca.buscar("samba")} == {"hierarquia"}
+
+def test_nome_pontua_mais_que_descricao():
+    # "Samba de Roda" casa no nome; "Pagode" só pela descrição (o gênero)
+    resultados = IndiceBusca(DADOS).buscar("samba")
+    assert _nomes(resultados) == ["Samba de Roda", "Pagode"] and resultados[1].descricao == "Samba"
+
+def test_trigramas_toleram_erro_de_digitacao():
+    assert "Melancólico" in _nomes(IndiceBusca(DADOS).buscar("melancolco"))
+
+def test_todas_as_palavras_precisam_casar_e_limite():
+    busca = IndiceBusca(DADOS)
+    assert _nomes(busca.buscar("samba roda")) == ["Samba de Roda"]
+    assert busca.buscar("samba eufórico") == []
+    assert busca.buscar("  ") == []
+    assert len(busca.buscar("samba", limite=1)) == 1
@@ -0,0 +1,72 @@
+import json
+import os
+import shutil
+
+import pytest
+
+from core import snapshot
+from core.dataset import ARQUIVOS_MAP, CatalogoLoader
+from tests.conftest import ROOT
+
+@pytest.fixture
+def dataset_dir(tmp_path):
+    destino = tmp_path / "dataset"
+    shutil.copytree(os.path.join(ROOT, "dataset"), destino)
+    return str(destino)
+
+def _json(dataset_dir, chave):
+    with open(os.path.join(dataset_dir, ARQUIVOS_MAP[chave]), encoding="utf-8") as f:
+        return json.load(f)
+
+def test_construir_e_carregar(dataset_dir):
+    caminho = os.path.join(dataset_dir, snapshot.NOME_ARQUIVO)
+    combinado = snapshot.construir(dataset_dir, ARQUIVOS_MAP)
+    arquivos = snapshot.carregar(caminho, dataset_dir, ARQUIVOS_MAP)
+    assert set(arquivos) == set(ARQUIVOS_MAP)
+    assert all(dados == _json(dataset_dir, chave) for chave, (_, dados) in arquivos.items())
+    assert snapshot.hash_combinado({k: a for k, (a, _) in arquivos.items()}) == combinado
+    assert not os.path.exists(f"{caminho}.tmp")
+
+def test_mtime_novo_com_mesmo_conteudo_continua_valido(dataset_dir):
+    caminho = os.path.join(dataset_dir, snapshot.NOME_ARQUIVO)
+    snapshot.construir(dataset_dir, ARQUIVOS_MAP)
+    arquivo = os.path.join(dataset_dir, ARQUIVOS_MAP["tom"])
+    os.utime(arquivo, ns=(0, os.stat(arquivo).st_mtime_ns + 10**9))
+    arquivos = snapshot.carregar(caminho, dataset_dir, ARQUIVOS_MAP)
+    assert arquivos["tom"][0][0] == os.stat(arquivo).st_mtime_ns
+
+def test_conteudo_alterado_ou_arquivo_ausente_invalida(dataset_dir):
+    caminho = os.path.join(dataset_dir, snapshot.NOME_ARQUIVO)
+    snapshot.construir(dataset_dir, ARQUIVOS_MAP)
+    tom = _json(dataset_dir, "tom")
+    tom["Nova"] = [["Novo Tom", ""]]
+    with open(os.path.join(dataset_dir, ARQUIVOS_MAP["tom"]), "w", encoding="utf-8") as f:
+        json.dump(tom, f)
+    assert snapshot.carregar(caminho, dataset_dir, ARQUIVOS_MAP) is None
+
+    snapshot.construir(dataset_dir, ARQUIVOS_MAP)
+    os.remove(os.path.join(dataset_dir, ARQUIVOS_MAP["narrador"]))
+    assert snapshot.carregar(caminho, dataset_dir, ARQUIVOS_MAP) is None
+
+def test_snapshot_corrompido_ou_ausente(dataset_dir, tmp_path):
+    assert snapshot.carregar(str(tmp_path / "nao_existe"), dataset_dir, ARQUIVOS_MAP) is None
+    ruim = tmp_path / "ruim.snapshot"
+    ruim.write_bytes(b"outra coisa")
+    assert snapshot.carregar(str(ruim), dataset_dir, ARQUIVOS_MAP) is None
+
+def test_dataset_invalido_nao_gera_snapshot(dataset_dir):
+    with open(os.path.join(dataset_dir, ARQUIVOS_MAP["publico"]), "w", encoding="utf-8") as f:
+        json.dump({"Jovens": [1, 2]}, f)
+    with pytest.raises(snapshot.SnapshotInvalido, match=r"publico/Jovens\[0\]"):
+        snapshot.construir(dataset_dir, ARQUIVOS_MAP)
+    assert not os.path.exists(os.path.join(dataset_dir, snapshot.NOME_ARQUIVO))
+
+def test_loader_usa_o_snapshot_em_dia(dataset_dir):
+    caminho = os.path.join(dataset_dir, snapshot.NOME_ARQUIVO)
+    snapshot.construir(dataset_dir, ARQUIVOS_MAP)
+    lidos = []
+    loader = CatalogoLoader(dataset_dir, ARQUIVOS_MAP, cache=lambda f: lambda *a: lidos.append(a) or f(*a),
+                            snapshot_path=caminho)
+    dados = loader.carregar()
+    assert not lidos and dados["tom"] == _json(dataset_dir, "tom")
+    assert loader.alterados() == {}
@@ -0,0 +1,54 @@
+import hashlib
+import json
+import pickle
+import subprocess
+import sys
+
+import pytest
+
+from core.generator import renderizar_spec
+from core.spec import AUTOMATIC_INPUT, CAMPOS_PROMPT, PromptSpec, como_spec, normalizar_campos
+
+CAMPOS = {"genero": "Samba", "vibe_emocional": ["Alegre", "Doce"], "tema": "Carnaval"}
+# Digest de CAMPOS: muda só se a codificação canônica mudar (o que invalida specs salvas)
+DIGEST_CAMPOS = "b724ea7c40fb5c315bb76f1b4527d05fce26d226fc5ec375d03e409dd281aa5a"
+
+def test_formas_equivalentes_geram_a_mesma_spec():
+    a = PromptSpec({"tema": "  Carnaval ", "vibe_emocional": ["Alegre", "", "Doce"], "genero": "Samba",
+                    "mensagem": "", "tom": None, "publico": AUTOMATIC_INPUT})
+    b = PromptSpec({"genero": "Samba", "vibe_emocional": "Alegre, Doce", "tema": "Carnaval"})
+    assert a == b
+    assert hash(a) == hash(b)
+    assert a.campos() == b.campos() == {"genero": "Samba", "vibe_emocional": "Alegre, Doce", "tema": "Carnaval"}
+
+def test_codificacao_canonica_segue_a_ordem_dos_campos():
+    invertido = dict(reversed(list(CAMPOS.items())))
+    codigo = PromptSpec(invertido).codificar()
+    assert codigo == '{"genero":"Samba","vibe_emocional":"Alegre, Doce","tema":"Carnaval"}'
+    assert list(json.loads(codigo)) == [k for k in CAMPOS_PROMPT if k in CAMPOS]
+
+def test_digest_estavel():
+    spec = PromptSpec(CAMPOS)
+    assert spec.digest == hashlib.sha256(spec.codificar().encode("utf-8")).hexdigest()
+    assert spec.digest == DIGEST_CAMPOS
+
+def test_digest_igual_em_outro_processo():
+    # hash() de str muda entre processos (PYTHONHASHSEED); o digest não pode mudar
+    codigo = f"from core.spec import PromptSpec; print(PromptSpec({CAMPOS!r}).digest)"
+    saida = subprocess.run([sys.executable, "-c", codigo], capture_output=True, text=True, check=True)
+    assert saida.stdout.strip() == DIGEST_CAMPOS
+
+def test_spec_imutavel_e_serializavel():
+    spec = PromptSpec(CAMPOS)
+    with pytest.raises(AttributeError):
+        spec.tema = "outro"
+    copia = pickle.loads(pickle.dumps(spec))
+    assert copia == spec and copia.digest == spec.digest
+    assert como_spec(spec) is spec
+    assert spec.tema == "Carnaval" and spec.mensagem is None
+    assert spec.get("mensagem", "-") == "-" and spec.get("inexistente") is None
+
+def test_spec_compacta_renderiza_o_mesmo_prompt(core, amostras):
+    for campos in amostras[:50]:
+        assert core.gerar_prompt(normalizar_campos(campos)) == core.gerar_prompt(campos)
+        assert renderizar_spec(PromptSpec(campos)) == core.gerar_prompt(campos)